@@ -0,0 +1,130 @@
+"""add hot query indexes
+
+Revision ID: 527b03773ce3
+Revises: fe2e1da5e73f
+Create Date: 2026-10-16 12:00:41.208113
+
+Indexes for the lookups the repositories and routes run on every request:
+progress by user (and user + algorithm/problem), approved blogs by date,
+a user's blogs, comment threads and replies, and an algorithm's related
+problems by status. Progress rows become unique per user and algorithm /
+problem (the app already does get-or-create on them). Duplicates left by
+races are merged into the oldest row of their group first (the one
+``.first()`` has been reading and updating): it takes the most advanced
+status, the earliest start/attempt/solve times, the latest access/update
+times, the summed attempts and the newest notes. The other rows are then
+deleted.
+
+The downgrade only drops the indexes; it cannot restore the deleted
+duplicate rows (their data survives in the merged rows).
+
+On PostgreSQL the indexes are built CONCURRENTLY so writes are not blocked
+while they build.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '527b03773ce3'
+down_revision = 'fe2e1da5e73f'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    # (name, table, columns, unique)
+    ('uq_user_progress_user_algo', 'user_progress', ['user_id', 'algo_id'], True),
+    ('ix_user_progress_user_last_accessed', 'user_progress', ['user_id', 'last_accessed'], False),
+    ('ix_blog_status_created_at', 'blog', ['status', 'created_at'], False),
+    ('ix_blog_user_id', 'blog', ['user_id'], False),
+    ('ix_blog_comments_blog_parent', 'blog_comments', ['blog_id', 'parent_id'], False),
+    ('ix_blog_comments_parent_id', 'blog_comments', ['parent_id'], False),
+    ('ix_algorithm_comments_algorithm_parent', 'algorithm_comments', ['algorithm_id', 'parent_id'], False),
+    ('ix_algorithm_comments_parent_id', 'algorithm_comments', ['parent_id'], False),
+    ('ix_related_problems_algorithm_status', 'related_problems', ['algorithm_id', 'status'], False),
+    ('uq_user_problem_progress_user_problem', 'user_problem_progress', ['user_id', 'problem_id'], True),
+]
+
+# Tables whose rows must be unique per (user, item) before the unique index is built:
+# (table, group columns, statuses from least to most advanced, column -> merged value
+# over the group's rows ``d``)
+DEDUPLICATE = [
+    ('user_progress', ['user_id', 'algo_id'], ['completed'], {
+        'started_at': 'MIN(d.started_at)',
+        'last_accessed': 'MAX(d.last_accessed)',
+        'finished_at': 'MIN(d.finished_at)',
+    }),
+    ('user_problem_progress', ['user_id', 'problem_id'], ['attempted', 'solved'], {
+        'attempts': 'SUM(COALESCE(d.attempts, 0))',
+        'first_attempt_at': 'MIN(d.first_attempt_at)',
+        'solved_at': 'MIN(d.solved_at)',
+        'created_at': 'MIN(d.created_at)',
+        'updated_at': 'MAX(d.updated_at)',
+        'solution_url': None,
+        'notes': None,
+    }),
+]
+
+
+def _is_postgres() -> bool:
+    return op.get_bind().dialect.name == 'postgresql'
+
+
+def _deduplicate(table: str, columns: list, statuses: list, merged: dict) -> list:
+    """Statements merging each group of duplicate rows into its oldest row, then deleting the rest."""
+    group = ', '.join(columns)
+    same_group = ' AND '.join(f"d.{c} = {table}.{c}" for c in columns)
+    kept = f"id IN (SELECT MIN(id) FROM {table} GROUP BY {group} HAVING COUNT(*) > 1)"
+    values = []
+    for column, aggregate in merged.items():
+        if aggregate is None:
+            # Free text: the most recently updated non-empty value. Rows never updated fall back
+            # to their creation time, and rows with neither sort last (Postgres puts NULLs
+            # first in DESC order, SQLite last)
+            recency = "COALESCE(d.updated_at, d.created_at)"
+            values.append(
+                f"{column} = (SELECT d.{column} FROM {table} d WHERE {same_group} AND d.{column} IS NOT NULL "
+                f"ORDER BY {recency} IS NULL, {recency} DESC, d.id DESC LIMIT 1)"
+            )
+        else:
+            values.append(f"{column} = (SELECT {aggregate} FROM {table} d WHERE {same_group})")
+    statements = [f"UPDATE {table} SET {', '.join(values)} WHERE {kept}"]
+    # Raise the status step by step (never lowering it), so the most advanced one in the group wins
+    for i, status in enumerate(statuses):
+        at_least = ', '.join(f"'{s}'" for s in statuses[i:])
+        statements.append(
+            f"UPDATE {table} SET status = '{status}' WHERE {kept} "
+            f"AND (status IS NULL OR status NOT IN ({at_least})) "
+            f"AND EXISTS (SELECT 1 FROM {table} d WHERE {same_group} AND d.status = '{status}')"
+        )
+    statements.append(f"DELETE FROM {table} WHERE id NOT IN (SELECT MIN(id) FROM {table} GROUP BY {group})")
+    return statements
+
+
+def upgrade() -> None:
+    for table, columns, statuses, merged in DEDUPLICATE:
+        for statement in _deduplicate(table, columns, statuses, merged):
+            op.execute(sa.text(statement))
+
+    if _is_postgres():
+        with op.get_context().autocommit_block():
+            for name, table, columns, unique in INDEXES:
+                op.create_index(
+                    name, table, columns, unique=unique,
+                    postgresql_concurrently=True, if_not_exists=True,
+                )
+    else:
+        for name, table, columns, unique in INDEXES:
+            op.create_index(name, table, columns, unique=unique, if_not_exists=True)
+
+
+def downgrade() -> None:
+    # Merged-away duplicate progress rows are gone for good; only the indexes are dropped
+    if _is_postgres():
+        with op.get_context().autocommit_block():
+            for name, table, _, _ in reversed(INDEXES):
+                op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+    else:
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True)
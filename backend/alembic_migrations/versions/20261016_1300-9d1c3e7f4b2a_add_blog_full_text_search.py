@@ -0,0 +1,66 @@
+"""add blog full text search
+
+Revision ID: 9d1c3e7f4b2a
+Revises: 527b03773ce3
+Create Date: 2026-10-16 13:00:12.518734
+
+Full-text search index over blog titles and bodies (see app/db/blog_search.py).
+
+PostgreSQL: stored generated tsvector column ``blog.search_vector`` (title
+weighted A, body B) with a GIN index built CONCURRENTLY. Adding the column
+rewrites the blog table once.
+
+SQLite: external-content FTS5 table ``blog_search`` plus insert/update/delete
+triggers on ``blog``, rebuilt from the existing rows.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '9d1c3e7f4b2a'
+down_revision = '527b03773ce3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute(
+            "ALTER TABLE blog ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(body, '')), 'B')) STORED"
+        )
+        with op.get_context().autocommit_block():
+            op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_blog_search_vector ON blog USING GIN (search_vector)")
+    elif dialect == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS blog_search USING fts5("
+            "title, body, content='blog', content_rowid='id', tokenize='porter unicode61')"
+        )
+        op.execute(
+            "CREATE TRIGGER IF NOT EXISTS blog_search_ai AFTER INSERT ON blog BEGIN "
+            "INSERT INTO blog_search(rowid, title, body) VALUES (new.id, new.title, new.body); END"
+        )
+        op.execute(
+            "CREATE TRIGGER IF NOT EXISTS blog_search_ad AFTER DELETE ON blog BEGIN "
+            "INSERT INTO blog_search(blog_search, rowid, title, body) VALUES ('delete', old.id, old.title, old.body); END"
+        )
+        op.execute(
+            "CREATE TRIGGER IF NOT EXISTS blog_search_au AFTER UPDATE OF title, body ON blog BEGIN "
+            "INSERT INTO blog_search(blog_search, rowid, title, body) VALUES ('delete', old.id, old.title, old.body); "
+            "INSERT INTO blog_search(rowid, title, body) VALUES (new.id, new.title, new.body); END"
+        )
+        op.execute("INSERT INTO blog_search(blog_search) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_blog_search_vector")
+        op.execute("ALTER TABLE blog DROP COLUMN IF EXISTS search_vector")
+    elif dialect == 'sqlite':
+        for trigger in ('blog_search_au', 'blog_search_ad', 'blog_search_ai'):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS blog_search")
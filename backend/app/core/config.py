@@ -18,6 +18,19 @@ class Settings(BaseSettings):
     DEV_DATABASE_URL: str = "sqlite:///./algoverse.db"
     PROD_DATABASE_URL: str = ""
 
+    # Database connection pool (PostgreSQL) and SQLite tuning (development)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT_SECONDS: float = 10.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_STATEMENT_TIMEOUT_MS: int = 15000
+    DB_SQLITE_WAL: bool = True
+    DB_SQLITE_BUSY_TIMEOUT_MS: int = 5000
+
+    # Read replicas (comma-separated URLs) for GET traffic; empty = primary only
+    DATABASE_REPLICA_URLS: str = ""
+    DB_REPLICA_PIN_SECONDS: float = 5.0
+
     # CORS Origins
     DEV_CORS_ORIGINS: str = "http://localhost:5173,http://localhost:5174"
     PROD_CORS_ORIGINS: str = "https://algo-verse-eight.vercel.app,https://algo-verse-mehedi-hasan-khans-projects.vercel.app,https://algo-verse-git-main-mehedi-hasan-khans-projects.vercel.app,https://algo-verse-la484m77d-mehedi-hasan-khans-projects.vercel.app,https://algoverse.vercel.app"
@@ -52,6 +65,31 @@ class Settings(BaseSettings):
     DISABLE_EMAIL: bool = False
     AUTO_CREATE_TABLES: bool = False
     BASE_URL: str = ""
+    THREADPOOL_MAX_WORKERS: int = 40
+
+    # Contest Aggregator
+    CONTEST_FETCH_DEADLINE_SECONDS: float = 15.0
+    CONTEST_REFRESH_ENABLED: bool = True
+    CONTEST_REFRESH_INTERVAL_SECONDS: int = 600
+    CONTEST_REFRESH_CHECK_SECONDS: int = 60
+    CONTEST_REFRESH_DEADLINE_SECONDS: float = 60.0
+    CONTEST_STALE_AFTER_SECONDS: int = 3600
+    CONTEST_BREAKER_FAILURE_THRESHOLD: int = 2
+    CONTEST_BREAKER_BASE_BACKOFF_SECONDS: float = 60.0
+    CONTEST_BREAKER_MAX_BACKOFF_SECONDS: float = 3600.0
+    CONTEST_STREAM_POLL_SECONDS: float = 5.0
+
+    # Response caching for public read endpoints
+    RESPONSE_CACHE_ENABLED: bool = True
+    CACHE_WARMUP_ENABLED: bool = True
+    CACHE_WARMUP_BUDGET_SECONDS: float = 30.0
+
+    # Redis connection pools
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_ASYNC_MAX_CONNECTIONS: int = 50
+    REDIS_SOCKET_CONNECT_TIMEOUT: float = 0.5
+    REDIS_SOCKET_TIMEOUT: float = 0.5
+    REDIS_HEALTH_CHECK_INTERVAL_SECONDS: float = 5.0
 
     # Python Version
     PYTHON_VERSION: str = "3.11.9"
@@ -77,6 +115,11 @@ class Settings(BaseSettings):
             return self.DATABASE_URL
         return self.PROD_DATABASE_URL if self.is_production else self.DEV_DATABASE_URL
     
+    @property
+    def replica_urls(self) -> List[str]:
+        """Read replica database URLs"""
+        return [url.strip() for url in self.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+    
     @property
     def cors_origins(self) -> List[str]:
         """Get appropriate CORS origins based on environment"""
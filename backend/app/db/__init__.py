@@ -1 +1 @@
-from .database import Base, engine, get_db, SessionLocal
\ No newline at end of file
+from .database import Base, engine, get_db, get_read_db, SessionLocal, ReadSessionLocal
\ No newline at end of file
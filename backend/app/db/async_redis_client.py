@@ -0,0 +1,197 @@
+"""
+Non-blocking cache API for async routes.
+
+``AsyncCache`` offers the operations of ``redis_client`` (get, set, delete,
+ttl) plus raw pipelines, on top of
+``redis.asyncio`` with its own connection pool, so ``async def`` handlers
+never block the event loop on a cache round trip. It shares the local tier,
+value codecs and cross-worker invalidation with the sync functions, so both
+APIs read and write the same cache.
+
+``SyncCache`` is a thin adapter exposing the same interface over the
+synchronous client for plain ``def`` routes.
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
+from redis.asyncio import ConnectionPool, Redis as AsyncRedis
+
+from . import redis_client as sync
+from ..core.config import settings
+from .codecs import encode
+from .redis_client import (
+    DEFAULT_EXPIRY,
+    INVALIDATION_CHANNEL,
+    accept_value,
+    command_latency,
+    connection_kwargs,
+    invalidation_message,
+    listener_start_due,
+    local_cache,
+    local_tier_active,
+    local_tier_ready,
+    pool_stats,
+    record_error,
+    redis_health,
+)
+
+
+def _build_pool(decode_responses: bool) -> ConnectionPool:
+    return ConnectionPool(
+        max_connections=settings.REDIS_ASYNC_MAX_CONNECTIONS,
+        decode_responses=decode_responses,
+        **connection_kwargs(),
+    )
+
+
+# Text client for general async use and a bytes client for encoded cache values
+async_redis_client = AsyncRedis(connection_pool=_build_pool(decode_responses=True))
+async_cache_client = AsyncRedis(connection_pool=_build_pool(decode_responses=False))
+
+
+def get_async_redis() -> AsyncRedis:
+    """Return the shared async Redis client (decoded string responses)."""
+    return async_redis_client
+
+
+class AsyncCache:
+    """Async counterpart of the ``redis_client`` cache functions."""
+
+    def __init__(self, client: AsyncRedis):
+        self.client = client
+
+    async def _local_tier_ready(self) -> bool:
+        """``local_tier_ready`` without blocking: a listener (re)start runs on a worker thread."""
+        if local_tier_active():
+            return True
+        if not listener_start_due():
+            return False
+        return await asyncio.to_thread(local_tier_ready)
+
+    async def _publish_invalidation(self, key: str):
+        if not redis_health.healthy:
+            return
+        try:
+            await self.client.publish(INVALIDATION_CHANNEL, invalidation_message(key))
+        except Exception as e:
+            redis_health.mark_failure(e)
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Retrieve a value by key, from the local tier if possible, else from Redis."""
+        use_local = await self._local_tier_ready()
+        if use_local:
+            hit, value = local_cache.get(key)
+            if hit:
+                return value
+        if not redis_health.available():
+            return None
+        try:
+            start = time.perf_counter()
+            async with self.client.pipeline(transaction=False) as pipe:
+                data, ttl = await pipe.get(key).ttl(key).execute()
+            command_latency.record(time.perf_counter() - start)
+            redis_health.mark_success()
+        except Exception as e:
+            record_error(e)
+            return None
+        return accept_value(key, data, ttl, use_local)
+
+    async def set(self, key: str, value: Any, expiry: int = DEFAULT_EXPIRY) -> bool:
+        """Store a value with the given expiration time (seconds)."""
+        if not redis_health.available():
+            local_cache.delete(key)
+            return False
+        try:
+            serialized = encode(value)
+            start = time.perf_counter()
+            stored = await self.client.setex(key, expiry, serialized)
+            command_latency.record(time.perf_counter() - start)
+            redis_health.mark_success()
+        except Exception as e:
+            record_error(e)
+            local_cache.delete(key)
+            return False
+        await self._publish_invalidation(key)
+        if await self._local_tier_ready():
+            local_cache.set(key, value, len(serialized), expiry)
+        return bool(stored)
+
+    async def delete(self, key: str) -> bool:
+        local_cache.delete(key)
+        if not redis_health.available():
+            return False
+        try:
+            deleted = bool(await self.client.delete(key))
+        except Exception as e:
+            record_error(e)
+            return False
+        await self._publish_invalidation(key)
+        return deleted
+
+    async def ttl(self, key: str) -> Optional[int]:
+        """Remaining TTL in seconds, or None if the key doesn't exist."""
+        if not redis_health.available():
+            return None
+        try:
+            ttl = await self.client.ttl(key)
+            return ttl if ttl > 0 else None
+        except Exception as e:
+            record_error(e)
+            return None
+
+    def pipeline(self, transaction: bool = False):
+        """Raw pipeline on the bytes client; values read through it are not decoded."""
+        return self.client.pipeline(transaction=transaction)
+
+
+class SyncCache:
+    """Same interface as ``AsyncCache`` over the synchronous client, for sync routes."""
+
+    def get(self, key: str) -> Optional[Any]:
+        return sync.get_cache(key)
+
+    def set(self, key: str, value: Any, expiry: int = DEFAULT_EXPIRY) -> bool:
+        return bool(sync.set_cache(key, value, expiry))
+
+    def delete(self, key: str) -> bool:
+        return sync.delete_cache(key)
+
+    def ttl(self, key: str) -> Optional[int]:
+        return sync.get_cache_ttl(key)
+
+    def pipeline(self, transaction: bool = False):
+        return sync.cache_client.pipeline(transaction=transaction)
+
+
+# Create shared facade instances
+async_cache = AsyncCache(async_cache_client)
+sync_cache = SyncCache()
+
+
+def get_async_cache() -> AsyncCache:
+    """Return the shared async cache facade (usable as a FastAPI dependency)."""
+    return async_cache
+
+
+def get_sync_cache() -> SyncCache:
+    """Return the sync cache adapter (usable as a FastAPI dependency)."""
+    return sync_cache
+
+
+def get_async_pool_stats() -> Dict[str, Dict[str, int]]:
+    """Connection usage of the async pools (see ``redis_client.pool_stats``)."""
+    return {
+        "text": pool_stats(async_redis_client.connection_pool),
+        "binary": pool_stats(async_cache_client.connection_pool),
+    }
+
+
+async def close_async_redis():
+    """Close the async connection pools (called on application shutdown)."""
+    for client in (async_redis_client, async_cache_client):
+        try:
+            await client.close(close_connection_pool=True)
+        except Exception:
+            pass
@@ -0,0 +1,119 @@
+"""
+Full-text search index for blogs.
+
+PostgreSQL: a stored generated ``tsvector`` column ``blog.search_vector``
+(title weighted above body) with a GIN index. SQLite: an external-content
+FTS5 table ``blog_search`` over title and body, kept in sync by triggers.
+
+Either way the database maintains the index itself on every insert, update
+and delete of a blog row, so creating, editing, moderating or deleting a blog
+needs no extra application code. The objects are created together with the
+``blog`` table (``create_all``) and by the migration for existing databases.
+Other databases fall back to a (slow, unranked) substring scan.
+"""
+
+import re
+from typing import List, Optional, Tuple
+
+from sqlalchemy import Float, cast, column, event, func, literal_column, table
+from sqlalchemy.orm import Query, Session
+from sqlalchemy.sql.elements import ColumnElement
+
+from ..models import Blog
+
+SEARCH_CONFIG = "english"
+SNIPPET_WORDS = 30
+
+# Title matches count this many times more than body matches (SQLite bm25 column weights)
+TITLE_WEIGHT = 10.0
+
+POSTGRES_DDL = [
+    f"ALTER TABLE blog ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ("
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(body, '')), 'B')) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_blog_search_vector ON blog USING GIN (search_vector)",
+]
+
+SQLITE_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS blog_search USING fts5("
+    "title, body, content='blog', content_rowid='id', tokenize='porter unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS blog_search_ai AFTER INSERT ON blog BEGIN "
+    "INSERT INTO blog_search(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+    "CREATE TRIGGER IF NOT EXISTS blog_search_ad AFTER DELETE ON blog BEGIN "
+    "INSERT INTO blog_search(blog_search, rowid, title, body) VALUES ('delete', old.id, old.title, old.body); END",
+    "CREATE TRIGGER IF NOT EXISTS blog_search_au AFTER UPDATE OF title, body ON blog BEGIN "
+    "INSERT INTO blog_search(blog_search, rowid, title, body) VALUES ('delete', old.id, old.title, old.body); "
+    "INSERT INTO blog_search(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+]
+
+_fts = table("blog_search", column("rowid"))
+_fts_ref = literal_column("blog_search")
+
+
+def is_search_object(name: Optional[str]) -> bool:
+    """Whether a reflected table/column/index belongs to the search index (not to the models)."""
+    return bool(name) and (name in ("search_vector", "ix_blog_search_vector") or name.startswith("blog_search"))
+
+
+@event.listens_for(Blog.__table__, "after_create")
+def _create_search_index(target, connection, **kw):
+    ddl = {"postgresql": POSTGRES_DDL, "sqlite": SQLITE_DDL}.get(connection.dialect.name, [])
+    for statement in ddl:
+        connection.exec_driver_sql(statement)
+
+
+@event.listens_for(Blog.__table__, "after_drop")
+def _drop_search_index(target, connection, **kw):
+    # The triggers and the Postgres column go with the table; the FTS5 table does not
+    if connection.dialect.name == "sqlite":
+        connection.exec_driver_sql("DROP TABLE IF EXISTS blog_search")
+
+
+def search_terms(text: str) -> List[str]:
+    return re.findall(r"\w+", text)
+
+
+def match_query(db: Session, text: str) -> Optional[Tuple[Query, ColumnElement, ColumnElement]]:
+    """Query blogs matching every word of ``text``, with a relevance score and a body snippet.
+
+    Returns:
+        (query, score, snippet): the query selects ``(Blog, score, snippet)``; higher
+        scores are better. None if ``text`` has no searchable words.
+    """
+    terms = search_terms(text)
+    if not terms:
+        return None
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        vector = literal_column("blog.search_vector")
+        # plainto_tsquery ANDs every word; websearch_to_tsquery would read "or" and "-" as operators
+        tsquery = func.plainto_tsquery(SEARCH_CONFIG, " ".join(terms))
+        # ts_rank_cd returns real; cursors carry the score as a double, so rank in double
+        # precision or a page boundary falls between two roundings of the same score
+        score = cast(func.ts_rank_cd(vector, tsquery), Float(53)).label("score")
+        snippet = func.ts_headline(
+            SEARCH_CONFIG,
+            Blog.body,
+            tsquery,
+            f'StartSel="", StopSel="", MaxWords={SNIPPET_WORDS}, MinWords={SNIPPET_WORDS // 2}',
+        ).label("snippet")
+        query = db.query(Blog, score, snippet).filter(vector.op("@@")(tsquery))
+    elif dialect == "sqlite":
+        # Quote each word so user input can't form FTS5 query syntax
+        match = " ".join(f'"{term}"' for term in terms)
+        # bm25() is lower for better matches
+        score = (-func.bm25(_fts_ref, TITLE_WEIGHT, 1.0, type_=Float)).label("score")
+        snippet = func.snippet(_fts_ref, 1, "", "", "...", SNIPPET_WORDS).label("snippet")
+        query = (
+            db.query(Blog, score, snippet)
+            .join(_fts, _fts.c.rowid == Blog.id)
+            .filter(_fts_ref.match(match))
+        )
+    else:
+        score = literal_column("0", Float).label("score")
+        snippet = func.substr(Blog.body, 1, 200).label("snippet")
+        query = db.query(Blog, score, snippet)
+        for term in terms:
+            query = query.filter(Blog.title.ilike(f"%{term}%") | Blog.body.ilike(f"%{term}%"))
+    return query, score, snippet
@@ -0,0 +1,170 @@
+"""
+Tag-based invalidation for cached responses.
+
+A cached entry registers the tags it depends on (``algorithm:42``,
+``algo_type:3``, ``blog:list``...) by adding its key to one Redis set per
+tag. Invalidating a tag deletes every key in its set, drops the keys from
+this worker's local tier and tells the other workers to do the same.
+
+Every invalidation also bumps a per-tag generation counter. A writer of a
+new entry snapshots the generations of its tags before reading the
+database and drops the entry if they moved by the time it is stored: an
+invalidation that ran in between may have missed the entry (its key was not
+registered yet) while the body it holds predates the write.
+
+Repositories call ``invalidate_on_commit(db, ...)`` next to their writes.
+The tags are held on the session and only invalidated once the transaction
+actually commits (and discarded on rollback), so readers cannot re-cache the
+old rows between the invalidation and the commit.
+
+If Redis can't be reached when the tags are invalidated, the tags are kept
+and invalidated again once Redis recovers (or with the next successful
+invalidation), so cached lists don't outlive their rows by a full TTL.
+"""
+
+import logging
+import threading
+from typing import Iterable, List, Optional, Set
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from .async_redis_client import get_async_redis
+from .redis_client import delete_many, get_redis, record_error, redis_health
+
+logger = logging.getLogger(__name__)
+
+TAG_KEY = "cache_tag:{tag}"
+GENERATION_KEY = "cache_tag_gen:{tag}"
+
+# Tag sets live at least this long; stale members only point at expired keys
+TAG_SET_EXPIRY = 60 * 60 * 24
+
+# Session.info key holding tags to invalidate after the next commit
+_PENDING = "pending_cache_tags"
+
+# Tags whose invalidation failed, retried when Redis is reachable again
+_failed_tags: Set[str] = set()
+_failed_lock = threading.Lock()
+
+
+def tag_key(key: str, tags: Iterable[str], ttl: int) -> None:
+    """Record that the cache entry ``key`` (cached for ``ttl`` seconds) depends on ``tags``."""
+    tags = list(tags)
+    if not tags:
+        return
+    try:
+        pipe = get_redis().pipeline(transaction=False)
+        for tag in tags:
+            set_key = TAG_KEY.format(tag=tag)
+            pipe.sadd(set_key, key)
+            pipe.expire(set_key, max(ttl, TAG_SET_EXPIRY))
+        pipe.execute()
+    except Exception as e:
+        record_error(e)
+
+
+async def async_tag_key(key: str, tags: Iterable[str], ttl: int) -> None:
+    """``tag_key`` for async code, without blocking the event loop."""
+    tags = list(tags)
+    if not tags or not redis_health.available():
+        return
+    try:
+        async with get_async_redis().pipeline(transaction=False) as pipe:
+            for tag in tags:
+                set_key = TAG_KEY.format(tag=tag)
+                pipe.sadd(set_key, key)
+                pipe.expire(set_key, max(ttl, TAG_SET_EXPIRY))
+            await pipe.execute()
+    except Exception as e:
+        record_error(e)
+
+
+def tag_generations(tags: Iterable[str]) -> Optional[List[Optional[str]]]:
+    """Current invalidation generation of each tag, or None if Redis can't be read."""
+    tags = list(tags)
+    if not tags:
+        return []
+    try:
+        return get_redis().mget([GENERATION_KEY.format(tag=tag) for tag in tags])
+    except Exception as e:
+        record_error(e)
+        return None
+
+
+async def async_tag_generations(tags: Iterable[str]) -> Optional[List[Optional[str]]]:
+    """``tag_generations`` for async code."""
+    tags = list(tags)
+    if not tags:
+        return []
+    if not redis_health.available():
+        return None
+    try:
+        return await get_async_redis().mget([GENERATION_KEY.format(tag=tag) for tag in tags])
+    except Exception as e:
+        record_error(e)
+        return None
+
+
+def invalidate_tags(*tags: str) -> int:
+    """Delete every cache entry registered under any of ``tags``.
+
+    Tags from earlier failed invalidations are retried along with them. If
+    Redis fails, all of them are kept for the next attempt.
+
+    Returns:
+        int: Number of cache keys removed
+    """
+    with _failed_lock:
+        tags = tuple(sorted(set(tags) | _failed_tags))
+        _failed_tags.clear()
+    if not tags:
+        return 0
+    set_keys = [TAG_KEY.format(tag=tag) for tag in tags]
+    try:
+        redis = get_redis()
+        pipe = redis.pipeline(transaction=True)
+        for tag in tags:
+            generation_key = GENERATION_KEY.format(tag=tag)
+            pipe.incr(generation_key)
+            pipe.expire(generation_key, TAG_SET_EXPIRY)
+        for set_key in set_keys:
+            pipe.smembers(set_key)
+        pipe.delete(*set_keys)
+        members = pipe.execute()[2 * len(tags):-1]
+    except Exception as e:
+        record_error(e)
+        logger.warning(f"Cache invalidation failed for tags {', '.join(tags)}, retrying when Redis recovers: {str(e)}")
+        with _failed_lock:
+            _failed_tags.update(tags)
+        return 0
+    keys: Set[str] = set().union(*members)
+    delete_many(keys)
+    return len(keys)
+
+
+def retry_failed_invalidations() -> int:
+    """Invalidate the tags left over from failed invalidations, if any."""
+    return invalidate_tags() if _failed_tags else 0
+
+
+redis_health.on_recovery(retry_failed_invalidations)
+
+
+def invalidate_on_commit(db: Session, *tags: str) -> None:
+    """Invalidate ``tags`` once ``db``'s current transaction commits."""
+    db.info.setdefault(_PENDING, set()).update(tags)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session):
+    tags = session.info.pop(_PENDING, None)
+    if tags:
+        invalidate_tags(*sorted(tags))
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_after_rollback(session: Session, previous_transaction):
+    # Rolling back a savepoint keeps the outer transaction (and its writes) alive
+    if not previous_transaction.nested:
+        session.info.pop(_PENDING, None)
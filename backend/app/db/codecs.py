@@ -0,0 +1,133 @@
+"""
+Serialization and compression of cache values stored in Redis.
+
+Every encoded value starts with a 3-byte header: a magic byte, the
+serializer id and the compression id. Readers pick the codec from the
+header, so the configured codecs can change (or a faster library can be
+installed) without flushing the cache; values written before the header
+existed are plain JSON text and are still read as such.
+
+orjson, msgpack, zstandard and lz4 are optional. The best installed option
+is used unless ``CACHE_SERIALIZER`` / ``CACHE_COMPRESSION`` pick one, and
+json/zlib from the standard library are always available as a fallback.
+Values smaller than ``CACHE_COMPRESS_MIN_BYTES`` are not compressed, and
+compression is skipped when it does not make the value smaller.
+"""
+
+import json
+import os
+import threading
+import zlib
+from typing import Any, Callable, Dict, Tuple
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:  # pragma: no cover - optional dependency
+    lz4_frame = None
+
+# 0xC1 is never valid UTF-8 nor a msgpack type byte, so it cannot start legacy JSON text
+MAGIC = 0xC1
+
+Serializer = Tuple[Callable[[Any], bytes], Callable[[bytes], Any]]
+Compressor = Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]
+
+# Ids are stored in values: never renumber, only append
+SERIALIZER_IDS = {"json": 1, "orjson": 2, "msgpack": 3}
+COMPRESSION_IDS = {"none": 0, "zlib": 1, "zstd": 2, "lz4": 3}
+
+SERIALIZERS: Dict[str, Serializer] = {
+    "json": (lambda v: json.dumps(v, separators=(",", ":")).encode(), json.loads),
+}
+if orjson is not None:
+    # Non-str keys are written as strings, the same as json.dumps does
+    SERIALIZERS["orjson"] = (lambda v: orjson.dumps(v, option=orjson.OPT_NON_STR_KEYS), orjson.loads)
+if msgpack is not None:
+    SERIALIZERS["msgpack"] = (
+        lambda v: msgpack.packb(v, use_bin_type=True),
+        lambda b: msgpack.unpackb(b, raw=False),
+    )
+
+COMPRESSORS: Dict[str, Compressor] = {
+    "zlib": (lambda b: zlib.compress(b, 6), zlib.decompress),
+}
+if zstandard is not None:
+    # Compressor objects must not be shared between threads: keep one per thread
+    _zstd = threading.local()
+
+    def _zstd_compress(data: bytes) -> bytes:
+        compressor = getattr(_zstd, "compressor", None)
+        if compressor is None:
+            compressor = _zstd.compressor = zstandard.ZstdCompressor(level=3)
+        return compressor.compress(data)
+
+    COMPRESSORS["zstd"] = (_zstd_compress, lambda b: zstandard.ZstdDecompressor().decompress(b))
+if lz4_frame is not None:
+    COMPRESSORS["lz4"] = (lz4_frame.compress, lz4_frame.decompress)
+
+_SERIALIZERS_BY_ID = {SERIALIZER_IDS[name]: codec for name, codec in SERIALIZERS.items()}
+_COMPRESSORS_BY_ID = {COMPRESSION_IDS[name]: codec for name, codec in COMPRESSORS.items()}
+
+
+def _pick(requested: str, available, preference: Tuple[str, ...]) -> str:
+    if requested in available:
+        return requested
+    return next(name for name in preference if name in available)
+
+
+CACHE_SERIALIZER = _pick(os.getenv("CACHE_SERIALIZER", ""), SERIALIZERS, ("orjson", "msgpack", "json"))
+CACHE_COMPRESSION = _pick(
+    os.getenv("CACHE_COMPRESSION", ""), set(COMPRESSORS) | {"none"}, ("zstd", "lz4", "zlib")
+)
+CACHE_COMPRESS_MIN_BYTES = int(os.getenv("CACHE_COMPRESS_MIN_BYTES", "1024"))
+
+
+class CodecError(ValueError):
+    """Raised when a stored value cannot be decoded by this process."""
+
+
+def encode(value: Any, serializer: str = None, compression: str = None) -> bytes:
+    """Serialize ``value`` with the configured codecs and prepend the header."""
+    serializer = serializer or CACHE_SERIALIZER
+    compression = compression or CACHE_COMPRESSION
+    body = SERIALIZERS[serializer][0](value)
+    used = "none"
+    if compression != "none" and len(body) >= CACHE_COMPRESS_MIN_BYTES:
+        compressed = COMPRESSORS[compression][0](body)
+        if len(compressed) < len(body):
+            body, used = compressed, compression
+    return bytes((MAGIC, SERIALIZER_IDS[serializer], COMPRESSION_IDS[used])) + body
+
+
+def decode(data: bytes) -> Any:
+    """Decode a value written by ``encode`` (or legacy plain JSON).
+
+    Raises:
+        CodecError: If the value uses a codec that is not installed here
+    """
+    if not data or data[0] != MAGIC:
+        return json.loads(data)
+    if len(data) < 3:
+        raise CodecError("Truncated cache value header")
+    serializer = _SERIALIZERS_BY_ID.get(data[1])
+    compressor = _COMPRESSORS_BY_ID.get(data[2]) if data[2] else None
+    if serializer is None or (data[2] and compressor is None):
+        raise CodecError(f"Unsupported cache codec {data[1]}/{data[2]}")
+    body = data[3:]
+    if compressor is not None:
+        body = compressor[1](body)
+    return serializer[1](body)
@@ -1,29 +1,238 @@
 # algoverse/database.py
-from sqlalchemy import create_engine
+import itertools
+import logging
+import math
+import sqlite3
+import time
+from typing import Any, Dict, Iterator, Optional
+
+from fastapi import Request, Response
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool
 
 from ..core.config import settings
+from .redis_health import LatencyStats
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize_url(url: str) -> str:
+    if url.startswith("postgres://"):
+        return url.replace("postgres://", "postgresql://", 1)
+    return url
 
-SQLALCHEMY_DATABASE_URL = settings.database_url
 
-if SQLALCHEMY_DATABASE_URL.startswith("postgres://"):
-    SQLALCHEMY_DATABASE_URL = SQLALCHEMY_DATABASE_URL.replace("postgres://", "postgresql://", 1)
+SQLALCHEMY_DATABASE_URL = _normalize_url(settings.database_url)
 
 is_sqlite = SQLALCHEMY_DATABASE_URL.startswith("sqlite")
 
-engine_kwargs = {}
-if is_sqlite:
-    engine_kwargs["connect_args"] = {"check_same_thread": False}
-else:
-    engine_kwargs["pool_pre_ping"] = True
+# Connection churn and checkout waits across all engines (primary and replicas)
+pool_counters: Dict[str, int] = {"connects": 0, "closes": 0, "invalidations": 0, "checkout_timeouts": 0}
+checkout_wait = LatencyStats()
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            pool_counters["checkout_timeouts"] += 1
+            logger.warning(f"Database pool exhausted: no connection within {self._timeout}s ({self.status()})")
+            raise
+        finally:
+            checkout_wait.record(time.perf_counter() - start)
+
+
+def _engine_kwargs(url: str) -> Dict[str, Any]:
+    kwargs: Dict[str, Any] = {}
+    if url.startswith("sqlite"):
+        kwargs["connect_args"] = {"check_same_thread": False}
+        if ":memory:" not in url and url.rstrip("/") != "sqlite:":
+            kwargs["poolclass"] = TimedQueuePool
+    else:
+        kwargs.update(
+            poolclass=TimedQueuePool,
+            pool_pre_ping=True,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+            pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        )
+        if settings.DB_STATEMENT_TIMEOUT_MS > 0:
+            kwargs["connect_args"] = {"options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"}
+    return kwargs
+
+
+def _on_connect(dbapi_connection, connection_record):
+    pool_counters["connects"] += 1
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        if settings.DB_SQLITE_WAL:
+            cursor.execute("PRAGMA journal_mode=WAL")
+            # Safe with WAL: only the last transactions can be lost on power failure
+            cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={settings.DB_SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+
+
+def _on_close(dbapi_connection, connection_record):
+    pool_counters["closes"] += 1
+
+
+def _on_invalidate(dbapi_connection, connection_record, exception):
+    pool_counters["invalidations"] += 1
+
+
+def make_engine(url: str):
+    """Create an engine with the pool settings and connection hooks above."""
+    url = _normalize_url(url)
+    new_engine = create_engine(url, **_engine_kwargs(url))
+    event.listen(new_engine, "connect", _on_connect)
+    event.listen(new_engine, "close", _on_close)
+    event.listen(new_engine, "invalidate", _on_invalidate)
+    return new_engine
+
+
+engine = make_engine(SQLALCHEMY_DATABASE_URL)
+replica_engines = [make_engine(url) for url in settings.replica_urls]
+
+
+def _queue_pool_stats(pool) -> Dict[str, Any]:
+    stats: Dict[str, Any] = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+            max_overflow=pool._max_overflow,
+        )
+    return stats
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """Pool occupancy, connection churn and checkout wait times."""
+    return {
+        **_queue_pool_stats(engine.pool),
+        **pool_counters,
+        "checkout_wait": checkout_wait.info(),
+        "replicas": [_queue_pool_stats(replica.pool) for replica in replica_engines],
+    }
+
+
+# ---------- Read replica routing ----------
+
+# Cookie marking a client that just wrote: its reads go to the primary for a while
+PRIMARY_PIN_COOKIE = "db_primary_pin"
+
+# Session.info key of the response that a request session's writes pin
+_PIN_RESPONSE = "pin_response"
+
+
+def pin_primary(response: Response, seconds: float = None):
+    """Send this client's reads to the primary for a while (replication lag window)."""
+    seconds = settings.DB_REPLICA_PIN_SECONDS if seconds is None else seconds
+    response.set_cookie(PRIMARY_PIN_COOKIE, "1", max_age=max(1, math.ceil(seconds)), httponly=True, samesite="lax")
+
+
+def primary_pinned(request: Optional[Request]) -> bool:
+    return request is not None and PRIMARY_PIN_COOKIE in request.cookies
+
+
+class RoutingSession(Session):
+    """Session that reads from a replica and writes to the primary.
+
+    One replica is chosen per session so its reads are consistent. Once the
+    session flushes or executes a DML statement it stays on the primary, so
+    it reads its own writes; after a request commits writes, that client's
+    read sessions are pinned to the primary for ``DB_REPLICA_PIN_SECONDS``
+    (see ``get_db``).
+    """
+
+    def __init__(self, *args, primary=None, replicas: Optional[Iterator] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.primary = primary
+        self.replica = next(replicas) if replicas is not None else None
+        self.use_primary = self.replica is None
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if clause is not None and getattr(clause, "is_dml", False):
+            self.use_primary = True
+        return self.primary if self.use_primary else self.replica
+
+
+@event.listens_for(Session, "before_flush")
+def _track_flush(session, flush_context, instances):
+    session.info["wrote"] = True
+    if isinstance(session, RoutingSession):
+        session.use_primary = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_dml(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _forget_writes(session, previous_transaction):
+    if not previous_transaction.nested:
+        session.info.pop("wrote", None)
+
+
+@event.listens_for(Session, "after_commit")
+def _pin_after_write(session):
+    response = session.info.get(_PIN_RESPONSE)
+    if session.info.pop("wrote", False) and replica_engines and response is not None:
+        pin_primary(response)
+
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL, **engine_kwargs)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+_replica_cycle = itertools.cycle(replica_engines) if replica_engines else None
+
+ReadSessionLocal = sessionmaker(
+    class_=RoutingSession,
+    autocommit=False,
+    autoflush=False,
+    primary=engine,
+    replicas=_replica_cycle,
+)
+
 Base = declarative_base()
 
-def get_db():
+def get_db(response: Response = None):
+    """Session on the primary.
+
+    When it commits a write during a request, the response pins the
+    client's reads to the primary (cookie) until replicas have caught up.
+    """
     db = SessionLocal()
+    if response is not None:
+        db.info[_PIN_RESPONSE] = response
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_read_db(request: Request = None):
+    """Session for read-mostly (GET) handlers: served by a replica when configured.
+
+    Falls back to the primary when there are no replicas or this client's
+    recent write pinned its reads to it.
+    """
+    if _replica_cycle is None or primary_pinned(request):
+        db = SessionLocal()
+    else:
+        db = ReadSessionLocal()
     try:
         yield db
     finally:
@@ -1,7 +1,13 @@
-from redis import Redis
+from redis import ConnectionPool, Redis
 import os
-import json
-from typing import Optional, Any, Dict
+import time
+import uuid
+from typing import Optional, Any, Dict, Iterable
+
+from ..core.config import settings
+from .codecs import decode, encode
+from .local_cache import LocalCache
+from .redis_health import LatencyStats, RedisHealth
 
 # Get Redis configuration from environment variables with defaults
 REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
@@ -12,41 +18,175 @@ REDIS_PASSWORD = os.getenv("REDIS_PASSWORD", None)
 # Default expiration time for cache entries (24 hours in seconds)
 DEFAULT_EXPIRY = 60 * 60 * 24
 
-# Create a Redis client instance
-redis_client = Redis(
-    host=REDIS_HOST,
-    port=REDIS_PORT,
-    db=REDIS_DB,
-    password=REDIS_PASSWORD,
-    decode_responses=True,  # Automatically decode responses to strings
-)
+# In-process first tier in front of Redis for get_cache/set_cache
+CACHE_LOCAL_MAX_ITEMS = int(os.getenv("CACHE_LOCAL_MAX_ITEMS", "1024"))
+CACHE_LOCAL_MAX_BYTES = int(os.getenv("CACHE_LOCAL_MAX_BYTES", str(32 * 1024 * 1024)))
+CACHE_LOCAL_TTL_SECONDS = float(os.getenv("CACHE_LOCAL_TTL_SECONDS", "30"))
+
+# Writes and deletes are announced here so other workers drop their local copy
+INVALIDATION_CHANNEL = "cache_invalidate"
+LISTENER_RETRY_SECONDS = 5
+
+
+class RedisUnavailable(ConnectionError):
+    """Raised by ``get_redis()`` while Redis is marked unhealthy."""
+
+
+def connection_kwargs() -> Dict[str, Any]:
+    """Address and timeouts shared by the sync and async pools."""
+    return {
+        "host": REDIS_HOST,
+        "port": REDIS_PORT,
+        "db": REDIS_DB,
+        "password": REDIS_PASSWORD,
+        "socket_connect_timeout": settings.REDIS_SOCKET_CONNECT_TIMEOUT,
+        "socket_timeout": settings.REDIS_SOCKET_TIMEOUT,
+        "socket_keepalive": True,
+    }
+
+
+def _build_pool(decode_responses: bool) -> ConnectionPool:
+    return ConnectionPool(
+        max_connections=settings.REDIS_MAX_CONNECTIONS,
+        decode_responses=decode_responses,
+        **connection_kwargs(),
+    )
+
+
+# Text client for general use (decoded string responses)
+redis_client = Redis(connection_pool=_build_pool(decode_responses=True))
+
+# Cache values are binary (see codecs), so they go through a client that returns bytes
+cache_client = Redis(connection_pool=_build_pool(decode_responses=False))
+
+redis_health = RedisHealth(redis_client.ping, settings.REDIS_HEALTH_CHECK_INTERVAL_SECONDS)
+command_latency = LatencyStats()
+
+local_cache = LocalCache(CACHE_LOCAL_MAX_ITEMS, CACHE_LOCAL_MAX_BYTES, CACHE_LOCAL_TTL_SECONDS)
+
+WORKER_ID = uuid.uuid4().hex
+redis_stats: Dict[str, int] = {"hits": 0, "misses": 0, "errors": 0}
+_listener = None
+_listener_retry_at = 0.0
 
 
 def get_redis() -> Redis:
-    """Return the Redis client instance."""
+    """Return the Redis client instance.
+
+    Raises:
+        RedisUnavailable: While Redis is marked unhealthy, so callers fall
+            back immediately instead of waiting on a connection timeout
+    """
+    if not redis_health.available():
+        raise RedisUnavailable("Redis is marked unhealthy")
     return redis_client
 
 
+def record_error(error: BaseException):
+    """Count a failed Redis call; outages mark Redis unhealthy."""
+    if isinstance(error, RedisUnavailable):
+        # Raised by get_redis() itself while bypassing Redis: no call was made
+        return
+    redis_stats["errors"] += 1
+    redis_health.mark_failure(error)
+
+
+def _on_invalidate(message):
+    origin, _, key = message["data"].partition("|")
+    if origin == WORKER_ID:
+        return
+    if key == "*":
+        local_cache.clear()
+    else:
+        local_cache.delete(key)
+
+
+def local_tier_active() -> bool:
+    """Whether this worker's invalidation listener is running (never blocks or starts it)."""
+    return _listener is not None and _listener.is_alive()
+
+
+def listener_start_due() -> bool:
+    """Whether ``local_tier_ready`` would try to (re)start the listener now."""
+    return not local_tier_active() and time.monotonic() >= _listener_retry_at and redis_health.healthy
+
+
+def local_tier_ready() -> bool:
+    """Make sure this worker listens for invalidations; the local tier is only used while it does.
+
+    Starting the listener connects to Redis, so async code checks
+    ``local_tier_active``/``listener_start_due`` and calls this off the event loop.
+    """
+    global _listener, _listener_retry_at
+    if local_tier_active():
+        return True
+    if not listener_start_due():
+        return False
+    _listener_retry_at = time.monotonic() + LISTENER_RETRY_SECONDS
+    # Invalidations may have been missed while the listener was down
+    local_cache.clear()
+    try:
+        pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(**{INVALIDATION_CHANNEL: _on_invalidate})
+        _listener = pubsub.run_in_thread(sleep_time=1, daemon=True)
+        return True
+    except Exception as e:
+        redis_health.mark_failure(e)
+        _listener = None
+        return False
+
+
+def invalidation_message(key: str) -> str:
+    return f"{WORKER_ID}|{key}"
+
+
+def publish_invalidation(key: str):
+    if not redis_health.healthy:
+        return
+    try:
+        redis_client.publish(INVALIDATION_CHANNEL, invalidation_message(key))
+    except Exception as e:
+        redis_health.mark_failure(e)
+
+
 def set_cache(key: str, value: Any, expiry: int = DEFAULT_EXPIRY) -> bool:
     """Store a value in Redis with the given key and expiration time.
     
+    The value is also kept in this worker's local tier, and other workers
+    are told to drop their copy.
+    
     Args:
         key: The cache key
-        value: The value to store (will be JSON serialized)
+        value: The value to store (serialized and possibly compressed by ``codecs.encode``)
         expiry: Expiration time in seconds (default: 24 hours)
         
     Returns:
         bool: True if successful, False otherwise
     """
+    if not redis_health.available():
+        local_cache.delete(key)
+        return False
     try:
-        serialized = json.dumps(value)
-        return redis_client.setex(key, expiry, serialized)
-    except Exception:
+        serialized = encode(value)
+        start = time.perf_counter()
+        stored = cache_client.setex(key, expiry, serialized)
+        command_latency.record(time.perf_counter() - start)
+        redis_health.mark_success()
+    except Exception as e:
+        record_error(e)
+        local_cache.delete(key)
         return False
+    publish_invalidation(key)
+    if local_tier_ready():
+        local_cache.set(key, value, len(serialized), expiry)
+    return stored
 
 
 def get_cache(key: str) -> Optional[Any]:
-    """Retrieve a value from Redis by key.
+    """Retrieve a value by key, from the local tier if possible, else from Redis.
+    
+    Values served from the local tier are shared between callers and must
+    not be mutated.
     
     Args:
         key: The cache key
@@ -54,17 +194,45 @@ def get_cache(key: str) -> Optional[Any]:
     Returns:
         The deserialized value if found, None otherwise
     """
+    use_local = local_tier_ready()
+    if use_local:
+        hit, value = local_cache.get(key)
+        if hit:
+            return value
+    if not redis_health.available():
+        return None
     try:
-        data = redis_client.get(key)
-        if data is None:
-            return None
-        return json.loads(data)
+        start = time.perf_counter()
+        pipe = cache_client.pipeline(transaction=False)
+        pipe.get(key)
+        pipe.ttl(key)
+        data, ttl = pipe.execute()
+        command_latency.record(time.perf_counter() - start)
+        redis_health.mark_success()
+    except Exception as e:
+        record_error(e)
+        return None
+    return accept_value(key, data, ttl, use_local)
+
+
+def accept_value(key: str, data: Optional[bytes], ttl: int, use_local: bool) -> Optional[Any]:
+    """Decode a value read from Redis, count the hit or miss and fill the local tier."""
+    if data is None:
+        redis_stats["misses"] += 1
+        return None
+    redis_stats["hits"] += 1
+    try:
+        value = decode(data)
     except Exception:
         return None
+    if use_local:
+        # Never keep a local copy past the Redis expiry
+        local_cache.set(key, value, len(data), ttl if ttl > 0 else None)
+    return value
 
 
 def delete_cache(key: str) -> bool:
-    """Delete a value from Redis by key.
+    """Delete a value from Redis (and every worker's local tier) by key.
     
     Args:
         key: The cache key
@@ -72,10 +240,83 @@ def delete_cache(key: str) -> bool:
     Returns:
         bool: True if successful, False otherwise
     """
+    local_cache.delete(key)
+    if not redis_health.available():
+        return False
     try:
-        return bool(redis_client.delete(key))
-    except Exception:
+        deleted = bool(redis_client.delete(key))
+    except Exception as e:
+        record_error(e)
         return False
+    publish_invalidation(key)
+    return deleted
+
+
+def get_many_ttl(keys: Iterable[str]) -> Dict[str, Optional[int]]:
+    """Get the remaining TTL of several keys in one round trip.
+    
+    Returns:
+        Dict of key -> remaining seconds, or None if the key doesn't exist
+    """
+    keys = list(dict.fromkeys(keys))
+    if not keys or not redis_health.available():
+        return {key: None for key in keys}
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        for key in keys:
+            pipe.ttl(key)
+        ttls = pipe.execute()
+    except Exception as e:
+        record_error(e)
+        return {key: None for key in keys}
+    return {key: ttl if ttl > 0 else None for key, ttl in zip(keys, ttls)}
+
+
+def delete_many(keys: Iterable[str]) -> int:
+    """Delete several keys (and every worker's local copies) in one round trip.
+    
+    Returns:
+        int: Number of keys deleted
+    """
+    keys = list(dict.fromkeys(keys))
+    for key in keys:
+        local_cache.delete(key)
+    if not keys or not redis_health.available():
+        return 0
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.unlink(*keys)
+        for key in keys:
+            pipe.publish(INVALIDATION_CHANNEL, invalidation_message(key))
+        return pipe.execute()[0]
+    except Exception as e:
+        record_error(e)
+        return 0
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    """Hit/miss/eviction counters for the local and Redis tiers."""
+    return {
+        "local": local_cache.info(),
+        "redis": dict(redis_stats),
+        "invalidation_listener": _listener is not None and _listener.is_alive(),
+        "health": redis_health.info(),
+        "latency": command_latency.info(),
+        "pools": {
+            "text": pool_stats(redis_client.connection_pool),
+            "binary": pool_stats(cache_client.connection_pool),
+        },
+    }
+
+
+def pool_stats(pool: ConnectionPool) -> Dict[str, int]:
+    """Connections created, idle and checked out in a connection pool."""
+    return {
+        "max_connections": pool.max_connections,
+        "created": pool._created_connections,
+        "idle": len(pool._available_connections),
+        "in_use": len(pool._in_use_connections),
+    }
 
 
 def get_cache_ttl(key: str) -> Optional[int]:
@@ -87,8 +328,11 @@ def get_cache_ttl(key: str) -> Optional[int]:
     Returns:
         int: Remaining time in seconds, or None if key doesn't exist
     """
+    if not redis_health.available():
+        return None
     try:
         ttl = redis_client.ttl(key)
         return ttl if ttl > 0 else None
-    except Exception:
+    except Exception as e:
+        record_error(e)
         return None
\ No newline at end of file
@@ -0,0 +1,160 @@
+"""
+Redis health tracking so an unreachable Redis costs requests (almost) nothing.
+
+A background thread pings Redis every ``interval`` seconds. Connection errors
+and timeouts seen by the cache helpers also mark Redis unhealthy right away.
+While unhealthy, callers check ``available()`` and skip Redis entirely
+instead of waiting on a socket timeout; at most one request per interval is
+let through as a probe, so Redis is picked up again even when the loop is
+not running. Work that had to be dropped during an outage can register an
+``on_recovery`` callback to catch up once Redis is reachable again.
+
+Round-trip latencies (health pings and cache reads/writes) are kept in small
+running summaries for ``/health``.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from redis.exceptions import ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError
+
+logger = logging.getLogger(__name__)
+
+# Errors meaning Redis itself is unreachable or too slow (not a bad command)
+OUTAGE_ERRORS = (RedisConnectionError, RedisTimeoutError, OSError)
+
+
+class LatencyStats:
+    """Running count/average/max of round-trip times in milliseconds."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.last_ms: Optional[float] = None
+
+    def record(self, seconds: float):
+        ms = seconds * 1000
+        with self._lock:
+            self.count += 1
+            self.total_ms += ms
+            self.max_ms = max(self.max_ms, ms)
+            self.last_ms = ms
+
+    def info(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "count": self.count,
+                "avg_ms": round(self.total_ms / self.count, 3) if self.count else None,
+                "max_ms": round(self.max_ms, 3),
+                "last_ms": round(self.last_ms, 3) if self.last_ms is not None else None,
+            }
+
+
+class RedisHealth:
+    """Healthy/unhealthy flag for Redis, kept up to date by pings and observed errors."""
+
+    def __init__(self, ping: Callable[[], Any], interval: float):
+        self.ping = ping
+        self.interval = interval
+        self.healthy = True
+        self.last_error: Optional[str] = None
+        self.last_check: Optional[float] = None
+        self.bypassed = 0
+        self.latency = LatencyStats()
+        self._probe_at = 0.0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._recovery_callbacks: List[Callable[[], Any]] = []
+
+    def on_recovery(self, callback: Callable[[], Any]):
+        """Call ``callback`` (on a background thread) whenever Redis becomes healthy again."""
+        self._recovery_callbacks.append(callback)
+
+    def _recovered(self):
+        for callback in self._recovery_callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.warning(f"Redis recovery callback {callback.__name__} failed: {str(e)}")
+
+    def available(self) -> bool:
+        """Whether callers should talk to Redis now.
+
+        While unhealthy, returns True for one caller per interval (the probe)
+        and False for everyone else.
+        """
+        if self.healthy:
+            return True
+        now = time.monotonic()
+        with self._lock:
+            if now >= self._probe_at:
+                self._probe_at = now + self.interval
+                return True
+        self.bypassed += 1
+        return False
+
+    def mark_success(self):
+        if self.healthy:
+            return
+        with self._lock:
+            recovered, self.healthy = not self.healthy, True
+        if not recovered:
+            return
+        logger.info("Redis is reachable again")
+        if self._recovery_callbacks:
+            # Off the caller's thread: mark_success also runs on the event loop
+            threading.Thread(target=self._recovered, name="redis-recovery", daemon=True).start()
+
+    def mark_failure(self, error: BaseException):
+        """Record an error from a Redis call; only outages flip the flag."""
+        if not isinstance(error, OUTAGE_ERRORS):
+            return
+        if self.healthy:
+            logger.warning(f"Redis marked unhealthy, bypassing it: {str(error)}")
+        with self._lock:
+            self._probe_at = time.monotonic() + self.interval
+        self.healthy = False
+        self.last_error = str(error)
+
+    def check(self) -> bool:
+        """Ping Redis once and update the flag."""
+        start = time.perf_counter()
+        try:
+            self.ping()
+        except Exception as e:
+            self.mark_failure(e if isinstance(e, OUTAGE_ERRORS) else RedisConnectionError(str(e)))
+        else:
+            self.latency.record(time.perf_counter() - start)
+            self.mark_success()
+        self.last_check = time.time()
+        return self.healthy
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.check()
+            self._stop.wait(self.interval)
+
+    def start(self):
+        """Start the background ping loop (idempotent)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="redis-health", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            "healthy": self.healthy,
+            "last_error": self.last_error,
+            "last_check": self.last_check,
+            "bypassed_calls": self.bypassed,
+            "ping": self.latency.info(),
+        }
@@ -6,14 +6,40 @@ from fastapi.middleware import Middleware
 from starlette.middleware.errors import ServerErrorMiddleware
 
 import time
+from contextlib import asynccontextmanager
+
+from anyio import to_thread
 
 from .db import engine
 from . import models
 from .routes import admin, authentication, profile, user, algo_types, algorithm, user_progress, blog, related_problems, comments, algorithm_comments, contests
 from .middleware.rate_limit import limiter
 from .core.config import settings
+from .services.contest_refresher import contest_refresher
+from .services.cache_warmup import cache_warmup
+from .db.redis_client import get_cache_stats, redis_health
+from .db.async_redis_client import close_async_redis, get_async_pool_stats
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Sync handlers run in this thread pool, so its size caps concurrent DB work
+    to_thread.current_default_thread_limiter().total_tokens = settings.THREADPOOL_MAX_WORKERS
+    redis_health.start()
+    # Keep contest snapshots warm so requests never wait on upstream scrapes
+    if settings.CONTEST_REFRESH_ENABLED:
+        contest_refresher.start()
+    # Fill cold caches in the background so startup isn't delayed
+    if settings.CACHE_WARMUP_ENABLED:
+        cache_warmup.start()
+    yield
+    await cache_warmup.stop()
+    await contest_refresher.stop()
+    redis_health.stop()
+    await close_async_redis()
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # Rate limiting
 app.state.limiter = limiter
@@ -26,7 +52,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
-    expose_headers=["Content-Disposition"]  # Important for file downloads
+    expose_headers=["Content-Disposition", "X-Next-Cursor"]  # File downloads, list pagination
 )
 
 # Remove duplicate root endpoint
@@ -60,7 +86,9 @@ async def health_check():
     return {
         "status": "ok",
         "uptime_seconds": uptime,
-        "version": "1.0.0"
+        "version": "1.0.0",
+        "cache": {**get_cache_stats(), "async_pools": get_async_pool_stats()},
+        "warmup": cache_warmup.report
     }
 
 # Store app start time for uptime calculation
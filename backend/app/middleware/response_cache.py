@@ -0,0 +1,220 @@
+"""
+Declarative response caching for read-heavy GET endpoints.
+
+Put ``@cache_response(...)`` between ``@router.get(...)`` and the handler.
+The serialized JSON body is stored in the Redis cache under a key built
+from the namespace, path and sorted query parameters, together with an ETag
+(a hash of the body). Hits are returned without calling the handler or
+touching the database. Requests whose ``If-None-Match`` matches the current
+ETag get an empty ``304 Not Modified``.
+
+The handler's return value is serialized with ``response_model`` (the same
+model passed to the route) so cached and uncached responses are identical.
+Errors raised by the handler (e.g. 404) are not cached.
+
+Each entry is registered under its invalidation tags (see ``cache_tags``),
+so repository writes evict exactly the responses they affect. A response
+built while one of its tags was being invalidated is returned but not kept.
+
+Handlers that declare a ``Response`` parameter can set headers on it (e.g.
+the ``X-Next-Cursor`` of paginated lists); they are cached with the body.
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+from typing import Any, Callable, Iterable, List, Optional
+from urllib.parse import urlencode
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from ..core.config import settings
+from ..db.async_redis_client import get_async_cache
+from ..db.cache_tags import async_tag_generations, async_tag_key, tag_generations, tag_key
+from ..db.redis_client import delete_cache, get_cache, set_cache
+
+RESPONSE_CACHE_PREFIX = "resp"
+
+# Name of the Request parameter added to handlers that don't declare one
+_REQUEST_PARAM = "_cache_request"
+
+
+def response_cache_key(namespace: str, request: Request) -> str:
+    query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    return f"{RESPONSE_CACHE_PREFIX}:{namespace}:{request.url.path}?{query}"
+
+
+def make_etag(body: str) -> str:
+    return '"' + hashlib.sha1(body.encode()).hexdigest() + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    tags = [t.strip() for t in header.split(",")]
+    return etag in tags or f"W/{etag}" in tags
+
+
+def _cached_response(request: Request, entry: dict, hit: bool) -> Response:
+    headers = {
+        **entry.get("headers", {}),
+        "ETag": entry["etag"],
+        "Cache-Control": "no-cache",
+        "X-Cache": "HIT" if hit else "MISS",
+    }
+    if etag_matches(request, entry["etag"]):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry["body"], media_type="application/json", headers=headers)
+
+
+def cache_response(
+    ttl: int,
+    namespace: Optional[str] = None,
+    response_model: Any = None,
+    tags: Iterable[str] = (),
+    result_tags: Optional[Callable[[Any], Iterable[str]]] = None,
+):
+    """Cache a GET handler's JSON response in Redis.
+
+    Args:
+        ttl: Seconds a cached response stays valid
+        namespace: Key prefix for this endpoint (default: the handler's name)
+        response_model: Model the result is serialized with (same as the route's)
+        tags: Invalidation tags, formatted with the handler's arguments (e.g. "algorithm:{id}")
+        result_tags: Extra tags derived from the serialized response
+    """
+    adapter = TypeAdapter(response_model) if response_model is not None else None
+    tags = tuple(tags)
+
+    def serialize(result: Any, response: Optional[Response]):
+        """Build the cache entry and the tags derived from the result."""
+        if adapter is not None:
+            content = adapter.dump_python(adapter.validate_python(result, from_attributes=True), mode="json")
+        else:
+            content = jsonable_encoder(result)
+        extra_tags: List[str] = list(result_tags(content)) if result_tags is not None else []
+        body = json.dumps(content, ensure_ascii=False, separators=(",", ":"))
+        entry = {"etag": make_etag(body), "body": body}
+        if response is not None:
+            headers = {k: v for k, v in response.headers.items() if k != "content-length"}
+            if headers:
+                entry["headers"] = headers
+        return entry, extra_tags
+
+    def decorator(func: Callable):
+        ns = namespace or func.__name__
+        sig = inspect.signature(func)
+        request_param = next(
+            (name for name, p in sig.parameters.items() if p.annotation is Request),
+            _REQUEST_PARAM,
+        )
+        response_param = next(
+            (name for name, p in sig.parameters.items() if p.annotation is Response),
+            None,
+        )
+
+        def take_request(kwargs) -> Request:
+            if request_param == _REQUEST_PARAM:
+                return kwargs.pop(_REQUEST_PARAM)
+            return kwargs[request_param]
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                request = take_request(kwargs)
+                if not settings.RESPONSE_CACHE_ENABLED:
+                    return await func(*args, **kwargs)
+                cache = get_async_cache()
+                key = response_cache_key(ns, request)
+                entry = await cache.get(key)
+                if entry is not None:
+                    return _cached_response(request, entry, hit=True)
+                entry_tags = [tag.format(**kwargs) for tag in tags]
+                # Snapshot before the handler reads, so any write it may have missed shows up below
+                generations = await async_tag_generations(entry_tags)
+                entry, extra_tags = serialize(await func(*args, **kwargs), kwargs.get(response_param))
+                if extra_tags and generations is not None:
+                    # Only known from the result: these are checked from here on
+                    extra = await async_tag_generations(extra_tags)
+                    generations = None if extra is None else generations + extra
+                    entry_tags += extra_tags
+                if generations is not None:
+                    await async_tag_key(key, entry_tags, ttl)
+                    await cache.set(key, entry, ttl)
+                    if await async_tag_generations(entry_tags) != generations:
+                        # A tag was invalidated meanwhile: the body may predate that write
+                        await cache.delete(key)
+                return _cached_response(request, entry, hit=False)
+        else:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                request = take_request(kwargs)
+                if not settings.RESPONSE_CACHE_ENABLED:
+                    return func(*args, **kwargs)
+                key = response_cache_key(ns, request)
+                entry = get_cache(key)
+                if entry is not None:
+                    return _cached_response(request, entry, hit=True)
+                entry_tags = [tag.format(**kwargs) for tag in tags]
+                # Snapshot before the handler reads, so any write it may have missed shows up below
+                generations = tag_generations(entry_tags)
+                entry, extra_tags = serialize(func(*args, **kwargs), kwargs.get(response_param))
+                if extra_tags and generations is not None:
+                    # Only known from the result: these are checked from here on
+                    extra = tag_generations(extra_tags)
+                    generations = None if extra is None else generations + extra
+                    entry_tags += extra_tags
+                if generations is not None:
+                    tag_key(key, entry_tags, ttl)
+                    set_cache(key, entry, ttl)
+                    if tag_generations(entry_tags) != generations:
+                        # A tag was invalidated meanwhile: the body may predate that write
+                        delete_cache(key)
+                return _cached_response(request, entry, hit=False)
+
+        wrapper.cache_namespace = ns
+        wrapper.cache_request_param = request_param
+        wrapper.cache_response_param = response_param
+        if request_param == _REQUEST_PARAM:
+            params = list(sig.parameters.values()) + [
+                inspect.Parameter(_REQUEST_PARAM, inspect.Parameter.KEYWORD_ONLY, annotation=Request)
+            ]
+            wrapper.__signature__ = sig.replace(parameters=params)
+        return wrapper
+
+    return decorator
+
+
+def _warm_request(path: str, query: Optional[dict]) -> Request:
+    query_string = urlencode(query or {}, doseq=True).encode()
+    return Request({"type": "http", "method": "GET", "path": path, "query_string": query_string, "headers": []})
+
+
+def cached_response_key(handler: Callable, path: str, query: Optional[dict] = None) -> str:
+    """Cache key a ``@cache_response`` handler stores ``path`` under."""
+    return response_cache_key(handler.cache_namespace, _warm_request(path, query))
+
+
+def warm_response(handler: Callable, path: str, query: Optional[dict] = None, **kwargs) -> bool:
+    """Fill the cache entry of a sync ``@cache_response`` handler as if ``path`` was requested.
+
+    Args:
+        handler: The decorated route function
+        path: Request path the entry is stored under (e.g. "/algorithms/1")
+        query: Query parameters as the client sends them
+        **kwargs: Every argument of the handler (dependencies and query values included)
+
+    Returns:
+        bool: True if the response was built now, False if it was already cached
+    """
+    kwargs[handler.cache_request_param] = _warm_request(path, query)
+    if handler.cache_response_param is not None:
+        kwargs.setdefault(handler.cache_response_param, Response())
+    response = handler(**kwargs)
+    return response.headers.get("X-Cache") == "MISS"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, TIMESTAMP, Enum, DateTime, Boolean, Float
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, TIMESTAMP, Enum, DateTime, Boolean, Float, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from datetime import datetime
@@ -118,6 +118,10 @@ class Algorithm(Base):
 # UserProgress Model
 class UserProgress(Base):
     __tablename__ = "user_progress"
+    __table_args__ = (
+        Index("uq_user_progress_user_algo", "user_id", "algo_id", unique=True),
+        Index("ix_user_progress_user_last_accessed", "user_id", "last_accessed"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -146,6 +150,10 @@ class BlogStatus(enum.Enum):
 
 class Blog(Base):
     __tablename__ = "blog"
+    __table_args__ = (
+        Index("ix_blog_status_created_at", "status", "created_at"),
+        Index("ix_blog_user_id", "user_id"),
+    )
     id = Column(Integer, unique=True, primary_key=True, index=True, autoincrement=True)
     title = Column(String(250), nullable=False)
     body = Column(Text, nullable=False)
@@ -168,6 +176,10 @@ class Blog(Base):
 # Blog Comment Model
 class BlogComment(Base):
     __tablename__ = "blog_comments"
+    __table_args__ = (
+        Index("ix_blog_comments_blog_parent", "blog_id", "parent_id"),
+        Index("ix_blog_comments_parent_id", "parent_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     blog_id = Column(Integer, ForeignKey("blog.id"), nullable=False)
@@ -192,6 +204,10 @@ class BlogComment(Base):
 # Algorithm Comment Model
 class AlgorithmComment(Base):
     __tablename__ = "algorithm_comments"
+    __table_args__ = (
+        Index("ix_algorithm_comments_algorithm_parent", "algorithm_id", "parent_id"),
+        Index("ix_algorithm_comments_parent_id", "parent_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     algorithm_id = Column(Integer, ForeignKey("algorithms.id"), nullable=False)
@@ -217,6 +233,9 @@ class AlgorithmComment(Base):
 # Related Problems Models
 class RelatedProblem(Base):
     __tablename__ = "related_problems"
+    __table_args__ = (
+        Index("ix_related_problems_algorithm_status", "algorithm_id", "status"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
@@ -272,6 +291,9 @@ class ProblemSourceMapping(Base):
 
 class UserProblemProgress(Base):
     __tablename__ = "user_problem_progress"
+    __table_args__ = (
+        Index("uq_user_problem_progress_user_problem", "user_id", "problem_id", unique=True),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
@@ -1,7 +1,45 @@
 from fastapi import HTTPException
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, load_only
 from ..models import Algorithm, AlgorithmType
 from ..schemas import AddAlgorithm, UpdateAlgorithm
+from ..db.cache_tags import invalidate_on_commit
+from .pagination import paginate
+
+# Sort order of algorithm lists (and key of their cursors)
+ALGORITHM_ORDER = (Algorithm.id,)
+
+# Columns of a list summary; explanation and code are only loaded for full rows
+SUMMARY_COLUMNS = (
+    Algorithm.id,
+    Algorithm.name,
+    Algorithm.type_id,
+    Algorithm.description,
+    Algorithm.difficulty,
+    Algorithm.complexity,
+)
+
+def _list_query(db: Session, summary: bool):
+    if summary:
+        return db.query(Algorithm).options(
+            load_only(*SUMMARY_COLUMNS),
+            joinedload(Algorithm.type).load_only(AlgorithmType.name),
+        )
+    return db.query(Algorithm).options(joinedload(Algorithm.type))
+
+def _list_item(algo: Algorithm, summary: bool):
+    item = {
+        "id": algo.id,
+        "name": algo.name,
+        "type_id": algo.type_id,
+        "type_name": algo.type.name if algo.type else "Unknown",
+        "description": algo.description,
+        "difficulty": algo.difficulty,
+        "complexity": algo.complexity,
+    }
+    if not summary:
+        item["explanation"] = algo.explanation
+        item["code"] = algo.code
+    return item
 
 def get_algorithm_by_id(db: Session, algo_id: int):
     algorithm = db.query(Algorithm).options(joinedload(Algorithm.type)).filter(Algorithm.id == algo_id).first()
@@ -35,39 +73,15 @@ def get_algorithm_by_name(db: Session, name: str):
         "code": algorithm.code
     }
 
-def get_all_algorithms(db: Session, skip: int = 0, limit: int = 5):
-    algorithms = db.query(Algorithm).options(joinedload(Algorithm.type)).offset(skip).limit(limit).all()
-    return [
-        {
-            "id": algo.id,
-            "name": algo.name,
-            "type_id": algo.type_id,
-            "type_name": algo.type.name if algo.type else "Unknown",
-            "description": algo.description,
-            "difficulty": algo.difficulty,
-            "complexity": algo.complexity,
-            "explanation": algo.explanation,
-            "code": algo.code
-        }
-        for algo in algorithms
-    ]
+def get_all_algorithms(db: Session, skip: int = 0, limit: int = 5, cursor: str = None, summary: bool = False):
+    query = _list_query(db, summary)
+    algorithms = paginate(query, ALGORITHM_ORDER, cursor, skip, limit).all()
+    return [_list_item(algo, summary) for algo in algorithms]
 
-def get_algorithms_by_type(db: Session, type_id: int, skip: int = 0, limit: int = 5):
-    algorithms = db.query(Algorithm).options(joinedload(Algorithm.type)).filter(Algorithm.type_id == type_id).offset(skip).limit(limit).all()
-    return [
-        {
-            "id": algo.id,
-            "name": algo.name,
-            "type_id": algo.type_id,
-            "type_name": algo.type.name if algo.type else "Unknown",
-            "description": algo.description,
-            "difficulty": algo.difficulty,
-            "complexity": algo.complexity,
-            "explanation": algo.explanation,
-            "code": algo.code
-        }
-        for algo in algorithms
-    ]
+def get_algorithms_by_type(db: Session, type_id: int, skip: int = 0, limit: int = 5, cursor: str = None, summary: bool = False):
+    query = _list_query(db, summary).filter(Algorithm.type_id == type_id)
+    algorithms = paginate(query, ALGORITHM_ORDER, cursor, skip, limit).all()
+    return [_list_item(algo, summary) for algo in algorithms]
 
 def create_algorithm(db: Session, algorithm_data: AddAlgorithm):
     if get_algorithm_by_name(db, algorithm_data.name):
@@ -86,6 +100,7 @@ def create_algorithm(db: Session, algorithm_data: AddAlgorithm):
     )
     
     db.add(new_algorithm)
+    invalidate_on_commit(db, "algorithm:list")
     db.commit()
     db.refresh(new_algorithm)
     
@@ -132,6 +147,7 @@ def update_algorithm(db: Session, algo_id: int, algorithm_data: UpdateAlgorithm)
     if algorithm_data.code is not None:
         algorithm.code = algorithm_data.code
     
+    invalidate_on_commit(db, f"algorithm:{algo_id}", "algorithm:list")
     db.commit()
     db.refresh(algorithm)
     
@@ -155,6 +171,7 @@ def delete_algorithm(db: Session, algo_id: int):
     if not algorithm:
         raise HTTPException(status_code=404, detail="Algorithm not found")
     db.delete(algorithm)
+    invalidate_on_commit(db, f"algorithm:{algo_id}", f"algorithm:{algo_id}:related", "algorithm:list")
     db.commit()
 
 def get_type_by_id(db: Session, type_id: int):
@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 from ..models import AlgorithmType, Algorithm
 from ..schemas import AddAlgorithmType, UpdateAlgorithmType
+from ..db.cache_tags import invalidate_on_commit
 import logging
 
 logger = logging.getLogger(__name__)
@@ -35,6 +36,7 @@ def create_algorithm_type(db: Session, algo_type: AddAlgorithmType):
         
         db_algo_type = AlgorithmType(**algo_type.dict())
         db.add(db_algo_type)
+        invalidate_on_commit(db, "algo_type:list")
         db.commit()
         db.refresh(db_algo_type)
         return db_algo_type
@@ -61,6 +63,8 @@ def update_algorithm_type(db: Session, type_id: int, algo_type: UpdateAlgorithmT
         if algo_type.description is not None:
             db_algo_type.description = algo_type.description
         
+        # Algorithm responses embed their type's name
+        invalidate_on_commit(db, "algo_type:list", f"algo_type:{type_id}", "algorithm:list")
         db.commit()
         db.refresh(db_algo_type)
         return db_algo_type
@@ -87,6 +91,7 @@ def delete_algorithm_type(db: Session, type_id: int):
             )
         
         db.delete(db_algo_type)
+        invalidate_on_commit(db, "algo_type:list", f"algo_type:{type_id}")
         db.commit()
     except HTTPException as he:
         raise he
@@ -1,13 +1,23 @@
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import Float, column
+from sqlalchemy.orm import Session, defer, joinedload
 from sqlalchemy.exc import SQLAlchemyError
 from ..models import Blog, User, BlogStatus
 from ..schemas import AddBlog, UpdateBlog
 from ..repositories.user_repo import if_exists
+from ..db.cache_tags import invalidate_on_commit
+from ..db.blog_search import match_query
+from .pagination import paginate
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Sort order of blog lists (and key of their cursors)
+BLOG_ORDER = (Blog.created_at, Blog.id)
+
+# Key of search result cursors: the relevance "score" from match_query, then id
+SEARCH_ORDER = (column("score", Float(53)), Blog.id)
+
 def get_blog_by_id(db: Session, blog_id: int):
     blog = db.query(Blog).options(joinedload(Blog.user)).filter(Blog.id == blog_id).first()
     if not blog:
@@ -28,12 +38,13 @@ def get_blog_by_id(db: Session, blog_id: int):
         "approved_at": blog.approved_at
     }
 
-def get_all_blogs(db: Session, skip: int = 0, limit: int = 5):
+def get_all_blogs(db: Session, skip: int = 0, limit: int = 5, cursor: str = None):
     try:
-        # Only return approved blogs for public viewing
-        blogs = db.query(Blog).options(joinedload(Blog.user)).filter(
+        # Only return approved blogs for public viewing, newest first
+        query = db.query(Blog).options(joinedload(Blog.user)).filter(
             Blog.status == BlogStatus.approved
-        ).offset(skip).limit(limit).all()
+        )
+        blogs = paginate(query, BLOG_ORDER, cursor, skip, limit, descending=True).all()
         return [
             {
                 "id": blog.id,
@@ -96,6 +107,7 @@ def update_blog(db: Session, request: UpdateBlog, blog_id: int, user_id: int):
         if request.body is not None:
             blog_obj.body = request.body
             
+        invalidate_on_commit(db, "blog:list")
         db.commit()
         db.refresh(blog_obj)
         return {
@@ -126,6 +138,7 @@ def delete_blog(db: Session, blog_id: int, user_id: int):
             raise HTTPException(status_code=403, detail="Not authorized to delete this blog")
         blog_obj = db.query(Blog).filter(Blog.id == blog_id).first()
         db.delete(blog_obj)
+        invalidate_on_commit(db, "blog:list")
         db.commit()
         return None
     except SQLAlchemyError as e:
@@ -144,6 +157,7 @@ def delete_by_user(db: Session, user_id: int):
             return None
         for blog in blogs:
             db.delete(blog)
+        invalidate_on_commit(db, "blog:list")
         db.commit()
         return None
     except SQLAlchemyError as e:
@@ -155,31 +169,37 @@ def delete_by_user(db: Session, user_id: int):
         logger.error(f"Unexpected error deleting blogs for user {user_id}: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
-def search_blogs(db: Session, query: str):
+def search_blogs(db: Session, query: str, limit: int = 10, cursor: str = None):
+    """Full-text search over approved blogs, best matches first"""
     try:
-        blogs = db.query(Blog).options(joinedload(Blog.user)).filter(
-            (Blog.title.ilike(f"%{query}%")) |
-            (Blog.body.ilike(f"%{query}%"))
-        ).all()
+        search = match_query(db, query)
+        if search is None:
+            return []
+        search_query, score_column, _ = search
+        # The snippet is built in the database; the full bodies are never loaded
+        search_query = (
+            search_query
+            .options(defer(Blog.body), defer(Blog.admin_feedback), joinedload(Blog.user))
+            .filter(Blog.status == BlogStatus.approved)
+        )
+        rows = paginate(search_query, (score_column, Blog.id), cursor, 0, limit, descending=True).all()
         return [
             {
                 "id": blog.id,
                 "title": blog.title,
-                "body": blog.body,
+                "snippet": snippet or "",
                 "author": blog.user.name if blog.user else "Unknown",
+                "author_id": blog.user.id if blog.user else None,
                 "created_at": blog.created_at,
-                "updated_at": blog.updated_at,
-                "status": blog.status,
-                "admin_feedback": blog.admin_feedback,
-                "approved_at": blog.approved_at
+                "score": score,
             }
-            for blog in blogs
+            for blog, score, snippet in rows
         ]
     except SQLAlchemyError as e:
         logger.error(f"Database error searching blogs: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to search blogs")
 
-def get_user_blogs(db: Session, user_id: int, skip: int = 0, limit: int = 5, include_unapproved: bool = False, status_filter: str = None):
+def get_user_blogs(db: Session, user_id: int, skip: int = 0, limit: int = 5, include_unapproved: bool = False, status_filter: str = None, cursor: str = None):
     try:
         # By default, only return approved blogs (safe for public routes)
         query = (
@@ -206,13 +226,7 @@ def get_user_blogs(db: Session, user_id: int, skip: int = 0, limit: int = 5, inc
             if not include_unapproved:
                 query = query.filter(Blog.status == BlogStatus.approved)
 
-        blogs = (
-            query
-            .order_by(Blog.created_at.desc())
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
+        blogs = paginate(query, BLOG_ORDER, cursor, skip, limit, descending=True).all()
         return [
             {
                 "id": blog.id,
@@ -243,12 +257,13 @@ def if_user_owns_blog(db: Session, blog_id: int, user_id: int):
         raise HTTPException(status_code=500, detail="Failed to check blog ownership")
 
 # Blog moderation functions
-def get_pending_blogs(db: Session, skip: int = 0, limit: int = 10):
-    """Get all pending blogs for admin review"""
+def get_pending_blogs(db: Session, skip: int = 0, limit: int = 10, cursor: str = None):
+    """Get all pending blogs for admin review, oldest first"""
     try:
-        blogs = db.query(Blog).options(joinedload(Blog.user)).filter(
+        query = db.query(Blog).options(joinedload(Blog.user)).filter(
             Blog.status == BlogStatus.pending
-        ).offset(skip).limit(limit).all()
+        )
+        blogs = paginate(query, BLOG_ORDER, cursor, skip, limit).all()
         return [
             {
                 "id": blog.id,
@@ -267,8 +282,8 @@ def get_pending_blogs(db: Session, skip: int = 0, limit: int = 10):
         logger.error(f"Database error fetching pending blogs: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch pending blogs")
 
-def get_all_blogs_for_admin(db: Session, status_filter: str = None, skip: int = 0, limit: int = 10):
-    """Get all blogs with optional status filter for admin"""
+def get_all_blogs_for_admin(db: Session, status_filter: str = None, skip: int = 0, limit: int = 10, cursor: str = None):
+    """Get all blogs with optional status filter for admin, newest first"""
     try:
         query = db.query(Blog).options(joinedload(Blog.user))
         
@@ -280,7 +295,7 @@ def get_all_blogs_for_admin(db: Session, status_filter: str = None, skip: int =
             elif status_filter == "rejected":
                 query = query.filter(Blog.status == BlogStatus.rejected)
         
-        blogs = query.offset(skip).limit(limit).all()
+        blogs = paginate(query, BLOG_ORDER, cursor, skip, limit, descending=True).all()
         return [
             {
                 "id": blog.id,
@@ -325,6 +340,7 @@ def moderate_blog(db: Session, blog_id: int, action: BlogStatus, admin_id: int,
             from datetime import datetime
             blog.approved_at = datetime.utcnow()
         
+        invalidate_on_commit(db, "blog:list")
         db.commit()
         db.refresh(blog)
         
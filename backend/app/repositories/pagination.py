@@ -0,0 +1,99 @@
+"""
+Keyset (cursor) pagination for list queries.
+
+Lists are ordered by a fixed set of columns ending in the primary key, e.g.
+``(Blog.created_at, Blog.id)``. The cursor for the next page is the last
+row's values of those columns, encoded as an opaque URL-safe string, and the
+next page is ``WHERE (created_at, id) < (cursor values)`` instead of
+``OFFSET n``: the database seeks straight to the position through the index,
+so page 1000 costs the same as page 1, and rows inserted or deleted meanwhile
+don't shift pages.
+
+``skip`` is still accepted as a compatibility mode when no cursor is given.
+Routes send the next cursor in the ``X-Next-Cursor`` response header (see
+``set_next_cursor``) so the response body stays a plain list.
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import literal, tuple_
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.orm import Query
+from sqlalchemy.sql.elements import ColumnElement
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps([v.isoformat() if isinstance(v, datetime) else v for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, order: Sequence[ColumnElement]) -> List[Any]:
+    """Decode a cursor made for ``order``; raises 400 if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(order):
+            raise ValueError("cursor does not match the list ordering")
+        return [
+            datetime.fromisoformat(v) if v is not None and col.type.python_type is datetime else v
+            for col, v in zip(order, values)
+        ]
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor")
+
+
+def paginate(
+    query: Query,
+    order: Sequence[ColumnElement],
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 10,
+    descending: bool = False,
+) -> Query:
+    """Order ``query`` by ``order`` and select one page of it.
+
+    Args:
+        query: Filtered query to page through
+        order: Sort columns, the last one being the table's primary key
+        cursor: Cursor of the previous page (takes precedence over ``skip``)
+        skip: Rows to skip when no cursor is given (offset compatibility mode)
+        limit: Page size
+        descending: Sort newest/highest first
+    """
+    query = query.order_by(*(col.desc() if descending else col.asc() for col in order))
+    if cursor is None:
+        return query.offset(skip).limit(limit)
+
+    bounds = [_bind(col, value) for col, value in zip(order, decode_cursor(cursor, order))]
+    position = tuple_(*order)
+    after = position < tuple_(*bounds) if descending else position > tuple_(*bounds)
+    return query.filter(after).limit(limit)
+
+
+def _bind(col: ColumnElement, value: Any):
+    # SQLite stores timestamps as text: CURRENT_TIMESTAMP defaults have no fraction but bound
+    # datetimes always get one, so whole seconds are bound the way the default wrote them.
+    if isinstance(value, datetime) and value.microsecond == 0:
+        return literal(value, col.type.with_variant(sqlite.DATETIME(truncate_microseconds=True), "sqlite"))
+    return value
+
+
+def next_cursor(items: Sequence[dict], limit: int, order: Sequence[ColumnElement]) -> Optional[str]:
+    """Cursor for the page after ``items``, or None if this was the last page."""
+    if not items or len(items) < limit:
+        return None
+    last = items[-1]
+    return encode_cursor([last[col.key] for col in order])
+
+
+def set_next_cursor(response: Response, items: Sequence[dict], limit: int, order: Sequence[ColumnElement]) -> None:
+    cursor = next_cursor(items, limit, order)
+    if cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
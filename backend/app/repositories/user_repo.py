@@ -5,6 +5,7 @@ from ..models import User, Blog, UserProgress, RelatedProblem, AlgoStatus
 from ..schemas import RegisterUser, UpdateUser, UpdatePassword, UpdateName, UpdateEmail, ShowUser, UserProfile
 
 from ..auth.password_utils import hash_password, verify_password, validate_password
+from ..db.cache_tags import invalidate_on_commit
 from datetime import datetime
 import logging
 
@@ -174,6 +175,9 @@ def update_user(db: Session, user_id: int, user_data: UpdateUser):
         if user_data.name is not None:
             if is_name_taken(db, user_data.name, exclude_id=user_id):
                 raise HTTPException(status_code=400, detail="Username already taken")
+            if user_data.name != user.name:
+                # Blog list items embed the author's name
+                invalidate_on_commit(db, "blog:list")
             user.name = user_data.name
         if user_data.email is not None:
             if is_email_taken(db, user_data.email, exclude_id=user_id):
@@ -201,6 +205,8 @@ def update_name(db: Session, user_id: int, name_data: UpdateName):
         user = get_user_by_id(db, user_id)
         if is_name_taken(db, name_data.name, exclude_id=user_id):
             raise HTTPException(status_code=400, detail="Username already taken")
+        if name_data.name != user.name:
+            invalidate_on_commit(db, "blog:list")
         user.name = name_data.name
         db.commit()
         db.refresh(user)
@@ -259,6 +265,7 @@ def delete_user(db: Session, user_id: int):
         db.query(RelatedProblem).filter(RelatedProblem.approved_by == user_id).update({"approved_by": None})
 
         db.delete(user)
+        invalidate_on_commit(db, "blog:list")
         db.commit()
         return {"detail": f"User {user_id} and all associated data deleted successfully"}
     except SQLAlchemyError as e:
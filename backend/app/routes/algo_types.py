@@ -2,9 +2,10 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
 from .. import models, schemas
-from ..db import get_db  
+from ..db import get_db, get_read_db  
 from ..repositories import algo_types_repo
 from ..middleware.admin_dependencies import get_current_admin
+from ..middleware.response_cache import cache_response
 
 router = APIRouter(prefix="/algo-type", tags=["Algorithm Types"])
 
@@ -26,11 +27,17 @@ def update_algorithm_type(
     return algo_types_repo.update_algorithm_type(db, type_id, request)
 
 @router.get("/", response_model=List[schemas.ShowAlgorithmType])
-def get_all_algorithm_types(db: Session = Depends(get_db)):
+@cache_response(
+    ttl=86400,
+    namespace="algo_types:list",
+    response_model=List[schemas.ShowAlgorithmType],
+    tags=["algo_type:list"],
+)
+def get_all_algorithm_types(db: Session = Depends(get_read_db)):
     return algo_types_repo.get_all_algorithm_types(db)
 
 @router.get("/{type_id}", response_model=schemas.ShowAlgorithmType)
-def get_algorithm_type(type_id: int, db: Session = Depends(get_db)):
+def get_algorithm_type(type_id: int, db: Session = Depends(get_read_db)):
     return algo_types_repo.get_algorithm_type_by_id(db, type_id)
 
 @router.delete("/{type_id}", status_code=status.HTTP_204_NO_CONTENT)
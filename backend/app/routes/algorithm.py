@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from .. import models, schemas
-from ..db import get_db  
+from ..db import get_db, get_read_db  
 from ..repositories import algo_repo
+from ..repositories.pagination import set_next_cursor
 from ..middleware.admin_dependencies import get_current_admin
+from ..middleware.response_cache import cache_response
 
 router = APIRouter(prefix="/algorithms", tags=["Algorithms"])
 
@@ -41,20 +43,39 @@ def update_algorithm(
             detail=str(e)
         )
 
-@router.get("/", response_model=List[schemas.ShowAlgorithm])
+@router.get("/", response_model=schemas.AlgorithmList)
+@cache_response(
+    ttl=3600,
+    namespace="algorithms:list",
+    response_model=schemas.AlgorithmList,
+    tags=["algorithm:list"],
+)
 def get_all_algorithms(
-    db: Session = Depends(get_db),
+    response: Response,
+    db: Session = Depends(get_read_db),
     skip: int = Query(0, ge=0, description="Number of algorithms to skip"),
-    limit: int = Query(5, ge=1, le=100, description="Number of algorithms to return")
+    limit: int = Query(5, ge=1, le=100, description="Number of algorithms to return"),
+    summary: bool = Query(False, description="Leave out explanation and code (fetch /algorithms/{id} for them)"),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page (replaces skip)")
 ):
-    return algo_repo.get_all_algorithms(db, skip=skip, limit=limit)
+    algorithms = algo_repo.get_all_algorithms(db, skip=skip, limit=limit, cursor=cursor, summary=summary)
+    set_next_cursor(response, algorithms, limit, algo_repo.ALGORITHM_ORDER)
+    return algorithms
 
 @router.get("/{id}", response_model=schemas.ShowAlgorithm)
-def get_algorithm(id: int, db: Session = Depends(get_db)):
+@cache_response(
+    ttl=3600,
+    namespace="algorithms:detail",
+    response_model=schemas.ShowAlgorithm,
+    tags=["algorithm:{id}"],
+    result_tags=lambda algo: [f"algo_type:{algo['type_id']}"],
+)
+def get_algorithm(id: int, db: Session = Depends(get_read_db)):
     return algo_repo.get_algorithm_by_id(db, id)
 
 @router.get("/{id}/related-problems")
-def get_algorithm_related_problems(id: int, db: Session = Depends(get_db)):
+@cache_response(ttl=3600, namespace="algorithms:related", tags=["algorithm:{id}:related"])
+def get_algorithm_related_problems(id: int, db: Session = Depends(get_read_db)):
     """Get related problems for a specific algorithm"""
     try:
         # Check if algorithm exists
@@ -97,14 +118,19 @@ def get_algorithm_related_problems(id: int, db: Session = Depends(get_db)):
             detail=f"Error fetching related problems: {str(e)}"
         )
 
-@router.get("/type/{type_id}", response_model=List[schemas.ShowAlgorithm])
+@router.get("/type/{type_id}", response_model=schemas.AlgorithmList)
 def get_algorithms_by_type(
     type_id: int,
-    db: Session = Depends(get_db),
+    response: Response,
+    db: Session = Depends(get_read_db),
     skip: int = Query(0, ge=0, description="Number of algorithms to skip"),
-    limit: int = Query(5, ge=1, le=100, description="Number of algorithms to return")
+    limit: int = Query(5, ge=1, le=100, description="Number of algorithms to return"),
+    summary: bool = Query(False, description="Leave out explanation and code (fetch /algorithms/{id} for them)"),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page (replaces skip)")
 ):
-    return algo_repo.get_algorithms_by_type(db, type_id, skip=skip, limit=limit)
+    algorithms = algo_repo.get_algorithms_by_type(db, type_id, skip=skip, limit=limit, cursor=cursor, summary=summary)
+    set_next_cursor(response, algorithms, limit, algo_repo.ALGORITHM_ORDER)
+    return algorithms
 
 @router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_algorithm(
@@ -22,7 +22,7 @@ logger = logging.getLogger(__name__)
 # Regular user login
 @router.post("/login", response_model=schemas.Token)
 @limiter.limit("5/minute")
-async def login(
+def login(
     request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db)
@@ -87,7 +87,7 @@ async def login(
 # Admin login  
 @router.post("/admin/login", response_model=schemas.Token)
 @limiter.limit("5/minute")
-async def admin_login(
+def admin_login(
     request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db)
@@ -144,7 +144,7 @@ async def admin_login(
 
 @router.post("/register", response_model=schemas.APIResponse)
 @limiter.limit("3/minute")
-async def register(request: Request, user_data: schemas.RegisterUser, db: Session = Depends(get_db), background_tasks: BackgroundTasks = BackgroundTasks()):
+def register(request: Request, user_data: schemas.RegisterUser, db: Session = Depends(get_db), background_tasks: BackgroundTasks = BackgroundTasks()):
     # Check if user already exists
     existing_user = get_user_by_email(db, user_data.email)
     if existing_user:
@@ -1,11 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from .. import models, schemas
 from ..auth import oauth2
-from ..db import get_db
+from ..db import get_db, get_read_db
 from ..repositories.blog_repo import if_user_owns_blog, get_blog_by_id
 from ..repositories import blog_repo
+from ..repositories.pagination import set_next_cursor
+from ..middleware.response_cache import cache_response
 
 router = APIRouter(prefix="/blogs", tags=["Blog"])
 
@@ -33,26 +35,35 @@ def update(
     return blog_repo.update_blog(db, request, id, current_user.id)
 
 @router.get("/", response_model=List[schemas.ShowBlog])
+@cache_response(ttl=1800, namespace="blogs:list", response_model=List[schemas.ShowBlog], tags=["blog:list"])
 def all(
-    db: Session = Depends(get_db),
+    response: Response,
+    db: Session = Depends(get_read_db),
     skip: int = Query(0, ge=0, description="Number of blogs to skip"),
-    limit: int = Query(5, ge=1, le=100, description="Number of blogs to return")
+    limit: int = Query(5, ge=1, le=100, description="Number of blogs to return"),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page (replaces skip)")
 ):
-    return blog_repo.get_all_blogs(db, skip=skip, limit=limit)
+    blogs = blog_repo.get_all_blogs(db, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, blogs, limit, blog_repo.BLOG_ORDER)
+    return blogs
 
 @router.get("/user/{id}", response_model=List[schemas.ShowBlog])
 def user_blogs(
     id: int,
-    db: Session = Depends(get_db),
+    response: Response,
+    db: Session = Depends(get_read_db),
     skip: int = Query(0, ge=0, description="Number of blogs to skip"),
-    limit: int = Query(5, ge=1, le=100, description="Number of blogs to return")
+    limit: int = Query(5, ge=1, le=100, description="Number of blogs to return"),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page (replaces skip)")
 ):
-    return blog_repo.get_user_blogs(db, id, skip=skip, limit=limit)
+    blogs = blog_repo.get_user_blogs(db, id, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, blogs, limit, blog_repo.BLOG_ORDER)
+    return blogs
 
 @router.get("/{id}", response_model=schemas.ShowBlog)
 def show(
     id: int, 
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     return get_blog_by_id(db, id)
 
@@ -71,9 +82,14 @@ def delete(
     blog_repo.delete_blog(db, id, current_user.id)
     return None
 
-@router.get("/search/{query}", response_model=List[schemas.ShowBlog])
+@router.get("/search/{query}", response_model=List[schemas.BlogSearchResult])
 def search(
     query: str,
-    db: Session = Depends(get_db)
+    response: Response,
+    db: Session = Depends(get_read_db),
+    limit: int = Query(10, ge=1, le=50, description="Number of results to return"),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page")
 ):
-    return blog_repo.search_blogs(db, query)
+    results = blog_repo.search_blogs(db, query, limit=limit, cursor=cursor)
+    set_next_cursor(response, results, limit, blog_repo.SEARCH_ORDER)
+    return results
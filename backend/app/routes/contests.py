@@ -1,14 +1,23 @@
-from fastapi import APIRouter, Query, Depends
-import requests
+from fastapi import APIRouter, Query, Request
+from fastapi.responses import StreamingResponse
+import asyncio
 import os
 import re
 import json
+import time
 from bs4 import BeautifulSoup
 from datetime import datetime, timedelta, timezone
 from typing import List, Dict, Optional
 from pathlib import Path
-from ..db.redis_client import get_redis, set_cache, get_cache, delete_cache
-from redis import Redis
+from ..services.http_client import get_http_session, conditional_get
+from ..services.json_scanner import ScanRule, scan_records
+from ..services.html_extract import extract_next_data, extract_tables, parse_stats
+from ..services.contest_records import ContestRecord
+from ..services.contest_refresher import contest_refresher
+from ..services.contest_broadcast import StreamBroadcaster, collect
+from ..services.contest_events import format_cursor, latest_id, parse_cursor, read_since
+from ..services.contest_store import load_metas, query_contests, snapshot_age
+from ..core.config import settings
 
 def _load_dotenv_into_environ():
     """Minimal .env loader: reads key=value lines and sets os.environ if unset."""
@@ -35,6 +44,9 @@ _load_dotenv_into_environ()
 
 router = APIRouter()
 
+# Shared pooled session for all outbound platform calls
+http = get_http_session()
+
 CODEFORCES_API = "https://codeforces.com/api/contest.list?gym=false"
 ATCODER_CONTESTS_URL = "https://kenkoooo.com/atcoder/resources/contests.json"
 LEETCODE_GRAPHQL_URL = "https://leetcode.com/graphql"
@@ -52,69 +64,16 @@ last_fetch_stats: Dict[str, Dict[str, object]] = {
 }
 
 
-def parse_iso(ts: str) -> datetime:
-    # Handles both kontests (ISO with Z) and our own ISO strings
-    return datetime.fromisoformat(ts.replace("Z", "+00:00"))
-
-
-def to_iso_utc(dt: datetime) -> str:
-    if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=timezone.utc)
-    return dt.astimezone(timezone.utc).isoformat()
-
-
-def filter_recent(contests: List[Dict], days: int = 7):
-    now = datetime.now(timezone.utc)
-    start_limit = now - timedelta(days=days)
-    out = []
-    for c in contests:
-        try:
-            start = parse_iso(c.get("start_time"))
-            dur_seconds = float(c.get("duration", 0) or 0)
-            end = start + timedelta(seconds=dur_seconds)
-            if start_limit <= end <= now:
-                out.append(c)
-        except Exception:
-            continue
-    return sorted(out, key=lambda x: parse_iso(x.get("start_time")), reverse=True)
-
-def filter_upcoming(contests: List[Dict], days: int):
-    now = datetime.now(timezone.utc)
-    end_limit = now + timedelta(days=days)
-    out = []
-    for c in contests:
-        try:
-            start = parse_iso(c.get("start_time"))
-            if now <= start <= end_limit:
-                out.append(c)
-        except Exception:
-            continue
-    return out
-
-def filter_running(contests: List[Dict]):
-    now = datetime.now(timezone.utc)
-    res = []
-    for c in contests:
-        try:
-            start = parse_iso(c.get("start_time"))
-            dur_seconds = float(c.get("duration", 0) or 0)
-            end = start + timedelta(seconds=dur_seconds)
-            if start <= now <= end:
-                res.append(c)
-        except Exception:
-            continue
-    return res
-
+def fetch_codeforces() -> List[ContestRecord]:
+    """Fetch and normalize Codeforces contests from official API.
 
-def fetch_codeforces() -> List[Dict]:
-    """Fetch and normalize Codeforces contests from official API."""
-    try:
-        r = requests.get(CODEFORCES_API, timeout=10)
-        r.raise_for_status()
+    The full contest list is large and rarely changes, so it is revalidated
+    with a conditional GET and re-normalized only when it changed.
+    """
+    def normalize(r) -> List[ContestRecord]:
         data = r.json()
         if data.get("status") != "OK":
-            last_fetch_stats["codeforces"] = {"ok": False, "status": data.get("status"), "count": 0}
-            return []
+            raise ValueError(f"Codeforces API status: {data.get('status')}")
         contests = data.get("result", [])
         normalized = []
         for c in contests:
@@ -123,21 +82,142 @@ def fetch_codeforces() -> List[Dict]:
                 continue
             start = datetime.fromtimestamp(c.get("startTimeSeconds", 0), tz=timezone.utc)
             duration = int(c.get("durationSeconds", 0) or 0)
-            normalized.append({
-                "site": "Codeforces",
-                "name": c.get("name"),
-                "url": f"https://codeforces.com/contest/{c.get('id')}",
-                "start_time": to_iso_utc(start),
-                "duration": duration,
-            })
-        last_fetch_stats["codeforces"] = {"ok": True, "count": len(normalized)}
+            normalized.append(ContestRecord.from_datetime(
+                site="Codeforces",
+                name=c.get("name"),
+                url=f"https://codeforces.com/contest/{c.get('id')}",
+                start=start,
+                duration=duration,
+                contest_id=c.get("id"),
+            ))
+        return normalized
+
+    try:
+        normalized, not_modified = conditional_get("codeforces", CODEFORCES_API, normalize, timeout=10)
+        last_fetch_stats["codeforces"] = {"ok": True, "count": len(normalized), "not_modified": not_modified}
         return normalized
     except Exception as e:
         last_fetch_stats["codeforces"] = {"ok": False, "error": str(e)}
-        return []
+        raise
+
+
+HACKEREARTH_BASE = "https://www.hackerearth.com"
 
 
-def fetch_hackerearth() -> List[Dict]:
+def _parse_any_ts(any_ts) -> Optional[datetime]:
+    """Parse a timestamp that may be epoch seconds, epoch millis, or ISO string."""
+    if any_ts is None:
+        return None
+    try:
+        # numeric or numeric string
+        if isinstance(any_ts, (int, float)) or (isinstance(any_ts, str) and any_ts.strip().isdigit()):
+            val = int(float(any_ts))
+            # Heuristic: millis vs seconds
+            if val > 10**12:  # definitely millis
+                val = val // 1000
+            elif val > 10**10:  # likely millis
+                val = val // 1000
+            return datetime.fromtimestamp(val, tz=timezone.utc)
+        # try ISO
+        s = str(any_ts).strip().replace("Z", "+00:00")
+        return datetime.fromisoformat(s)
+    except Exception:
+        return None
+
+
+def _hackerearth_url(fields: Dict) -> str:
+    url_path = str(fields["url"])
+    if url_path.startswith("http"):
+        return url_path
+    if not url_path.startswith("/"):
+        url_path = "/" + url_path
+    return f"{HACKEREARTH_BASE}{url_path}"
+
+
+def _build_hackerearth(fields: Dict, url: str, obj: Dict) -> Optional[ContestRecord]:
+    st = _parse_any_ts(fields["start"])
+    if not st:
+        return None
+    ed = _parse_any_ts(fields["end"]) if "end" in fields else None
+    # compute duration
+    if ed and ed >= st:
+        duration = int((ed - st).total_seconds())
+    else:
+        # fallback: check "duration" field in minutes/hours/seconds
+        duration = 0
+        if "duration" in fields:
+            try:
+                duration = int(float(fields["duration"]))
+            except Exception:
+                pass
+        if duration == 0:
+            # If no end/duration, assume 2 hours to avoid zero-length
+            duration = 2 * 60 * 60
+    return ContestRecord.from_datetime(
+        site="HackerEarth",
+        name=str(fields["title"]),
+        url=url,
+        start=st,
+        duration=duration,
+        contest_id=obj.get("id") or url,
+    )
+
+
+def _build_topcoder(fields: Dict, url: str, obj: Dict) -> Optional[ContestRecord]:
+    if str(fields.get("status")).lower() not in ("active", "upcoming"):
+        return None
+    st = datetime.fromisoformat(str(fields["start"]).replace("Z", "+00:00"))
+    ed = datetime.fromisoformat(str(fields["end"]).replace("Z", "+00:00"))
+    return ContestRecord.from_datetime(
+        site="Topcoder",
+        name=str(fields["title"]),
+        url=url,
+        start=st,
+        duration=max(0, int((ed - st).total_seconds())),
+        contest_id=fields["id"],
+    )
+
+
+# Next.js payload keys that never hold contest listings
+NEXT_DATA_PRUNE_KEYS = ("i18n", "locales", "translations", "buildId", "runtimeConfig", "dynamicIds")
+
+# Common fields seen in HE data (multiple alternatives, first truthy wins)
+HACKEREARTH_SCAN_RULE = ScanRule(
+    fields={
+        "title": ["title", "name", "seo.title", "challenge.title"],
+        "url": ["url", "slug", "challenge_url", "public_url", "canonical_url", "challenge.url", "seo.url"],
+        "start": [
+            "start_time", "start_ts", "start_timestamp", "start_datetime", "startDate",
+            "start", "starts_at", "scheduled_at", "schedule.start",
+        ],
+        "end": [
+            "end_time", "end_ts", "end_timestamp", "end_datetime", "endDate",
+            "end", "ends_at", "schedule.end",
+        ],
+        "duration": ["duration", "duration_sec", "duration_secs"],
+    },
+    required=["title", "url", "start"],
+    url=_hackerearth_url,
+    build=_build_hackerearth,
+    prune_keys=NEXT_DATA_PRUNE_KEYS,
+)
+
+TOPCODER_SCAN_RULE = ScanRule(
+    fields={
+        "title": ["name", "title"],
+        "id": ["id", "challengeId"],
+        "start": ["startDate", "startAt"],
+        "end": ["endDate", "endAt", "submissionEndDate"],
+        "status": ["status"],
+    },
+    required=["title", "id", "start", "end", "status"],
+    url=lambda fields: f"https://www.topcoder.com/challenges/{fields['id']}",
+    build=_build_topcoder,
+    prune_keys=NEXT_DATA_PRUNE_KEYS,
+)
+
+
+def fetch_hackerearth() -> List[ContestRecord]:
     """Scrape HackerEarth challenges page (Next.js) by reading __NEXT_DATA__ JSON and extracting ongoing/upcoming contests.
 
     More robust scanning logic to accommodate structure changes:
@@ -145,7 +225,7 @@ def fetch_hackerearth() -> List[Dict]:
     - Parses timestamps in epoch seconds, epoch millis, or ISO formats
     - Accepts multiple possible keys for title/url/start/end
     """
-    base = "https://www.hackerearth.com"
+    base = HACKEREARTH_BASE
     paths = [
         "/challenges/",
         "/challenges/competitive/",
@@ -161,19 +241,14 @@ def fetch_hackerearth() -> List[Dict]:
         used_path = None
         for p in paths:
             try:
-                r = requests.get(base + p, timeout=12, headers=headers)
+                r = http.get(base + p, timeout=12, headers=headers)
                 if r.status_code != 200:
                     # Some sub-paths may be 404/redirect in some regions; try next
                     continue
-                soup = BeautifulSoup(r.text, "html.parser")
-                script = soup.find("script", id="__NEXT_DATA__")
-                if script and script.string:
-                    try:
-                        data = json.loads(script.string)
-                        used_path = p
-                        break
-                    except Exception:
-                        continue
+                data = extract_next_data("hackerearth", r.content)
+                if data is not None:
+                    used_path = p
+                    break
             except Exception:
                 # network or parsing error on this path; try next
                 continue
@@ -181,7 +256,7 @@ def fetch_hackerearth() -> List[Dict]:
             # Fallback 1: attempt to parse any JSON-LD scripts on the challenges pages
             try:
                 # Try main challenges page explicitly
-                r = requests.get(base + "/challenges/", timeout=12, headers=headers)
+                r = http.get(base + "/challenges/", timeout=12, headers=headers)
                 if r.status_code == 200:
                     soup2 = BeautifulSoup(r.text, "html.parser")
                     json_nodes = soup2.find_all("script", attrs={"type": "application/ld+json"})
@@ -204,153 +279,35 @@ def fetch_hackerearth() -> List[Dict]:
         if data is None:
             # Fallback 2: chrome extension JSON endpoint
             try:
-                r = requests.get(base + "/chrome-extension/events/", timeout=12, headers=headers)
+                r = http.get(base + "/chrome-extension/events/", timeout=12, headers=headers)
                 r.raise_for_status()
                 data = r.json()
                 used_path = "/chrome-extension/events/"
             except Exception:
-                last_fetch_stats["hackerearth"] = {"ok": False, "error": "next_data_missing"}
-                return []
-
-        # Heuristic: recursively scan for items with title/url and start/end timestamps
-        norm: List[Dict] = []
+                raise ValueError("next_data_missing")
 
-        def parse_dt(any_ts) -> Optional[datetime]:
-            """Parse a timestamp that may be epoch seconds, epoch millis, or ISO string."""
-            if any_ts is None:
-                return None
-            try:
-                # numeric or numeric string
-                if isinstance(any_ts, (int, float)) or (isinstance(any_ts, str) and any_ts.strip().isdigit()):
-                    val = int(float(any_ts))
-                    # Heuristic: millis vs seconds
-                    if val > 10**12:  # definitely millis
-                        val = val // 1000
-                    elif val > 10**10:  # likely millis
-                        val = val // 1000
-                    return datetime.fromtimestamp(val, tz=timezone.utc)
-                # try ISO
-                s = str(any_ts).strip().replace("Z", "+00:00")
-                return datetime.fromisoformat(s)
-            except Exception:
-                return None
-
-        def ensure_full_url(url_path: str) -> str:
-            if not url_path:
-                return ""
-            if url_path.startswith("http"):
-                return url_path
-            if not url_path.startswith("/"):
-                url_path = "/" + url_path
-            return f"{base}{url_path}"
-
-        def scan(obj):
-            if isinstance(obj, dict):
-                # common fields seen in HE data (try multiple alternatives)
-                title = (
-                    obj.get("title")
-                    or obj.get("name")
-                    or (obj.get("seo") or {}).get("title")
-                    or (obj.get("challenge") or {}).get("title")
-                )
-                url_path = (
-                    obj.get("url")
-                    or obj.get("slug")
-                    or obj.get("challenge_url")
-                    or obj.get("public_url")
-                    or obj.get("canonical_url")
-                    or (obj.get("challenge") or {}).get("url")
-                    or (obj.get("seo") or {}).get("url")
-                )
-                start_ts = (
-                    obj.get("start_time")
-                    or obj.get("start_ts")
-                    or obj.get("start_timestamp")
-                    or obj.get("start_datetime")
-                    or obj.get("startDate")
-                    or obj.get("start")
-                    or obj.get("starts_at")
-                    or obj.get("scheduled_at")
-                    or (obj.get("schedule") or {}).get("start")
-                )
-                end_ts = (
-                    obj.get("end_time")
-                    or obj.get("end_ts")
-                    or obj.get("end_timestamp")
-                    or obj.get("end_datetime")
-                    or obj.get("endDate")
-                    or obj.get("end")
-                    or obj.get("ends_at")
-                    or (obj.get("schedule") or {}).get("end")
-                )
-
-                st = parse_dt(start_ts)
-                ed = parse_dt(end_ts) if end_ts is not None else None
-
-                if title and url_path and st:
-                    try:
-                        # compute duration
-                        if ed and ed >= st:
-                            duration = int((ed - st).total_seconds())
-                        else:
-                            # fallback: check "duration" field in minutes/hours/seconds
-                            duration = 0
-                            dur_val = obj.get("duration") or obj.get("duration_sec") or obj.get("duration_secs")
-                            if dur_val:
-                                try:
-                                    duration = int(float(dur_val))
-                                except Exception:
-                                    pass
-                            if duration == 0:
-                                # If no end/duration, assume 2 hours to avoid zero-length
-                                duration = 2 * 60 * 60
-
-                        url_full = ensure_full_url(str(url_path))
-                        norm.append({
-                            "site": "HackerEarth",
-                            "name": str(title),
-                            "url": url_full,
-                            "start_time": to_iso_utc(st),
-                            "duration": duration,
-                        })
-                    except Exception:
-                        pass
-                for v in obj.values():
-                    scan(v)
-            elif isinstance(obj, list):
-                for v in obj:
-                    scan(v)
-
-        scan(data)
-        # de-duplicate by url
-        seen = set()
-        dedup = []
-        for c in norm:
-            u = c.get("url")
-            if u in seen:
-                continue
-            seen.add(u)
-            dedup.append(c)
+        # Heuristic: scan for items with title/url and start/end timestamps
+        dedup = scan_records(data, HACKEREARTH_SCAN_RULE)
         src = "html" if used_path and used_path.startswith("/challenges") else ("api" if used_path else "unknown")
         last_fetch_stats["hackerearth"] = {"ok": True, "count": len(dedup), "source": src, "path": used_path}
         return dedup
     except Exception as e:
         last_fetch_stats["hackerearth"] = {"ok": False, "error": str(e)}
-        return []
+        raise
 
 
-def fetch_codechef() -> List[Dict]:
+def fetch_codechef() -> List[ContestRecord]:
     """Fetch present and future CodeChef contests from their public API."""
     try:
         headers = {
             "Accept": "application/json, text/plain, */*",
             "User-Agent": "AlgoVerse/1.0 (+https://example.com)",
         }
-        r = requests.get(CODECHEF_LIST_URL, headers=headers, timeout=12)
+        r = http.get(CODECHEF_LIST_URL, headers=headers, timeout=12)
         r.raise_for_status()
         js = r.json() or {}
         items = (js.get("present_contests") or []) + (js.get("future_contests") or [])
-        norm: List[Dict] = []
+        norm: List[ContestRecord] = []
         for it in items:
             try:
                 code = it.get("contest_code") or it.get("contestCode")
@@ -359,66 +316,77 @@ def fetch_codechef() -> List[Dict]:
                 end_iso = it.get("contest_end_date_iso") or it.get("contestEndDateISO")
                 if not (code and name and start_iso and end_iso):
                     continue
-                # compute duration
                 try:
                     sd = datetime.fromisoformat(start_iso.replace("Z", "+00:00"))
+                except Exception:
+                    continue
+                # compute duration
+                try:
                     ed = datetime.fromisoformat(end_iso.replace("Z", "+00:00"))
                     duration = int((ed - sd).total_seconds())
                 except Exception:
                     duration = 0
-                norm.append({
-                    "site": "CodeChef",
-                    "name": name,
-                    "url": f"https://www.codechef.com/{code}",
-                    "start_time": start_iso,
-                    "duration": duration,
-                })
+                norm.append(ContestRecord.from_datetime(
+                    site="CodeChef",
+                    name=name,
+                    url=f"https://www.codechef.com/{code}",
+                    start=sd,
+                    duration=duration,
+                    contest_id=code,
+                ))
             except Exception:
                 continue
         last_fetch_stats["codechef"] = {"ok": True, "count": len(norm)}
         return norm
     except Exception as e:
         last_fetch_stats["codechef"] = {"ok": False, "error": str(e)}
-        return []
+        raise
 
 
-def fetch_atcoder_kenkoooo() -> List[Dict]:
-    """Fetch upcoming AtCoder contests from kenkoooo dataset."""
-    try:
-        r = requests.get(ATCODER_CONTESTS_URL, timeout=12)
-        r.raise_for_status()
-        data = r.json()
-        now_dt = datetime.now(timezone.utc)
-        now_ts = now_dt.timestamp()
-        limit_ts = (now_dt + timedelta(days=60)).timestamp()  # cap horizon to 60d for safety
-        norm = []
-        for c in data:
+def fetch_atcoder_kenkoooo() -> List[ContestRecord]:
+    """Fetch upcoming AtCoder contests from kenkoooo dataset.
+
+    The dataset covers every AtCoder contest ever held, so it is revalidated
+    with a conditional GET and decoded only when it changed. The decoded rows
+    are kept as-is and the upcoming window is applied on every call, so a
+    304 never serves contests that have started since the last download.
+    """
+    def parse(r) -> List[tuple]:
+        rows = []
+        for c in r.json():
             try:
                 start_epoch = c.get("start_epoch_second")
-                duration = int(c.get("duration_second", 0))
                 title = c.get("title")
-                cid = c.get("id")
                 if not start_epoch or not title:
                     continue
-                se = float(start_epoch)
-                if se < now_ts or se > limit_ts:
-                    # only future within horizon
-                    continue
-                st = datetime.fromtimestamp(int(se), tz=timezone.utc)
-                norm.append({
-                    "site": "AtCoder",
-                    "name": title,
-                    "url": f"https://atcoder.jp/contests/{cid}",
-                    "start_time": to_iso_utc(st),
-                    "duration": duration,
-                })
+                rows.append((float(start_epoch), int(c.get("duration_second", 0)), title, c.get("id")))
             except Exception:
                 continue
-        last_fetch_stats["atcoder"] = {"ok": True, "count": len(norm)}
+        return rows
+
+    try:
+        rows, not_modified = conditional_get("atcoder_kenkoooo", ATCODER_CONTESTS_URL, parse, timeout=12)
+        now_dt = datetime.now(timezone.utc)
+        now_ts = now_dt.timestamp()
+        limit_ts = (now_dt + timedelta(days=60)).timestamp()  # cap horizon to 60d for safety
+        norm = [
+            ContestRecord.from_datetime(
+                site="AtCoder",
+                name=title,
+                url=f"https://atcoder.jp/contests/{cid}",
+                start=datetime.fromtimestamp(int(se), tz=timezone.utc),
+                duration=duration,
+                contest_id=cid,
+            )
+            # only future within horizon
+            for se, duration, title, cid in rows
+            if now_ts <= se <= limit_ts
+        ]
+        last_fetch_stats["atcoder"] = {"ok": True, "count": len(norm), "not_modified": not_modified}
         return norm
     except Exception as e:
         last_fetch_stats["atcoder"] = {"ok": False, "error": str(e)}
-        return []
+        raise
 
 
 def _parse_duration_hhmm(hhmm: str) -> int:
@@ -432,18 +400,18 @@ def _parse_duration_hhmm(hhmm: str) -> int:
         return 0
 
 
-def fetch_atcoder_html() -> List[Dict]:
+def fetch_atcoder_html() -> List[ContestRecord]:
     """Scrape AtCoder contests page to get Active and Upcoming contests with start time and duration."""
     url = "https://atcoder.jp/contests/"
     try:
-        r = requests.get(url, timeout=12, headers={
+        r = http.get(url, timeout=12, headers={
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)",
             "Accept-Language": "en-US,en;q=0.9"
         })
         r.raise_for_status()
-        soup = BeautifulSoup(r.text, "html.parser")
+        soup = extract_tables("atcoder", r.text)
 
-        norm: List[Dict] = []
+        norm: List[ContestRecord] = []
         now = datetime.now(timezone.utc)
         # Robust scan: any table rows with <time datetime> and a link to /contests/
         for table in soup.find_all("table"):
@@ -484,13 +452,14 @@ def fetch_atcoder_html() -> List[Dict]:
                     duration = 0
                     if len(tds) >= 3:
                         duration = _parse_duration_hhmm(tds[2].get_text(strip=True))
-                    norm.append({
-                        "site": "AtCoder",
-                        "name": a.get_text(strip=True),
-                        "url": f"https://atcoder.jp{href}" if href.startswith("/") else href,
-                        "start_time": to_iso_utc(st),
-                        "duration": duration,
-                    })
+                    norm.append(ContestRecord.from_datetime(
+                        site="AtCoder",
+                        name=a.get_text(strip=True),
+                        url=f"https://atcoder.jp{href}" if href.startswith("/") else href,
+                        start=st,
+                        duration=duration,
+                        contest_id=href.rstrip("/").rsplit("/", 1)[-1],
+                    ))
                     continue
                 href = a.get("href")
                 if "/contests/" not in href:
@@ -520,142 +489,105 @@ def fetch_atcoder_html() -> List[Dict]:
                 duration = 0
                 if len(tds) >= 3:
                     duration = _parse_duration_hhmm(tds[2].get_text(strip=True))
-                norm.append({
-                    "site": "AtCoder",
-                    "name": a.get_text(strip=True),
-                    "url": f"https://atcoder.jp{href}" if href.startswith("/") else href,
-                    "start_time": to_iso_utc(st),
-                    "duration": duration,
-                })
-        # Fallback to kenkoooo if HTML yields zero
-        if not norm:
-            ken = fetch_atcoder_kenkoooo()
-            last_fetch_stats["atcoder"] = {"ok": True, "count": len(ken), "source": "kenkoooo_html_zero"}
-            return ken
+                norm.append(ContestRecord.from_datetime(
+                    site="AtCoder",
+                    name=a.get_text(strip=True),
+                    url=f"https://atcoder.jp{href}" if href.startswith("/") else href,
+                    start=st,
+                    duration=duration,
+                    contest_id=href.rstrip("/").rsplit("/", 1)[-1],
+                ))
         last_fetch_stats["atcoder"] = {"ok": True, "count": len(norm), "source": "html"}
         return norm
     except Exception as e:
         last_fetch_stats["atcoder"] = {"ok": False, "error": str(e), "source": "html"}
-        return []
+        raise
+
 
+def fetch_topcoder() -> List[ContestRecord]:
+    """Fetch Topcoder ACTIVE and UPCOMING challenges and normalize schedule.
 
-def fetch_topcoder() -> List[Dict]:
-    """Fetch Topcoder ACTIVE and UPCOMING challenges and normalize schedule."""
+    Falls back to the challenges page when the API fails or returns nothing;
+    raises only if the API failed and the page did too.
+    """
+    norm: List[ContestRecord] = []
+    api_error: Optional[Exception] = None
+    # First try with 'statuses' combined to avoid 400s
+    params = {
+        "statuses": "Active,Upcoming",
+        "perPage": 100,
+        "page": 1,
+        "isLightweight": "true",
+    }
     try:
-        norm: List[Dict] = []
-        # First try with 'statuses' combined to avoid 400s
-        params = {
-            "statuses": "Active,Upcoming",
-            "perPage": 100,
-            "page": 1,
-            "isLightweight": "true",
-        }
-        try:
-            r = requests.get(TOPCODER_API, params=params, timeout=12)
-            r.raise_for_status()
-            arr = r.json() or []
-            for it in arr:
+        r = http.get(TOPCODER_API, params=params, timeout=12)
+        r.raise_for_status()
+        arr = r.json() or []
+        for it in arr:
+            try:
+                name = it.get("name")
+                cid = it.get("id")
+                start_raw = it.get("startDate") or it.get("startAt")
+                end_raw = it.get("endDate") or it.get("submissionEndDate") or it.get("endAt")
+                if not (name and cid and start_raw and end_raw):
+                    continue
                 try:
-                    name = it.get("name")
-                    cid = it.get("id")
-                    start_raw = it.get("startDate") or it.get("startAt")
-                    end_raw = it.get("endDate") or it.get("submissionEndDate") or it.get("endAt")
-                    if not (name and cid and start_raw and end_raw):
-                        continue
-                    try:
-                        st = datetime.fromisoformat(str(start_raw).replace("Z", "+00:00"))
-                        ed = datetime.fromisoformat(str(end_raw).replace("Z", "+00:00"))
-                    except Exception:
-                        continue
-                    duration = max(0, int((ed - st).total_seconds()))
-                    norm.append({
-                        "site": "Topcoder",
-                        "name": name,
-                        "url": f"https://www.topcoder.com/challenges/{cid}",
-                        "start_time": to_iso_utc(st),
-                        "duration": duration,
-                    })
+                    st = datetime.fromisoformat(str(start_raw).replace("Z", "+00:00"))
+                    ed = datetime.fromisoformat(str(end_raw).replace("Z", "+00:00"))
                 except Exception:
                     continue
-        except Exception:
-            # Ignore, will try fallback forms
-            pass
-
-        # If API returned empty, try HTML/Next.js fallback
-        if not norm:
-            html_norm = fetch_topcoder_html()
-            if html_norm:
-                last_fetch_stats["topcoder"] = {"ok": True, "count": len(html_norm), "source": "html"}
-                return html_norm
+                duration = max(0, int((ed - st).total_seconds()))
+                norm.append(ContestRecord.from_datetime(
+                    site="Topcoder",
+                    name=name,
+                    url=f"https://www.topcoder.com/challenges/{cid}",
+                    start=st,
+                    duration=duration,
+                    contest_id=cid,
+                ))
+            except Exception:
+                continue
+    except Exception as e:
+        api_error = e
+    if norm:
         last_fetch_stats["topcoder"] = {"ok": True, "count": len(norm), "source": "api"}
         return norm
-    except Exception as e:
-        # On API failure, attempt HTML fallback
-        html_norm = fetch_topcoder_html()
-        if html_norm:
-            last_fetch_stats["topcoder"] = {"ok": True, "count": len(html_norm), "source": "html", "api_error": str(e)}
-            return html_norm
-        last_fetch_stats["topcoder"] = {"ok": False, "error": str(e)}
-        return []
-
 
-def fetch_topcoder_html() -> List[Dict]:
-    """Scrape Topcoder challenges page and extract Active/Upcoming from __NEXT_DATA__."""
+    # If API failed or returned empty, try HTML/Next.js fallback
     try:
-        url = "https://www.topcoder.com/challenges?statuses=Active,Upcoming"
-        r = requests.get(url, timeout=12, headers={
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-        })
-        r.raise_for_status()
-        soup = BeautifulSoup(r.text, "html.parser")
-        script = soup.find("script", id="__NEXT_DATA__")
-        if not script or not script.string:
-            return []
-        data = json.loads(script.string)
-        norm: List[Dict] = []
-
-        def scan(obj):
-            if isinstance(obj, dict):
-                title = obj.get("name") or obj.get("title")
-                cid = obj.get("id") or obj.get("challengeId")
-                start = obj.get("startDate") or obj.get("startAt")
-                end = obj.get("endDate") or obj.get("endAt") or obj.get("submissionEndDate")
-                status = obj.get("status")
-                if title and cid and start and end and (str(status).lower() in ("active", "upcoming")):
-                    try:
-                        st = datetime.fromisoformat(str(start).replace("Z", "+00:00"))
-                        ed = datetime.fromisoformat(str(end).replace("Z", "+00:00"))
-                        duration = max(0, int((ed - st).total_seconds()))
-                        norm.append({
-                            "site": "Topcoder",
-                            "name": str(title),
-                            "url": f"https://www.topcoder.com/challenges/{cid}",
-                            "start_time": to_iso_utc(st),
-                            "duration": duration,
-                        })
-                    except Exception:
-                        pass
-                for v in obj.values():
-                    scan(v)
-            elif isinstance(obj, list):
-                for v in obj:
-                    scan(v)
-
-        scan(data)
-        # Deduplicate by URL
-        seen, out = set(), []
-        for c in norm:
-            u = c.get("url")
-            if u in seen:
-                continue
-            seen.add(u)
-            out.append(c)
-        return out
-    except Exception:
-        return []
-def fetch_leetcode_graphql() -> List[Dict]:
-    """Fetch upcoming LeetCode contests via GraphQL with fallback query."""
+        html_norm = fetch_topcoder_html()
+    except Exception as e:
+        if api_error is not None:
+            last_fetch_stats["topcoder"] = {"ok": False, "error": f"{api_error}; html: {e}"}
+            raise
+        # The API answered with nothing; a broken fallback page doesn't make that a failure
+        html_norm = []
+    stats = {"ok": True, "count": len(html_norm), "source": "html" if html_norm or api_error else "api"}
+    if api_error is not None:
+        stats["api_error"] = str(api_error)
+    last_fetch_stats["topcoder"] = stats
+    return html_norm
+
+
+def fetch_topcoder_html() -> List[ContestRecord]:
+    """Scrape Topcoder challenges page and extract Active/Upcoming from __NEXT_DATA__."""
+    url = "https://www.topcoder.com/challenges?statuses=Active,Upcoming"
+    r = http.get(url, timeout=12, headers={
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)",
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    })
+    r.raise_for_status()
+    data = extract_next_data("topcoder", r.content)
+    if data is None:
+        raise ValueError("next_data_missing")
+    return scan_records(data, TOPCODER_SCAN_RULE)
+
+
+def fetch_leetcode_graphql() -> List[ContestRecord]:
+    """Fetch upcoming LeetCode contests via GraphQL with fallback query.
+
+    Raises only if every query failed; an empty answer is a successful fetch.
+    """
     headers = {
         "Content-Type": "application/json",
         "Accept": "application/json",
@@ -671,9 +603,10 @@ def fetch_leetcode_graphql() -> List[Dict]:
          "pluck": lambda d: (d.get("contestUpcomingContests") or []) + (d.get("activeContests") or [])},
     ]
     errors: List[str] = []
+    answered = False
     for q in queries:
         try:
-            r = requests.post(LEETCODE_GRAPHQL_URL, json={"query": q["query"]}, headers=headers, timeout=12)
+            r = http.post(LEETCODE_GRAPHQL_URL, json={"query": q["query"]}, headers=headers, timeout=12)
             r.raise_for_status()
             js = r.json()
             data = (js or {}).get("data") or {}
@@ -688,33 +621,77 @@ def fetch_leetcode_graphql() -> List[Dict]:
                     if not start_epoch or not title or not slug:
                         continue
                     st = datetime.fromtimestamp(int(start_epoch), tz=timezone.utc)
-                    norm.append({
-                        "site": "LeetCode",
-                        "name": title,
-                        "url": f"https://leetcode.com/contest/{slug}",
-                        "start_time": to_iso_utc(st),
-                        "duration": duration,
-                    })
+                    norm.append(ContestRecord.from_datetime(
+                        site="LeetCode",
+                        name=title,
+                        url=f"https://leetcode.com/contest/{slug}",
+                        start=st,
+                        duration=duration,
+                        contest_id=slug,
+                    ))
                 except Exception:
                     continue
             if norm:
                 last_fetch_stats["leetcode"] = {"ok": True, "count": len(norm)}
                 return norm
             # If empty, still mark ok but zero; we'll try next fallback
+            answered = True
             errors.append("empty result")
         except Exception as e:
             errors.append(str(e))
             continue
+    if answered:
+        last_fetch_stats["leetcode"] = {"ok": True, "count": 0}
+        return []
     last_fetch_stats["leetcode"] = {"ok": False, "error": "; ".join(errors) or "unknown"}
-    return []
+    raise ValueError(f"LeetCode GraphQL failed: {'; '.join(errors)}")
 
 
-def fetch_kontests(platform: str) -> List[Dict]:
+def fetch_atcoder() -> List[ContestRecord]:
+    """Prefer HTML scraping for AtCoder for freshness, fall back to the kenkoooo dataset.
+
+    The fallback is used when the page fails or lists nothing; only its
+    failure fails the source.
+    """
+    try:
+        norm = fetch_atcoder_html()
+    except Exception:
+        norm = []
+    if norm:
+        return norm
+    ken = fetch_atcoder_kenkoooo()
+    last_fetch_stats["atcoder"]["source"] = "kenkoooo"
+    return ken
+
+
+# Every platform the refresher keeps a snapshot for
+SOURCE_FETCHERS = {
+    "codeforces": fetch_codeforces,
+    "atcoder": fetch_atcoder,
+    "leetcode": fetch_leetcode_graphql,
+    "codechef": fetch_codechef,
+    "topcoder": fetch_topcoder,
+    "hackerearth": fetch_hackerearth,
+}
+
+# Sources merged by /contests; HackerEarth is skipped to avoid unnecessary requests
+AGGREGATED_SOURCES = ["codeforces", "atcoder", "leetcode", "codechef", "topcoder"]
+
+# Idle SSE connections get a comment line this often
+STREAM_HEARTBEAT_SECONDS = 15
+
+# Polls the change log once per worker for every open /contests/stream
+stream_broadcaster = StreamBroadcaster(AGGREGATED_SOURCES)
+
+contest_refresher.register(SOURCE_FETCHERS)
+
+
+def fetch_kontests(platform: str) -> List[ContestRecord]:
     url = KONTESTS_ENDPOINTS.get(platform)
     if not url:
         return []
     try:
-        r = requests.get(url, timeout=8)
+        r = http.get(url, timeout=8)
         r.raise_for_status()
         data = r.json()
         # Ensure normalized fields exist
@@ -722,26 +699,70 @@ def fetch_kontests(platform: str) -> List[Dict]:
         for c in data:
             if not c.get("start_time"):
                 continue
-            normalized.append({
-                "site": c.get("site") or platform.title(),
-                "name": c.get("name"),
-                "url": c.get("url"),
-                "start_time": c.get("start_time"),
-                "duration": c.get("duration", 0),
-            })
+            record = ContestRecord.from_dict({**c, "site": c.get("site") or platform.title()})
+            if record:
+                normalized.append(record)
         return normalized
     except Exception:
         return []
 
 
+async def load_snapshot_metas(sources: List[str], refresh: bool = False) -> Dict[str, Optional[Dict]]:
+    """Load the snapshot meta for each source.
+
+    Snapshots are kept fresh by the background refresher, so this normally
+    makes no upstream calls. Sources are fetched inline only when the caller
+    forces a refresh or no snapshot exists yet (cold start); concurrent
+    callers share one in-flight fetch per source across workers.
+
+    The store is read through the blocking Redis client, so every read runs
+    on a worker thread rather than on the event loop.
+    """
+    deadline = settings.CONTEST_FETCH_DEADLINE_SECONDS
+    if refresh:
+        await contest_refresher.refresh(sources, force=True, deadline=deadline, wait=True)
+    metas = await asyncio.to_thread(load_metas, sources)
+    missing = [source for source, meta in metas.items() if meta is None]
+    if missing:
+        await contest_refresher.refresh(missing, force=True, deadline=deadline, wait=True)
+        metas.update(await asyncio.to_thread(load_metas, missing))
+    return metas
+
+
+def snapshot_info(metas: Dict[str, Optional[Dict]]) -> Dict[str, object]:
+    """Describe the age of the oldest snapshot in a response."""
+    available = [meta for meta in metas.values() if meta]
+    if not available:
+        return {"fetched_at": None, "snapshot_age_seconds": None, "stale": True}
+    oldest = min(available, key=lambda meta: meta.get("fetched_at") or 0)
+    age = snapshot_age(oldest)
+    return {
+        "fetched_at": datetime.fromtimestamp(oldest.get("fetched_at") or 0, tz=timezone.utc).isoformat(),
+        "snapshot_age_seconds": int(age),
+        "stale": age > settings.CONTEST_STALE_AFTER_SECONDS,
+    }
+
+
+def source_counts(metas: Dict[str, Optional[Dict]]) -> Dict[str, int]:
+    """Contest counts per aggregated source, using the short keys the frontend expects."""
+    per_source = {source: (meta or {}).get("count", 0) for source, meta in metas.items()}
+    return {
+        "total": sum(per_source.values()),
+        "cf": per_source["codeforces"],
+        "atcoder": per_source["atcoder"],
+        "leetcode": per_source["leetcode"],
+        "codechef": per_source["codechef"],
+        "topcoder": per_source["topcoder"],
+    }
+
+
 @router.get("/contests")
-def get_contests(
+async def get_contests(
     days: int = Query(7, ge=1), 
     include_running: bool = True,
     include_recent: bool = True,
     recent_days: int = Query(7, ge=1, le=30),
     refresh: bool = False,
-    redis: Redis = Depends(get_redis)
 ):
     """
     Returns contests grouped into running, upcoming, and recent.
@@ -751,132 +772,204 @@ def get_contests(
     - LeetCode via GraphQL
     - CodeChef public API
     
+    Contests are answered with range queries over the per-source contest
+    store maintained by the background refresher; ``stale`` and
+    ``snapshot_age_seconds`` describe the oldest snapshot used.
+    
     Args:
         days: Number of days to look ahead for upcoming contests
         include_running: Whether to include currently running contests
         include_recent: Whether to include recently finished contests
         recent_days: Number of past days to look for recent contests
-        refresh: If True, bypass cache and fetch fresh data
-        redis: Redis client instance
+        refresh: If True, re-fetch all sources before answering
     """
-    # Define cache keys for different sources
-    cache_key = f"contest_cache:all:{days}:{include_running}:{include_recent}:{recent_days}"
-    
-    # Check if we have cached data and refresh flag is not set
-    if not refresh:
-        cached_data = get_cache(cache_key)
-        if cached_data:
-            return cached_data
+    metas = await load_snapshot_metas(AGGREGATED_SOURCES, refresh=refresh)
+    buckets = await asyncio.to_thread(
+        query_contests,
+        AGGREGATED_SOURCES,
+        metas,
+        days,
+        include_running=include_running,
+        recent_days=recent_days if include_recent else None,
+    )
+    counts = source_counts(metas)
+    missing = sorted(source for source, meta in metas.items() if meta is None)
     
-    # If no cache or refresh requested, fetch from sources
-    cf = fetch_codeforces()
-    # Prefer HTML scraping for AtCoder for freshness
-    atc = fetch_atcoder_html() or fetch_atcoder_kenkoooo()
-    lc = fetch_leetcode_graphql()
-    cc = fetch_codechef()
-    tc = fetch_topcoder()
-    # Skip HackerEarth for now in aggregation to avoid unnecessary requests
-    merged = cf + atc + lc + cc + tc
-    counts = {
-        "total": len(merged),
-        "cf": len(cf),
-        "atcoder": len(atc),
-        "leetcode": len(lc),
-        "codechef": len(cc),
-        "topcoder": len(tc),
-    }
-
-    upcoming = filter_upcoming(merged, days)
-    running = filter_running(merged) if include_running else []
-    recent = filter_recent(merged, recent_days) if include_recent else []
-    
-    # Prepare response data
-    response_data = {
+    return {
         "status": "success",
-        "running": running,
-        "upcoming": upcoming,
-        "recent": recent,
-        "fetched_at": datetime.now(timezone.utc).isoformat(),
+        "running": [r.to_dict() for r in buckets["running"]],
+        "upcoming": [r.to_dict() for r in buckets["upcoming"]],
+        "recent": [r.to_dict() for r in buckets["recent"]],
+        **snapshot_info(metas),
         "counts": counts,
-        "cached": False
+        "missing_sources": missing,
+        "partial": bool(missing),
+        "cached": not refresh
     }
-    
-    # Cache the response data (expires in 1 hour)
-    set_cache(cache_key, response_data, expiry=60*60)
-    
-    return response_data
 
 
 @router.get("/contests/debug")
 def contests_debug():
-    """Return last fetch stats for each source to aid debugging."""
-    return {"sources": last_fetch_stats}
+    """Return last fetch stats and circuit breaker state for each source to aid debugging."""
+    metas = load_metas(list(SOURCE_FETCHERS))
+    return {
+        "sources": last_fetch_stats,
+        "breakers": contest_refresher.breaker.states(list(SOURCE_FETCHERS)),
+        "parse": parse_stats,
+        "snapshot_age_seconds": {
+            source: (int(snapshot_age(meta)) if meta else None) for source, meta in metas.items()
+        },
+        "refresher": contest_refresher.status(),
+        "stream": stream_broadcaster.status(),
+    }
+
+
+def sse_message(event: str, data: str, event_id: Optional[str] = None) -> str:
+    lines = [f"id: {event_id}"] if event_id else []
+    lines += [f"event: {event}", f"data: {data}"]
+    return "\n".join(lines) + "\n\n"
+
+
+def stream_snapshot(days: int, recent_days: int, event_id: str) -> str:
+    """Full running/upcoming/recent payload sent when a stream starts or cannot resume."""
+    metas = load_metas(AGGREGATED_SOURCES)
+    buckets = query_contests(AGGREGATED_SOURCES, metas, days, recent_days=recent_days)
+    payload = {
+        "running": [r.to_dict() for r in buckets["running"]],
+        "upcoming": [r.to_dict() for r in buckets["upcoming"]],
+        "recent": [r.to_dict() for r in buckets["recent"]],
+        **snapshot_info(metas),
+        "counts": source_counts(metas),
+    }
+    return sse_message("snapshot", json.dumps(payload), event_id)
+
+
+def delta_message(raw: List[str], log_id: str, tick: int) -> Optional[str]:
+    """``delta`` event carrying already-encoded change events, or None if there are none."""
+    if not raw:
+        return None
+    return sse_message("delta", '{"changes":[' + ",".join(raw) + "]}", format_cursor(log_id, tick))
+
+
+@router.get("/contests/stream")
+async def stream_contests(
+    request: Request,
+    days: int = Query(30, ge=1),
+    recent_days: int = Query(7, ge=1, le=30),
+    last_event_id: Optional[str] = None,
+):
+    """
+    Server-Sent Events stream of contest changes.
+    
+    The first message is a ``snapshot`` event with the same buckets as
+    ``/contests``. After that only ``delta`` events are sent, each holding the
+    contests added, changed, removed, started or ended since the previous
+    event. Reconnecting clients resume from ``Last-Event-ID`` (or the
+    ``last_event_id`` query parameter) and get a fresh snapshot only when the
+    change log no longer covers their position. The change log is polled
+    once per worker and shared by every open stream (see ``contest_broadcast``).
+    
+    Args:
+        days: Look-ahead window for upcoming contests in snapshots
+        recent_days: Look-back window for recent contests in snapshots
+        last_event_id: Event id to resume from when the header cannot be set
+    """
+    cursor = request.headers.get("last-event-id") or last_event_id
+
+    # snapshot(), open_stream() and catch_up() read the change log and store with the blocking
+    # Redis client, so they run on worker threads; each returns (log_id, tick, message or None).
+    def snapshot():
+        now = int(time.time())
+        log_id = latest_id()
+        return log_id, now, stream_snapshot(days, recent_days, format_cursor(log_id, now))
+
+    def open_stream():
+        resume = parse_cursor(cursor, int(time.time()))
+        if resume and read_since(resume[0], count=1) is not None:
+            return resume[0], resume[1], None
+        return snapshot()
+
+    def catch_up(log_id: str, tick: int):
+        batch = collect(AGGREGATED_SOURCES, log_id, tick)
+        if batch.reset:
+            return snapshot()
+        return batch.log_id, batch.tick, delta_message(batch.events_after(log_id, tick), batch.log_id, batch.tick)
+
+    async def events():
+        # Subscribe before the snapshot so no batch published after it is missed
+        queue = stream_broadcaster.subscribe()
+        try:
+            log_id, tick, message = await asyncio.to_thread(open_stream)
+            if message:
+                yield message
+            last_sent = time.monotonic()
+
+            while not await request.is_disconnected():
+                try:
+                    batch = await asyncio.wait_for(queue.get(), settings.CONTEST_STREAM_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    batch = None
+                messages = []
+                if batch is not None and batch.reset:
+                    log_id, tick, message = await asyncio.to_thread(snapshot)
+                    messages.append(message)
+                elif batch is not None:
+                    if not batch.covers(log_id, tick):
+                        log_id, tick, message = await asyncio.to_thread(catch_up, log_id, tick)
+                        messages.append(message)
+                    raw = batch.events_after(log_id, tick)
+                    log_id, tick = batch.advance(log_id, tick)
+                    messages.append(delta_message(raw, log_id, tick))
+                messages = [m for m in messages if m]
+                for message in messages:
+                    yield message
+                if messages:
+                    last_sent = time.monotonic()
+                elif time.monotonic() - last_sent >= STREAM_HEARTBEAT_SECONDS:
+                    # Comment line keeps proxies from closing an idle connection
+                    yield ": keep-alive\n\n"
+                    last_sent = time.monotonic()
+        finally:
+            stream_broadcaster.unsubscribe(queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("/contests/{source}")
-def get_contests_by_source(
+async def get_contests_by_source(
     source: str,
     days: int = Query(7, ge=1),
     include_running: bool = True,
     refresh: bool = False,
-    redis: Redis = Depends(get_redis)
 ):
     """
-    Returns contests from a specific source with Redis caching.
+    Returns contests from a specific source, served from the contest store.
     
     Args:
         source: The contest source (codeforces, atcoder, leetcode, codechef, topcoder, hackerearth)
         days: Number of days to look ahead for upcoming contests
         include_running: Whether to include currently running contests
-        refresh: If True, bypass cache and fetch fresh data
-        redis: Redis client instance
+        refresh: If True, re-fetch the source before answering
     """
     source = source.lower()
-    valid_sources = ["codeforces", "atcoder", "leetcode", "codechef", "topcoder", "hackerearth"]
+    valid_sources = list(SOURCE_FETCHERS)
     
     if source not in valid_sources:
         return {"status": "error", "message": f"Invalid source. Valid sources are: {', '.join(valid_sources)}"}
     
-    # Define cache key for this source
-    cache_key = f"contest_cache:{source}:{days}:{include_running}"
-    
-    # Check if we have cached data and refresh flag is not set
-    if not refresh:
-        cached_data = get_cache(cache_key)
-        if cached_data:
-            return cached_data
+    metas = await load_snapshot_metas([source], refresh=refresh)
+    buckets = await asyncio.to_thread(query_contests, [source], metas, days, include_running=include_running)
     
-    # Fetch data based on source
-    contests = []
-    if source == "codeforces":
-        contests = fetch_codeforces()
-    elif source == "atcoder":
-        contests = fetch_atcoder_html() or fetch_atcoder_kenkoooo()
-    elif source == "leetcode":
-        contests = fetch_leetcode_graphql()
-    elif source == "codechef":
-        contests = fetch_codechef()
-    elif source == "topcoder":
-        contests = fetch_topcoder()
-    elif source == "hackerearth":
-        contests = fetch_hackerearth()
-    
-    # Filter contests
-    upcoming = filter_upcoming(contests, days)
-    running = filter_running(contests) if include_running else []
-    
-    # Prepare response data
-    response_data = {
+    return {
         "status": "success",
         "source": source,
-        "running": running,
-        "upcoming": upcoming,
-        "fetched_at": datetime.now(timezone.utc).isoformat(),
-        "count": len(contests),
-        "cached": False
+        "running": [r.to_dict() for r in buckets["running"]],
+        "upcoming": [r.to_dict() for r in buckets["upcoming"]],
+        **snapshot_info(metas),
+        "count": (metas[source] or {}).get("count", 0),
+        "cached": not refresh
     }
-    
-    # Cache the response data (expires in 1 hour)
-    set_cache(cache_key, response_data, expiry=60*60)
-    
-    return response_data
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 from ..models import User, AlgoDifficulty, AlgoComplexity, AlgoStatus
@@ -16,6 +16,7 @@ from ..schemas import (
 from ..db import get_db
 from ..auth.oauth2 import get_current_user
 from ..repositories import user_repo, user_progress_repo, blog_repo
+from ..repositories.pagination import set_next_cursor
 from ..auth.jwt_token import create_access_token
 from ..auth.email_utils import (
     generate_otp,
@@ -236,22 +237,27 @@ def delete_profile(
 
 @router.get("/my-blogs", response_model=List[ShowBlog])
 def get_my_blogs(
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
     skip: int = Query(0, ge=0, description="Number of blogs to skip"),
     limit: int = Query(5, ge=1, le=100, description="Number of blogs to return"),
     include_unapproved: bool = Query(False, description="Include unapproved blogs for the current user"),
-    status_filter: Optional[str] = Query(None, description="Filter by status: approved | pending | rejected | unapproved")
+    status_filter: Optional[str] = Query(None, description="Filter by status: approved | pending | rejected | unapproved"),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page (replaces skip)")
 ):
     try:
-        return blog_repo.get_user_blogs(
+        blogs = blog_repo.get_user_blogs(
             db,
             current_user.id,
             skip=skip,
             limit=limit,
             include_unapproved=include_unapproved,
-            status_filter=status_filter
+            status_filter=status_filter,
+            cursor=cursor
         )
+        set_next_cursor(response, blogs, limit, blog_repo.BLOG_ORDER)
+        return blogs
     except HTTPException:
         raise
     except SQLAlchemyError as e:
@@ -7,6 +7,7 @@ from typing import List, Optional
 from datetime import datetime
 from ..auth.oauth2 import get_current_user
 from ..middleware.admin_dependencies import get_current_admin
+from ..db.cache_tags import invalidate_on_commit
 import requests
 import json
 
@@ -63,7 +64,7 @@ class UserProblemProgressUpdate(BaseModel):
 
 # Get related problems for an algorithm
 @router.get("/algorithm/{algorithm_id}", response_model=List[RelatedProblemResponse])
-async def get_algorithm_problems(
+def get_algorithm_problems(
     algorithm_id: int,
     status: Optional[str] = Query("approved", description="Filter by approval status"),
     db: Session = Depends(get_db)
@@ -92,7 +93,7 @@ async def get_algorithm_problems(
 
 # Get all problems for admin
 @router.get("/all", response_model=List[RelatedProblemResponse])
-async def get_all_problems(
+def get_all_problems(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_admin)
 ):
@@ -102,7 +103,7 @@ async def get_all_problems(
 
 # Create a new related problem
 @router.post("/", response_model=RelatedProblemResponse)
-async def create_related_problem(
+def create_related_problem(
     problem: RelatedProblemCreate,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -128,6 +129,8 @@ async def create_related_problem(
     )
     
     db.add(db_problem)
+    if db_problem.status == ProblemStatus.APPROVED:
+        invalidate_on_commit(db, f"algorithm:{db_problem.algorithm_id}:related")
     db.commit()
     db.refresh(db_problem)
     
@@ -135,7 +138,7 @@ async def create_related_problem(
 
 # Update a related problem
 @router.put("/{problem_id}", response_model=RelatedProblemResponse)
-async def update_related_problem(
+def update_related_problem(
     problem_id: int,
     problem_update: RelatedProblemUpdate,
     current_user: User = Depends(get_current_admin),
@@ -147,10 +150,17 @@ async def update_related_problem(
         raise HTTPException(status_code=404, detail="Problem not found")
     
     update_data = problem_update.model_dump(exclude_unset=True)
+    # The problem may move to another algorithm: evict both lists
+    old_algorithm_id = db_problem.algorithm_id
     for field, value in update_data.items():
         setattr(db_problem, field, value)
     
     db_problem.updated_at = datetime.utcnow()
+    invalidate_on_commit(
+        db,
+        f"algorithm:{old_algorithm_id}:related",
+        f"algorithm:{db_problem.algorithm_id}:related",
+    )
     db.commit()
     db.refresh(db_problem)
     
@@ -162,7 +172,7 @@ class ProblemStatusUpdate(BaseModel):
 
 # Approve/reject a problem
 @router.patch("/{problem_id}/status")
-async def update_problem_status(
+def update_problem_status(
     problem_id: int,
     status_update: ProblemStatusUpdate,
     current_user: User = Depends(get_current_admin),
@@ -187,13 +197,14 @@ async def update_problem_status(
     db_problem.approved_by = current_user.id
     db_problem.approved_at = datetime.utcnow()
     
+    invalidate_on_commit(db, f"algorithm:{db_problem.algorithm_id}:related")
     db.commit()
     
     return {"message": f"Problem {new_status.value} successfully"}
 
 # Delete a problem
 @router.delete("/{problem_id}")
-async def delete_related_problem(
+def delete_related_problem(
     problem_id: int,
     current_user: User = Depends(get_current_admin),
     db: Session = Depends(get_db)
@@ -204,13 +215,14 @@ async def delete_related_problem(
         raise HTTPException(status_code=404, detail="Problem not found")
     
     db.delete(db_problem)
+    invalidate_on_commit(db, f"algorithm:{db_problem.algorithm_id}:related")
     db.commit()
     
     return {"message": "Problem deleted successfully"}
 
 # Get pending problems for admin review
 @router.get("/pending", response_model=List[RelatedProblemResponse])
-async def get_pending_problems(
+def get_pending_problems(
     current_user: User = Depends(get_current_admin),
     db: Session = Depends(get_db)
 ):
@@ -223,7 +235,7 @@ async def get_pending_problems(
 
 # User problem progress tracking
 @router.post("/{problem_id}/progress")
-async def update_user_problem_progress(
+def update_user_problem_progress(
     problem_id: int,
     progress_update: UserProblemProgressUpdate,
     current_user: User = Depends(get_current_user),
@@ -270,7 +282,7 @@ async def update_user_problem_progress(
 
 # Get user's problem progress
 @router.get("/progress/{algorithm_id}")
-async def get_user_algorithm_progress(
+def get_user_algorithm_progress(
     algorithm_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -310,7 +322,7 @@ async def get_user_algorithm_progress(
 
 # Auto-suggest problems from YouKnowWho Academy
 @router.post("/auto-suggest/{algorithm_id}")
-async def auto_suggest_problems(
+def auto_suggest_problems(
     algorithm_id: int,
     current_user: User = Depends(get_current_admin),
     db: Session = Depends(get_db)
@@ -347,7 +359,7 @@ async def auto_suggest_problems(
 
 # Get topic list mapping for YouKnowWho Academy integration
 @router.get("/topic-mappings")
-async def get_topic_mappings(
+def get_topic_mappings(
     current_user: User = Depends(get_current_admin),
     db: Session = Depends(get_db)
 ):
@@ -360,7 +372,7 @@ async def get_topic_mappings(
 
 # Create or update topic mapping
 @router.post("/topic-mappings")
-async def create_topic_mapping(
+def create_topic_mapping(
     algorithm_id: int,
     source_name: str = "YouKnowWho Academy",
     topic_tags: str = "",
@@ -400,7 +412,7 @@ async def create_topic_mapping(
 
 # Sync all algorithms with YouKnowWho Academy
 @router.post("/sync-all")
-async def sync_all_algorithms(
+def sync_all_algorithms(
     current_user: User = Depends(get_current_admin),
     db: Session = Depends(get_db)
 ):
@@ -1,6 +1,6 @@
 import datetime
 from pydantic import BaseModel, EmailStr
-from typing import Optional, List, Any, Dict
+from typing import Optional, List, Any, Dict, Union
 from datetime import datetime
 from .models import AlgoDifficulty, AlgoComplexity, AlgoStatus, BlogStatus
 
@@ -48,6 +48,16 @@ class ShowBlog(BaseModel):
     class Config:
         from_attributes = True
 
+class BlogSearchResult(BaseModel):
+    """Search hit: a snippet of the body around the match instead of the full body"""
+    id: int
+    title: str
+    snippet: str
+    author: Optional[str] = None
+    author_id: Optional[int] = None
+    created_at: datetime
+    score: float
+
 class AddBlog(BaseModel):
     title: str
     body: str 
@@ -119,7 +129,8 @@ class UpdateAlgorithm(BaseModel):
     class Config:
         from_attributes = True
 
-class ShowAlgorithm(BaseModel):
+class AlgorithmSummary(BaseModel):
+    """Algorithm list item without the explanation and code bodies"""
     id: int
     name: str
     type_id: int
@@ -127,11 +138,16 @@ class ShowAlgorithm(BaseModel):
     description: str
     difficulty: AlgoDifficulty
     complexity: AlgoComplexity
-    explanation: Optional[str] = None
-    code: Optional[str] = None
 
     class Config:
         from_attributes = True
+
+class ShowAlgorithm(AlgorithmSummary):
+    explanation: Optional[str] = None
+    code: Optional[str] = None
+
+# Algorithm list responses: summaries (``summary=true``) or full rows
+AlgorithmList = Union[List[AlgorithmSummary], List[ShowAlgorithm]]
       
 class UserProfile(BaseModel):
     id: int
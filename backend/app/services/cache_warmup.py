@@ -0,0 +1,166 @@
+"""
+Cache warm-up after a deploy or cold start.
+
+Started from the FastAPI lifespan as a background task, so the app reports
+ready immediately. It fills the response cache for the algorithm types
+list, the algorithm catalog and each algorithm's detail and approved
+related problems (the same entries the first visitors would otherwise miss
+on), then makes sure every contest snapshot is fresh.
+
+The whole run is bounded by ``CACHE_WARMUP_BUDGET_SECONDS``; whatever is
+left when the budget runs out is simply cached on first request as usual.
+The outcome is kept in ``report`` and shown by ``/health``.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, Optional
+
+from ..core.config import settings
+from ..db import SessionLocal
+from ..db.redis_client import get_many_ttl, redis_health
+from ..middleware.response_cache import cached_response_key, warm_response
+from ..models import Algorithm
+from ..routes import algo_types, algorithm
+from .contest_refresher import contest_refresher
+
+logger = logging.getLogger(__name__)
+
+
+class CacheWarmup:
+    """Preloads catalog and contest data into the cache tiers within a time budget."""
+
+    def __init__(self):
+        self.report: Dict[str, object] = {"status": "idle"}
+        self._task: Optional[asyncio.Task] = None
+
+    def _remaining(self, deadline: float) -> float:
+        return deadline - time.monotonic()
+
+    def _warm(self, datasets: Dict[str, Dict[str, int]], name: str, handler, path: str, **kwargs):
+        counts = datasets.setdefault(name, {"warmed": 0, "cached": 0})
+        if warm_response(handler, path, **kwargs):
+            counts["warmed"] += 1
+        else:
+            counts["cached"] += 1
+
+    def warm_catalog(self, deadline: float, datasets: Dict[str, Dict[str, int]]) -> bool:
+        """Warm the algorithm type/catalog responses; returns False if the budget ran out."""
+        db = SessionLocal()
+        try:
+            self._warm(datasets, "algo_types", algo_types.get_all_algorithm_types, "/algo-type/", db=db)
+            # Keyed by the query string clients send, or requests would never hit it
+            self._warm(
+                datasets,
+                "algorithms",
+                algorithm.get_all_algorithms,
+                "/algorithms/",
+                query={"skip": 0, "limit": 5},
+                db=db,
+                skip=0,
+                limit=5,
+                summary=False,
+                cursor=None,
+            )
+            # What the catalog pages request: the first 100 summaries
+            self._warm(
+                datasets,
+                "algorithm_summaries",
+                algorithm.get_all_algorithms,
+                "/algorithms/",
+                query={"skip": 0, "limit": 100, "summary": "true"},
+                db=db,
+                skip=0,
+                limit=100,
+                summary=True,
+                cursor=None,
+            )
+            ids = [row.id for row in db.query(Algorithm.id).order_by(Algorithm.id)]
+            per_algorithm = [
+                ("algorithm_details", algorithm.get_algorithm, "/algorithms/{id}"),
+                ("related_problems", algorithm.get_algorithm_related_problems, "/algorithms/{id}/related-problems"),
+            ]
+            # One round trip tells which of the per-algorithm entries are already cached
+            keys = {
+                (name, algo_id): cached_response_key(handler, path.format(id=algo_id))
+                for algo_id in ids
+                for name, handler, path in per_algorithm
+            }
+            ttls = get_many_ttl(keys.values())
+            for algo_id in ids:
+                for name, handler, path in per_algorithm:
+                    if ttls[keys[name, algo_id]] is not None:
+                        datasets.setdefault(name, {"warmed": 0, "cached": 0})["cached"] += 1
+                        continue
+                    if self._remaining(deadline) <= 0:
+                        return False
+                    self._warm(datasets, name, handler, path.format(id=algo_id), id=algo_id, db=db)
+            return True
+        finally:
+            db.close()
+
+    async def warm_contests(self, deadline: float, datasets: Dict[str, Dict[str, int]]) -> bool:
+        """Refresh missing or stale contest snapshots; returns False if the budget ran out."""
+        sources = list(contest_refresher.fetchers)
+        try:
+            updated = await asyncio.wait_for(
+                contest_refresher.refresh(deadline=self._remaining(deadline), wait=True),
+                timeout=self._remaining(deadline),
+            )
+        except asyncio.TimeoutError:
+            return False
+        stale = await asyncio.to_thread(contest_refresher.due_sources, sources, settings.CONTEST_REFRESH_INTERVAL_SECONDS)
+        datasets["contests"] = {"warmed": len(updated), "cached": len(sources) - len(updated) - len(stale)}
+        return True
+
+    async def run(self) -> Dict[str, object]:
+        """Run one warm-up pass and return its report."""
+        budget = settings.CACHE_WARMUP_BUDGET_SECONDS
+        started = time.monotonic()
+        deadline = started + budget
+        datasets: Dict[str, Dict[str, int]] = {}
+        self.report = {"status": "running", "started_at": time.time(), "budget_seconds": budget, "datasets": datasets}
+
+        if not await asyncio.to_thread(redis_health.check):
+            self.report.update(status="skipped", reason="redis unavailable")
+            logger.warning("Cache warm-up skipped: Redis is unavailable")
+            return self.report
+
+        complete = False
+        try:
+            if settings.RESPONSE_CACHE_ENABLED:
+                complete = await asyncio.to_thread(self.warm_catalog, deadline, datasets)
+            else:
+                complete = True
+            if complete and settings.CONTEST_REFRESH_ENABLED and self._remaining(deadline) > 0:
+                complete = await self.warm_contests(deadline, datasets)
+            status = "done" if complete else "budget_exceeded"
+        except Exception as e:
+            logger.error(f"Cache warm-up failed: {str(e)}")
+            status = "failed"
+            self.report["error"] = str(e)
+
+        duration = round(time.monotonic() - started, 3)
+        self.report.update(status=status, duration_seconds=duration)
+        summary = ", ".join(f"{name} {c['warmed']}/{c['warmed'] + c['cached']}" for name, c in datasets.items())
+        logger.info(f"Cache warm-up {status} in {duration}s (warmed/total: {summary or 'nothing'})")
+        return self.report
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+# Create a shared warm-up instance
+cache_warmup = CacheWarmup()
@@ -0,0 +1,112 @@
+"""
+Per-source circuit breakers shared across workers.
+
+A contest platform that is down would otherwise cost every refresh the full
+HTTP timeout, often several times over through its fallback chain. After
+``threshold`` consecutive failures a source's breaker opens and calls to it
+are skipped outright. Once the backoff has elapsed the breaker is half-open:
+the next call is a probe, which closes the breaker on success or reopens it
+with a doubled backoff (capped at ``max_backoff``) on failure.
+
+State lives in a small Redis hash per source so every uvicorn worker sees
+the same breaker; when Redis is unreachable an in-process copy is used.
+"""
+
+import time
+from typing import Dict, List
+
+from ..db.redis_client import get_redis, record_error
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Keep breaker state around long enough to outlive the longest backoff
+STATE_EXPIRY = 60 * 60 * 24
+
+
+class CircuitBreaker:
+    """Consecutive-failure breakers with exponential backoff, keyed by name."""
+
+    def __init__(self, prefix: str, threshold: int, base_backoff: float, max_backoff: float):
+        self.prefix = prefix
+        self.threshold = max(1, threshold)
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._local: Dict[str, Dict[str, object]] = {}
+
+    def _key(self, name: str) -> str:
+        return f"{self.prefix}:{name}"
+
+    def _backoff(self, failures: int) -> float:
+        return min(self.max_backoff, self.base_backoff * 2 ** max(0, failures - self.threshold))
+
+    def _load(self, names: List[str]) -> Dict[str, Dict[str, object]]:
+        try:
+            pipe = get_redis().pipeline(transaction=False)
+            for name in names:
+                pipe.hgetall(self._key(name))
+            return dict(zip(names, pipe.execute()))
+        except Exception as e:
+            record_error(e)
+            return {name: self._local.get(name, {}) for name in names}
+
+    def _describe(self, raw: Dict[str, object], now: float) -> Dict[str, object]:
+        failures = int(raw.get("failures") or 0)
+        open_until = float(raw.get("open_until") or 0)
+        if failures < self.threshold:
+            state = CLOSED
+        elif open_until > now:
+            state = OPEN
+        else:
+            state = HALF_OPEN
+        return {
+            "state": state,
+            "failures": failures,
+            "retry_in_seconds": round(max(0.0, open_until - now), 1) if state == OPEN else 0,
+            "last_error": raw.get("last_error") or None,
+            "last_failure": float(raw["last_failure"]) if raw.get("last_failure") else None,
+        }
+
+    def states(self, names: List[str]) -> Dict[str, Dict[str, object]]:
+        """Return the breaker state of each name (closed, open or half_open) with its failure details."""
+        now = time.time()
+        return {name: self._describe(raw, now) for name, raw in self._load(names).items()}
+
+    def allowed(self, names: List[str]) -> List[str]:
+        """Return the names whose breaker is closed or ready for a probe, in order."""
+        return [name for name, s in self.states(names).items() if s["state"] != OPEN]
+
+    def record_success(self, name: str) -> None:
+        self._local.pop(name, None)
+        try:
+            get_redis().delete(self._key(name))
+        except Exception as e:
+            record_error(e)
+
+    def record_failure(self, name: str, error: str = "") -> None:
+        """Count a failed call and open the breaker once the threshold is reached."""
+        now = time.time()
+        local = self._local.setdefault(name, {})
+        local_failures = int(local.get("failures") or 0) + 1
+        try:
+            key = self._key(name)
+            pipe = get_redis().pipeline(transaction=True)
+            pipe.hincrby(key, "failures", 1)
+            pipe.hset(key, mapping={"last_error": error, "last_failure": now})
+            pipe.expire(key, STATE_EXPIRY)
+            failures = int(pipe.execute()[0])
+        except Exception as e:
+            record_error(e)
+            key = None
+            failures = local_failures
+
+        fields = {"failures": failures, "last_error": error, "last_failure": now}
+        if failures >= self.threshold:
+            fields["open_until"] = now + self._backoff(failures)
+        local.update(fields)
+        if key and "open_until" in fields:
+            try:
+                get_redis().hset(key, "open_until", fields["open_until"])
+            except Exception as e:
+                record_error(e)
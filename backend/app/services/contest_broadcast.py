@@ -0,0 +1,133 @@
+"""
+Per-worker fan-out of contest change events to live stream clients.
+
+One task per worker polls the change log and the clock every
+``CONTEST_STREAM_POLL_SECONDS`` and hands the resulting batch to every
+connected ``/api/contests/stream`` client through its own queue, so the
+Redis reads no longer grow with the number of open streams.
+
+A batch covers the window from the previous poll's position to its own.
+Clients keep their own position and skip the part of a batch they already
+delivered; a client whose position is older than the start of a batch
+(it resumed from an old event id, or joined while the task was starting)
+catches up with one poll of its own first. A client that falls too far
+behind, or any client when the log was reset or trimmed, is sent a fresh
+snapshot instead.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from typing import List, NamedTuple, Optional, Set, Tuple
+
+from ..core.config import settings
+from .contest_events import clock_events, latest_id, log_id_key, read_since
+from .contest_store import load_metas
+
+logger = logging.getLogger(__name__)
+
+# Batches a client may lag behind before it is sent a snapshot instead
+CLIENT_QUEUE_SIZE = 64
+
+
+class StreamBatch(NamedTuple):
+    """Events between two positions ``(log id, epoch)`` of the stream."""
+
+    since_log_id: str
+    since_tick: int
+    log_id: str
+    tick: int
+    changes: List[Tuple[str, str]] = []
+    clock: List[Tuple[int, str]] = []
+    reset: bool = False
+
+    def covers(self, log_id: str, tick: int) -> bool:
+        """Whether a client at ``(log_id, tick)`` misses nothing before this batch."""
+        return log_id_key(log_id) >= log_id_key(self.since_log_id) and tick >= self.since_tick
+
+    def events_after(self, log_id: str, tick: int) -> List[str]:
+        """Encoded events a client at ``(log_id, tick)`` has not been sent yet."""
+        after = log_id_key(log_id)
+        raw = [data for event_id, data in self.changes if log_id_key(event_id) > after]
+        return raw + [data for at, data in self.clock if at > tick]
+
+    def advance(self, log_id: str, tick: int) -> Tuple[str, int]:
+        """Position of a client at ``(log_id, tick)`` once this batch is delivered."""
+        return max(log_id, self.log_id, key=log_id_key), max(tick, self.tick)
+
+
+def collect(sources: List[str], log_id: str, tick: int) -> StreamBatch:
+    """Read the changes and clock transitions since ``(log_id, tick)``.
+
+    Uses the blocking Redis client: run it on a worker thread.
+    """
+    now = int(time.time())
+    changes = read_since(log_id)
+    if changes is None or any(json.loads(data)["type"] == "reset" for _, _, data in changes):
+        return StreamBatch(log_id, tick, latest_id(), now, reset=True)
+    # Change events are stored pre-encoded, so they are forwarded without re-serializing
+    selected = [(event_id, data) for event_id, source, data in changes if source in sources]
+    end_id = changes[-1][0] if changes else log_id
+    metas = load_metas(sources)
+    max_duration = max((meta or {}).get("max_duration", 0) for meta in metas.values())
+    clock = [(at, json.dumps(e)) for at, e in clock_events(sources, max_duration, tick, now)]
+    return StreamBatch(log_id, tick, end_id, now, selected, clock)
+
+
+class StreamBroadcaster:
+    """Polls the change log once per worker and fans batches out to subscribers."""
+
+    def __init__(self, sources: List[str]):
+        self.sources = list(sources)
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self) -> asyncio.Queue:
+        """Register a client; the poll task starts with the first one."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=CLIENT_QUEUE_SIZE)
+        self._subscribers.add(queue)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        """Drop a client; the poll task stops with the last one."""
+        self._subscribers.discard(queue)
+        if not self._subscribers and self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def _publish(self, batch: StreamBatch):
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(batch)
+            except asyncio.QueueFull:
+                # The client is this far behind: a snapshot is cheaper than the backlog
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(batch._replace(changes=[], clock=[], reset=True))
+
+    async def _run(self):
+        log_id, tick = await asyncio.to_thread(lambda: (latest_id(), int(time.time())))
+        # Empty polls are not sent, so the next batch starts where the last one sent ended
+        since = log_id, tick
+        while True:
+            await asyncio.sleep(settings.CONTEST_STREAM_POLL_SECONDS)
+            try:
+                batch = await asyncio.to_thread(collect, self.sources, log_id, tick)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Contest stream poll failed: {str(e)}")
+                continue
+            log_id, tick = batch.log_id, batch.tick
+            if batch.reset or batch.changes or batch.clock:
+                self._publish(batch._replace(since_log_id=since[0], since_tick=since[1]))
+                since = log_id, tick
+
+    def status(self):
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "subscribers": len(self._subscribers),
+        }
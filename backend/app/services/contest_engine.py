@@ -0,0 +1,112 @@
+"""
+Concurrent fan-out engine for the contest aggregator.
+
+Every platform fetcher is a blocking function built on the shared pooled
+HTTP session, so the engine runs them side by side on a bounded thread pool
+and waits on all of them from the event loop. Sources that miss the
+deadline are reported as timed out and the caller gets partial results,
+which makes the worst-case latency the slowest single source rather than
+the sum of all of them.
+
+A source whose fetch from an earlier call is still running (it missed that
+deadline) is reported as timed out again instead of being started twice,
+so stragglers never hold more than one thread per source and the pool
+cannot fill up with them.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Set
+
+from .contest_records import ContestRecord
+
+logger = logging.getLogger(__name__)
+
+Fetcher = Callable[[], List[ContestRecord]]
+
+# At most one thread per platform is ever busy (see _in_flight); the rest is headroom
+MAX_WORKERS = 8
+
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="contest-fetch")
+
+# Sources with a fetch running on the pool, including ones that missed their deadline
+_in_flight: Set[str] = set()
+_in_flight_lock = threading.Lock()
+
+
+@dataclass
+class FanOutResult:
+    results: Dict[str, List[ContestRecord]] = field(default_factory=dict)
+    timed_out: List[str] = field(default_factory=list)
+    failed: List[str] = field(default_factory=list)
+    timings: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def partial(self) -> bool:
+        return bool(self.timed_out or self.failed)
+
+
+def _timed(fn: Fetcher) -> Callable[[], tuple]:
+    def run():
+        started = time.perf_counter()
+        out = fn()
+        return out, time.perf_counter() - started
+    return run
+
+
+def _submit(name: str, fn: Fetcher) -> asyncio.Future:
+    future = _executor.submit(_timed(fn))
+
+    def finished(_):
+        # Runs when the fetch returns, raises or is cancelled before it started
+        with _in_flight_lock:
+            _in_flight.discard(name)
+
+    future.add_done_callback(finished)
+    return asyncio.wrap_future(future)
+
+
+async def gather_sources(fetchers: Dict[str, Fetcher], deadline: float) -> FanOutResult:
+    """Run all fetchers concurrently and collect whatever finishes before the deadline.
+
+    Args:
+        fetchers: Mapping of source name to a blocking fetch function
+        deadline: Seconds to wait for all sources before returning partial results
+
+    Returns:
+        FanOutResult with per-source contests, timed-out and failed sources
+    """
+    result = FanOutResult()
+    with _in_flight_lock:
+        busy = [name for name in fetchers if name in _in_flight]
+        started = [name for name in fetchers if name not in _in_flight]
+        _in_flight.update(started)
+    tasks = {_submit(name, fetchers[name]): name for name in started}
+    for name in busy:
+        # Still stuck in a fetch that missed an earlier deadline: don't start a second one
+        result.results[name] = []
+        result.timed_out.append(name)
+    done, pending = await asyncio.wait(tasks.keys(), timeout=deadline) if tasks else (set(), set())
+
+    for task in done:
+        name = tasks[task]
+        try:
+            contests, elapsed = task.result()
+            result.results[name] = contests or []
+            result.timings[name] = round(elapsed, 3)
+        except Exception as e:
+            logger.warning(f"Contest source {name} failed: {str(e)}")
+            result.results[name] = []
+            result.failed.append(name)
+    for task in pending:
+        # The worker thread keeps running until its own HTTP timeout; we just stop waiting
+        name = tasks[task]
+        result.results[name] = []
+        result.timed_out.append(name)
+    if result.timed_out:
+        logger.info(f"Contest sources missed the {deadline}s deadline: {', '.join(sorted(result.timed_out))}")
+    return result
@@ -0,0 +1,152 @@
+"""
+Change log and delta computation for the live contest stream.
+
+Whenever the refresher stores a new snapshot for a source, the difference
+from the previous snapshot (contests added, changed or removed) is appended
+to a capped Redis stream, already JSON-encoded. ``/api/contests/stream``
+replays that log from each client's last event id and adds the ``started``
+and ``ended`` transitions that happened on the clock since then, so a
+connected tracker only ever receives what changed.
+
+Event ids are ``<log id>:<epoch>``: the position in the change log and the
+time up to which clock transitions were delivered. A client whose id is
+older than the retained log (or unknown) is sent a full snapshot instead.
+
+When Redis is unreachable the log is kept in process, which still serves
+clients connected to the worker that ran the refresh.
+"""
+
+import json
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from ..db.redis_client import get_redis, record_error
+from .contest_records import ContestRecord
+from .contest_store import range_by_start
+
+EVENT_STREAM = "contest_events"
+
+# Retained change events; older cursors get a full snapshot on reconnect
+EVENT_LOG_MAXLEN = 2000
+
+# Only contests that can still appear in a response (recent_days is capped at 30) produce events
+EVENT_LOOKBACK_SECONDS = 30 * 24 * 60 * 60
+
+# Clients that were away longer than this get a snapshot rather than a replay
+MAX_RESUME_SECONDS = 60 * 60
+
+# (id, source, json) entries used while Redis is unreachable
+_local_log: Deque[Tuple[str, str, str]] = deque(maxlen=EVENT_LOG_MAXLEN)
+_local_seq = 0
+
+
+def log_id_key(log_id: str) -> Tuple[int, int]:
+    ms, _, seq = log_id.partition("-")
+    return int(ms), int(seq or 0)
+
+
+def diff_records(source: str, old: List[ContestRecord], new: List[ContestRecord]) -> List[Dict]:
+    """Return added/changed/removed events between two snapshots of a source, keyed by URL."""
+    horizon = int(time.time()) - EVENT_LOOKBACK_SECONDS
+    before = {r.url: r for r in old if r.end >= horizon}
+    after = {r.url: r for r in new if r.end >= horizon}
+    events = []
+    for url, record in after.items():
+        previous = before.get(url)
+        if previous is None:
+            events.append({"type": "added", "source": source, "contest": record.to_dict()})
+        elif previous != record:
+            events.append({"type": "changed", "source": source, "contest": record.to_dict()})
+    for url, record in before.items():
+        if url not in after:
+            events.append({"type": "removed", "source": source, "contest": record.to_dict()})
+    return events
+
+
+def publish(events: List[Dict]) -> Optional[str]:
+    """Append events to the change log and return the id of the last one."""
+    global _local_seq
+    if not events:
+        return None
+    encoded = [(e["source"], json.dumps(e, separators=(",", ":"))) for e in events]
+    try:
+        pipe = get_redis().pipeline(transaction=False)
+        for source, data in encoded:
+            pipe.xadd(EVENT_STREAM, {"source": source, "data": data}, maxlen=EVENT_LOG_MAXLEN, approximate=True)
+        return pipe.execute()[-1]
+    except Exception as e:
+        record_error(e)
+        ms = int(time.time() * 1000)
+        for source, data in encoded:
+            _local_seq += 1
+            _local_log.append((f"{ms}-{_local_seq}", source, data))
+        return _local_log[-1][0]
+
+
+def latest_id() -> str:
+    """Id of the newest change event, or ``0-0`` if the log is empty."""
+    try:
+        entries = get_redis().xrevrange(EVENT_STREAM, count=1)
+        return entries[0][0] if entries else "0-0"
+    except Exception as e:
+        record_error(e)
+        return _local_log[-1][0] if _local_log else "0-0"
+
+
+def read_since(log_id: str, count: int = 500) -> Optional[List[Tuple[str, str, str]]]:
+    """Return ``(id, source, json)`` change events newer than ``log_id``.
+
+    Returns None when events after ``log_id`` may already have been trimmed,
+    in which case the client needs a full snapshot.
+    """
+    after = log_id_key(log_id)
+    try:
+        redis = get_redis()
+        oldest = redis.xrange(EVENT_STREAM, count=1)
+        if oldest and log_id_key(oldest[0][0]) > after and log_id != "0-0":
+            return None
+        entries = redis.xrange(EVENT_STREAM, min=log_id, count=count + 1)
+        return [
+            (eid, fields["source"], fields["data"]) for eid, fields in entries if log_id_key(eid) > after
+        ][:count]
+    except Exception as e:
+        record_error(e)
+        if _local_log and log_id_key(_local_log[0][0]) > after and log_id != "0-0":
+            return None
+        return [entry for entry in _local_log if log_id_key(entry[0]) > after][:count]
+
+
+def clock_events(sources: List[str], max_duration: int, since: int, now: int) -> List[Tuple[int, Dict]]:
+    """Return ``(epoch, event)`` pairs of ``started`` and ``ended`` events for
+    contests whose start or end fell in (since, now]."""
+    if now <= since:
+        return []
+    events = []
+    window = range_by_start(sources, since - max_duration, now)
+    for source in sources:
+        for r in window.get(source, []):
+            if since < r.start <= now:
+                events.append((r.start, {"type": "started", "source": source, "contest": r.to_dict()}))
+            if since < r.end <= now:
+                events.append((r.end, {"type": "ended", "source": source, "contest": r.to_dict()}))
+    return events
+
+
+def format_cursor(log_id: str, tick: int) -> str:
+    return f"{log_id}:{tick}"
+
+
+def parse_cursor(cursor: Optional[str], now: int) -> Optional[Tuple[str, int]]:
+    """Split a client's last event id; None if missing, malformed or too old to resume."""
+    if not cursor:
+        return None
+    try:
+        log_id, _, tick = cursor.rpartition(":")
+        log_id_key(log_id)
+        tick = int(tick)
+    except ValueError:
+        return None
+    if now - tick > MAX_RESUME_SECONDS:
+        return None
+    return log_id, tick
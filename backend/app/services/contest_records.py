@@ -0,0 +1,87 @@
+"""
+Compact internal contest record.
+
+Fetchers build one ``ContestRecord`` per contest with the start time already
+converted to a UTC epoch, so the store, filters and sorts work on plain
+integers and nothing parses ISO strings again. The public JSON shape
+(``site``/``name``/``url``/``start_time``/``duration``) is produced only at
+the API edge by ``to_dict``.
+
+``contest_id`` is the platform's own id for the contest (Codeforces contest
+number, AtCoder/LeetCode slug, CodeChef code...). It is part of the stored
+member, so two contests that only differ by id never collapse into one
+entry of the sorted-set store.
+"""
+
+import json
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+
+class ContestRecord:
+    """A normalized contest with integer start epoch and duration (seconds)."""
+
+    __slots__ = ("site", "name", "url", "start", "duration", "contest_id")
+
+    def __init__(self, site: str, name: str, url: str, start: int, duration: int = 0, contest_id=None):
+        self.site = site
+        self.name = name
+        self.url = url
+        self.start = int(start)
+        self.duration = int(duration or 0)
+        self.contest_id = str(contest_id) if contest_id is not None else None
+
+    @property
+    def end(self) -> int:
+        return self.start + self.duration
+
+    @classmethod
+    def from_datetime(
+        cls, site: str, name: str, url: str, start: datetime, duration: int = 0, contest_id=None
+    ) -> "ContestRecord":
+        if start.tzinfo is None:
+            start = start.replace(tzinfo=timezone.utc)
+        return cls(site, name, url, int(start.timestamp()), duration, contest_id)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> Optional["ContestRecord"]:
+        """Build a record from the public JSON shape; returns None if start_time is unusable."""
+        try:
+            start = datetime.fromisoformat(str(data.get("start_time")).replace("Z", "+00:00"))
+            duration = int(float(data.get("duration", 0) or 0))
+        except Exception:
+            return None
+        return cls.from_datetime(data.get("site"), data.get("name"), data.get("url"), start, duration)
+
+    def to_dict(self) -> Dict:
+        return {
+            "site": self.site,
+            "name": self.name,
+            "url": self.url,
+            "start_time": datetime.fromtimestamp(self.start, tz=timezone.utc).isoformat(),
+            "duration": self.duration,
+        }
+
+    def pack(self) -> str:
+        """Serialize everything except the start, which is stored as the sorted-set score."""
+        return json.dumps([self.site, self.name, self.url, self.duration, self.contest_id], separators=(",", ":"))
+
+    @classmethod
+    def unpack(cls, member: str, start: int) -> "ContestRecord":
+        # Members stored before contest ids were added have four fields
+        site, name, url, duration, *rest = json.loads(member)
+        return cls(site, name, url, start, duration, rest[0] if rest else None)
+
+    def _key(self) -> tuple:
+        return (self.site, self.name, self.url, self.start, self.duration, self.contest_id)
+
+    def __eq__(self, other):
+        if not isinstance(other, ContestRecord):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def __repr__(self):
+        return f"ContestRecord({self.site!r}, {self.name!r}, start={self.start}, duration={self.duration})"
@@ -0,0 +1,231 @@
+"""
+Background refresher for contest snapshots.
+
+Runs inside the FastAPI lifespan and re-fetches every platform before its
+snapshot goes stale, so user requests are served from the last good
+snapshot instead of paying for the upstream scrape. Sources that another
+worker refreshed recently are skipped.
+
+Every fetch of a source goes through a cross-worker single-flight lock, so
+concurrent misses (cold start, ``refresh=true``, several workers'
+refreshers) trigger one upstream call per source; other callers wait for
+that result or keep serving the previous snapshot.
+
+Each stored snapshot's changes are published to the contest change log that
+feeds the live stream.
+
+Sources that keep failing are skipped by a per-source circuit breaker until
+their backoff elapses, so a dead upstream adds no latency to refreshes.
+
+Snapshots, locks and breaker state live in Redis behind the blocking client,
+so ``refresh`` runs those steps on worker threads and never waits on Redis
+from the event loop.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..core.config import settings
+from .circuit_breaker import CircuitBreaker
+from .contest_engine import FanOutResult, Fetcher, gather_sources
+from .contest_events import diff_records, publish
+from .contest_store import load_metas, load_records, save_snapshot, snapshot_age
+from .single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Forced refreshes (refresh=true) within this window reuse the snapshot just fetched
+MIN_FORCE_REFRESH_AGE = 30
+
+# How often waiters check whether the in-flight fetch has landed
+WAIT_POLL_SECONDS = 0.2
+
+
+class ContestRefresher:
+    """Periodically refreshes per-platform contest snapshots."""
+
+    def __init__(self):
+        self.fetchers: Dict[str, Fetcher] = {}
+        self.last_run: Optional[float] = None
+        self.last_result: Dict[str, object] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.locks = SingleFlight("contest_refresh_lock", ttl=int(settings.CONTEST_REFRESH_DEADLINE_SECONDS) + 5)
+        self.breaker = CircuitBreaker(
+            "contest_breaker",
+            threshold=settings.CONTEST_BREAKER_FAILURE_THRESHOLD,
+            base_backoff=settings.CONTEST_BREAKER_BASE_BACKOFF_SECONDS,
+            max_backoff=settings.CONTEST_BREAKER_MAX_BACKOFF_SECONDS,
+        )
+
+    def register(self, fetchers: Dict[str, Fetcher]):
+        self.fetchers = dict(fetchers)
+
+    def due_sources(self, sources: List[str], max_age: float) -> List[str]:
+        """Return the sources whose snapshot is missing or older than ``max_age`` seconds."""
+        metas = load_metas(sources)
+        due = []
+        for s in sources:
+            age = snapshot_age(metas[s])
+            if age is None or age >= max_age:
+                due.append(s)
+        return due
+
+    def _select(self, names: List[str], force: bool) -> Tuple[List[str], List[str]]:
+        """Split the due sources into those to fetch and those short-circuited by their breaker."""
+        if force:
+            names = self.due_sources(names, MIN_FORCE_REFRESH_AGE)
+        else:
+            # Refresh a little early so a snapshot never reaches the interval boundary
+            names = self.due_sources(names, settings.CONTEST_REFRESH_INTERVAL_SECONDS * 0.9)
+        if not names:
+            return [], []
+        allowed = self.breaker.allowed(names)
+        return allowed, [name for name in names if name not in allowed]
+
+    def _acquire(self, names: List[str]) -> Dict[str, str]:
+        tokens = {}
+        for name in names:
+            token = self.locks.acquire(name)
+            if token:
+                tokens[name] = token
+        return tokens
+
+    def _release(self, tokens: Dict[str, str]):
+        for name, token in tokens.items():
+            self.locks.release(name, token)
+
+    def _store(self, names: Iterable[str], result: FanOutResult) -> List[str]:
+        """Save the fetched snapshots, publish their changes and update the breakers."""
+        updated = []
+        for name in names:
+            if name in result.timed_out:
+                self.breaker.record_failure(name, "timed_out")
+                continue
+            if name in result.failed:
+                self.breaker.record_failure(name, "failed")
+                continue
+            # Fetchers raise on failure, so an empty list means the platform has no contests
+            contests = result.results.get(name) or []
+            previous = load_records(name)
+            save_snapshot(name, contests)
+            if previous is None:
+                publish([{"type": "reset", "source": name}])
+            else:
+                publish(diff_records(name, previous, contests))
+            updated.append(name)
+            self.breaker.record_success(name)
+        return updated
+
+    def _pending(self, sources: List[str], since: float) -> List[str]:
+        metas = load_metas(sources)
+        return [
+            s for s in sources
+            if (metas[s] or {}).get("fetched_at", 0) < since and self.locks.is_held(s)
+        ]
+
+    async def _wait_for(self, sources: List[str], since: float, deadline: float):
+        """Wait until another holder has stored a snapshot newer than ``since`` or released its lock."""
+        give_up = time.time() + deadline
+        pending = list(sources)
+        while pending and time.time() < give_up:
+            await asyncio.sleep(WAIT_POLL_SECONDS)
+            pending = await asyncio.to_thread(self._pending, pending, since)
+
+    async def refresh(
+        self,
+        sources: Optional[Iterable[str]] = None,
+        force: bool = False,
+        deadline: Optional[float] = None,
+        wait: bool = False,
+    ) -> List[str]:
+        """Fetch the given sources (default: all) and store their snapshots.
+
+        A fetch that fails or times out keeps the previous snapshot and counts
+        against the source's circuit breaker; an empty result is stored like
+        any other. Sources whose circuit breaker is open are skipped.
+
+        Sources whose lock is held elsewhere are not fetched again. With
+        ``wait`` the call blocks (up to the deadline) for that in-flight
+        fetch to land; without it the caller keeps the current snapshot.
+
+        Args:
+            sources: Source names to refresh
+            force: Refresh even if the snapshot is still fresh
+            deadline: Seconds to wait on upstreams (default: CONTEST_REFRESH_DEADLINE_SECONDS)
+            wait: Wait for fetches already in flight in other callers
+
+        Returns:
+            List of sources whose snapshot was updated by this call
+        """
+        deadline = deadline or settings.CONTEST_REFRESH_DEADLINE_SECONDS
+        names = [s for s in (sources or self.fetchers) if s in self.fetchers]
+        names, short_circuited = await asyncio.to_thread(self._select, names, force)
+        if not names:
+            if short_circuited:
+                self.last_result = {**self.last_result, "short_circuited": short_circuited}
+            return []
+
+        started = time.time()
+        tokens = await asyncio.to_thread(self._acquire, names)
+        in_flight = [name for name in names if name not in tokens]
+
+        updated = []
+        if tokens:
+            try:
+                result = await gather_sources(
+                    {name: self.fetchers[name] for name in tokens},
+                    deadline,
+                )
+                updated = await asyncio.to_thread(self._store, list(tokens), result)
+            finally:
+                await asyncio.to_thread(self._release, tokens)
+            self.last_run = time.time()
+            self.last_result = {
+                "updated": updated,
+                "timed_out": sorted(result.timed_out),
+                "failed": sorted(result.failed),
+                "timings": result.timings,
+                "coalesced": in_flight,
+                "short_circuited": short_circuited,
+            }
+        if in_flight and wait:
+            await self._wait_for(in_flight, started, deadline)
+        return updated
+
+    async def _run(self):
+        while True:
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Contest refresh failed: {str(e)}")
+            await asyncio.sleep(settings.CONTEST_REFRESH_CHECK_SECONDS)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def status(self) -> Dict[str, object]:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "last_run": self.last_run,
+            "last_result": self.last_result,
+            "breakers": self.breaker.states(list(self.fetchers)),
+        }
+
+
+# Create a shared refresher instance
+contest_refresher = ContestRefresher()
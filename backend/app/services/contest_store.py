@@ -0,0 +1,244 @@
+"""
+Per-platform normalized contest store.
+
+Each platform's last good contest list is stored once in Redis as a sorted
+set scored by start epoch, next to a small meta record (fetch time, count,
+longest duration). Running/upcoming/recent buckets for any query string are
+answered with one ``ZRANGEBYSCORE`` per source over that store, so no
+parameter combination needs its own cached response or an upstream call.
+Everything here works on ``ContestRecord`` integers; members are packed
+without the start time, which lives in the score.
+
+Decoded snapshots are also kept in the worker's local cache tier while its
+invalidation listener runs, so the meta and range reads behind every
+``/contests`` request and stream poll are answered in process. Saving a
+snapshot tells the other workers to drop their copy; they read the whole
+set back from Redis on their next miss.
+
+A process-local copy of every snapshot is kept so the API keeps serving
+when Redis is down.
+"""
+
+import bisect
+import json
+import time
+from typing import Dict, List, Optional
+
+from ..db.redis_client import get_redis, local_cache, local_tier_ready, publish_invalidation, record_error
+from .contest_records import ContestRecord
+
+STORE_KEY = "contest_store:{source}"
+META_KEY = "contest_store:{source}:meta"
+
+# Keep the last good snapshot around long after it goes stale
+SNAPSHOT_EXPIRY = 60 * 60 * 24 * 7
+
+DAY_SECONDS = 24 * 60 * 60
+
+# source -> {"starts": [...], "records": [...], "meta": {...}}, sorted by start
+_local_snapshots: Dict[str, Dict] = {}
+
+
+def save_snapshot(source: str, records: List[ContestRecord]) -> bool:
+    """Replace the stored contest list for a source.
+
+    Args:
+        source: Platform name (e.g. "codeforces")
+        records: Contest records produced by the platform fetcher
+
+    Returns:
+        bool: True if the snapshot reached Redis, False if only kept locally
+    """
+    records = sorted(records, key=lambda r: r.start)
+    meta = {
+        "fetched_at": time.time(),
+        "count": len(records),
+        "max_duration": max((r.duration for r in records), default=0),
+    }
+    snapshot = _snapshot(records, meta)
+    _local_snapshots[source] = snapshot
+
+    key = STORE_KEY.format(source=source)
+    tmp_key = f"{key}:tmp"
+    members = {r.pack(): r.start for r in records}
+    encoded_meta = json.dumps(meta)
+    try:
+        # Build the new set aside and swap it in so readers never see a half-written list
+        pipe = get_redis().pipeline(transaction=True)
+        pipe.delete(tmp_key)
+        if records:
+            pipe.zadd(tmp_key, members)
+            pipe.rename(tmp_key, key)
+            pipe.expire(key, SNAPSHOT_EXPIRY)
+        else:
+            pipe.delete(key)
+        pipe.setex(META_KEY.format(source=source), SNAPSHOT_EXPIRY, encoded_meta)
+        pipe.execute()
+    except Exception as e:
+        record_error(e)
+        local_cache.delete(key)
+        return False
+    publish_invalidation(key)
+    if local_tier_ready():
+        local_cache.set(key, snapshot, _snapshot_size(members, encoded_meta), SNAPSHOT_EXPIRY)
+    return True
+
+
+def _snapshot(records: List[ContestRecord], meta: Dict) -> Dict:
+    return {"starts": [r.start for r in records], "records": records, "meta": meta}
+
+
+def _snapshot_size(members, encoded_meta: str) -> int:
+    return sum(len(m) for m in members) + len(encoded_meta)
+
+
+def _cached_snapshots(sources: List[str]) -> Dict[str, Dict]:
+    """Snapshots of ``sources`` from the local tier, reading the missing ones from Redis.
+
+    Sources without a snapshot are left out. Raises if Redis can't be read.
+    """
+    found: Dict[str, Dict] = {}
+    missing = []
+    for s in sources:
+        hit, snapshot = local_cache.get(STORE_KEY.format(source=s))
+        if hit:
+            found[s] = snapshot
+        else:
+            missing.append(s)
+    if not missing:
+        return found
+    pipe = get_redis().pipeline(transaction=False)
+    for s in missing:
+        pipe.zrange(STORE_KEY.format(source=s), 0, -1, withscores=True)
+        pipe.get(META_KEY.format(source=s))
+    replies = pipe.execute()
+    for i, s in enumerate(missing):
+        members, encoded_meta = replies[2 * i], replies[2 * i + 1]
+        if not encoded_meta:
+            continue
+        records = [ContestRecord.unpack(member, int(score)) for member, score in members]
+        found[s] = _snapshot(records, json.loads(encoded_meta))
+        size = _snapshot_size((member for member, _ in members), encoded_meta)
+        local_cache.set(STORE_KEY.format(source=s), found[s], size, SNAPSHOT_EXPIRY)
+    return found
+
+
+def load_metas(sources: List[str]) -> Dict[str, Optional[Dict]]:
+    """Return the snapshot meta (fetched_at, count, max_duration) for each source, or None."""
+    try:
+        if local_tier_ready():
+            snapshots = _cached_snapshots(sources)
+            metas = {s: (snapshots[s]["meta"] if s in snapshots else None) for s in sources}
+        else:
+            raw = get_redis().mget([META_KEY.format(source=s) for s in sources])
+            metas = {s: (json.loads(v) if v else None) for s, v in zip(sources, raw)}
+    except Exception as e:
+        record_error(e)
+        metas = {s: None for s in sources}
+    for s in sources:
+        if metas[s] is None and s in _local_snapshots:
+            metas[s] = _local_snapshots[s]["meta"]
+    return metas
+
+
+def load_meta(source: str) -> Optional[Dict]:
+    return load_metas([source])[source]
+
+
+def snapshot_age(meta: Optional[Dict]) -> Optional[float]:
+    """Seconds since the snapshot was fetched, or None if there is no snapshot."""
+    if not meta:
+        return None
+    return max(0.0, time.time() - float(meta.get("fetched_at") or 0))
+
+
+def _local_range(snap: Optional[Dict], min_start: int, max_start: int) -> List[ContestRecord]:
+    if not snap:
+        return []
+    lo = bisect.bisect_left(snap["starts"], min_start)
+    hi = bisect.bisect_right(snap["starts"], max_start)
+    return snap["records"][lo:hi]
+
+
+def range_by_start(sources: List[str], min_start: int, max_start: int) -> Dict[str, List[ContestRecord]]:
+    """Return records per source with start in [min_start, max_start], ordered by start.
+
+    All sources are read in a single pipelined round trip, or none when the
+    local tier holds their snapshots.
+    """
+    try:
+        if local_tier_ready():
+            snapshots = _cached_snapshots(sources)
+            return {s: _local_range(snapshots.get(s), min_start, max_start) for s in sources}
+        pipe = get_redis().pipeline(transaction=False)
+        for s in sources:
+            pipe.zrangebyscore(STORE_KEY.format(source=s), min_start, max_start, withscores=True)
+        replies = pipe.execute()
+        return {
+            s: [ContestRecord.unpack(member, int(score)) for member, score in reply]
+            for s, reply in zip(sources, replies)
+        }
+    except Exception as e:
+        record_error(e)
+        return {s: _local_range(_local_snapshots.get(s), min_start, max_start) for s in sources}
+
+
+def load_records(source: str) -> Optional[List[ContestRecord]]:
+    """Return every stored record for a source, or None if it has no snapshot yet."""
+    if load_meta(source) is None:
+        return None
+    return range_by_start([source], float("-inf"), float("inf"))[source]
+
+
+def query_contests(
+    sources: List[str],
+    metas: Dict[str, Optional[Dict]],
+    days: int,
+    include_running: bool = True,
+    recent_days: Optional[int] = None,
+    now: Optional[int] = None,
+) -> Dict[str, List[ContestRecord]]:
+    """Bucket stored contests into running, upcoming and recent.
+
+    One start-epoch window covers all three buckets: it reaches back far
+    enough to catch the longest contest that could still be running (or have
+    ended within ``recent_days``) and forward ``days`` for upcoming ones.
+
+    Args:
+        sources: Platform names to read
+        metas: Snapshot metas from ``load_metas`` (for the longest duration)
+        days: Number of days to look ahead for upcoming contests
+        include_running: Whether to fill the running bucket
+        recent_days: Days to look back for finished contests, or None to skip
+        now: Reference epoch (default: current time)
+
+    Returns:
+        Dict with "running", "upcoming" and "recent" record lists
+    """
+    now = int(time.time()) if now is None else now
+    max_duration = max((m or {}).get("max_duration", 0) for m in metas.values()) if metas else 0
+    lookback = max_duration
+    if recent_days:
+        lookback += recent_days * DAY_SECONDS
+    elif not include_running:
+        lookback = 0
+    window = range_by_start(sources, now - lookback, now + days * DAY_SECONDS)
+
+    running: List[ContestRecord] = []
+    upcoming: List[ContestRecord] = []
+    recent: List[ContestRecord] = []
+    recent_limit = now - (recent_days or 0) * DAY_SECONDS
+    for s in sources:
+        for r in window.get(s, []):
+            end = r.end
+            if r.start >= now:
+                upcoming.append(r)
+            if include_running and r.start <= now <= end:
+                running.append(r)
+            if recent_days and recent_limit <= end <= now:
+                recent.append(r)
+
+    upcoming.sort(key=lambda r: r.start)
+    running.sort(key=lambda r: r.start)
+    recent.sort(key=lambda r: r.start, reverse=True)
+    return {"running": running, "upcoming": upcoming, "recent": recent}
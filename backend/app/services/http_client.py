@@ -0,0 +1,86 @@
+"""
+Shared pooled HTTP client for outbound calls to contest platforms.
+
+A single ``requests.Session`` keeps TCP/TLS connections alive between
+fetches, and its adapter pool is sized so every contest source can hold a
+connection at the same time when fetched concurrently.
+
+``conditional_get`` adds ETag/Last-Modified revalidation on top of it for
+large payloads that rarely change: the validators and the parsed payload
+are remembered per key, and a ``304 Not Modified`` reuses that payload
+without decoding the body again. The stored payload outlives the moment it
+was fetched, so ``parse`` must not depend on the current time; callers apply
+time windows to the returned value on every call.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Enough for every contest platform (plus fallbacks) to run concurrently
+POOL_CONNECTIONS = 16
+POOL_MAXSIZE = 16
+
+
+def _build_session() -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# Create a shared session instance
+http_session = _build_session()
+
+# key -> {"etag": ..., "last_modified": ..., "value": parsed payload}
+_conditional_cache: Dict[str, Dict[str, Any]] = {}
+_conditional_lock = threading.Lock()
+
+
+def get_http_session() -> requests.Session:
+    """Return the shared pooled HTTP session."""
+    return http_session
+
+
+def conditional_get(key: str, url: str, parse: Callable[[requests.Response], Any], **kwargs) -> Tuple[Any, bool]:
+    """GET ``url`` with stored validators and parse the body only when it changed.
+
+    Args:
+        key: Name the validators and parsed result are stored under (e.g. the source)
+        url: URL to fetch
+        parse: Turns a 200 response into the value to return and remember; must not
+            filter on the current time, as the value is reused for later 304s
+        **kwargs: Passed to ``requests.Session.get`` (timeout, params, headers...)
+
+    Returns:
+        (value, not_modified) where not_modified is True if the stored value was reused
+
+    Raises:
+        requests.HTTPError: For non-2xx responses other than a usable 304
+    """
+    with _conditional_lock:
+        entry = _conditional_cache.get(key)
+    headers = dict(kwargs.pop("headers", None) or {})
+    if entry:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+    r = http_session.get(url, headers=headers, **kwargs)
+    if r.status_code == 304 and entry:
+        return entry["value"], True
+    r.raise_for_status()
+
+    value = parse(r)
+    etag = r.headers.get("ETag")
+    last_modified = r.headers.get("Last-Modified")
+    with _conditional_lock:
+        if etag or last_modified:
+            _conditional_cache[key] = {"etag": etag, "last_modified": last_modified, "value": value}
+        else:
+            _conditional_cache.pop(key, None)
+    return value, False
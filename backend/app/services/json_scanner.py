@@ -0,0 +1,107 @@
+"""
+Iterative scanner for contest items inside scraped JSON payloads.
+
+Next.js pages (HackerEarth, Topcoder) embed their data in ``__NEXT_DATA__``
+with no stable schema, so the scrapers look for any dict that carries a
+title, a link and a start time. This module does that walk once for every
+platform:
+
+- an explicit stack instead of recursion, with a depth and node budget, so
+  a large or hostile payload cannot blow the stack or run unbounded;
+- per-platform ``ScanRule``s whose key paths are split once at import time;
+- pruning of subtrees under keys that never hold contests (translations,
+  build manifests, ...);
+- dedup by URL as items are found, so a repeated item is never built twice.
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .contest_records import ContestRecord
+
+DEFAULT_MAX_DEPTH = 32
+DEFAULT_MAX_NODES = 200_000
+
+Path = Tuple[str, ...]
+
+
+class ScanRule:
+    """How to recognise and build a contest from one dict in a payload.
+
+    Args:
+        fields: Field name -> dotted key paths tried in order; the first truthy value wins
+        required: Fields that must all be present for a dict to be a candidate
+        url: Builds the contest URL from the extracted fields (used for dedup)
+        build: Builds the record from the fields, URL and the dict itself; may return None
+        prune_keys: Keys whose subtrees are never descended into
+        max_depth: Deepest nesting level that is scanned
+    """
+
+    def __init__(
+        self,
+        fields: Dict[str, Sequence[str]],
+        required: Sequence[str],
+        url: Callable[[Dict[str, Any]], Optional[str]],
+        build: Callable[[Dict[str, Any], str, Dict], Optional[ContestRecord]],
+        prune_keys: Iterable[str] = (),
+        max_depth: int = DEFAULT_MAX_DEPTH,
+    ):
+        self.paths: Dict[str, List[Path]] = {
+            name: [tuple(p.split(".")) for p in paths] for name, paths in fields.items()
+        }
+        self.required = tuple(required)
+        self.url = url
+        self.build = build
+        self.prune_keys = frozenset(prune_keys)
+        self.max_depth = max_depth
+
+    def extract(self, obj: Dict) -> Dict[str, Any]:
+        out = {}
+        for name, paths in self.paths.items():
+            for path in paths:
+                value = obj
+                for key in path:
+                    value = value.get(key) if isinstance(value, dict) else None
+                    if value is None:
+                        break
+                if value:
+                    out[name] = value
+                    break
+        return out
+
+
+def scan_records(data: Any, rule: ScanRule, max_nodes: int = DEFAULT_MAX_NODES) -> List[ContestRecord]:
+    """Walk ``data`` depth-first and return the contests ``rule`` recognises, deduplicated by URL.
+
+    Items are returned in document order (the same order a recursive
+    pre-order walk would produce). The walk stops after ``max_nodes``
+    containers.
+    """
+    records: List[ContestRecord] = []
+    seen = set()
+    stack: List[Tuple[Any, int]] = [(data, 0)]
+    visited = 0
+    while stack and visited < max_nodes:
+        obj, depth = stack.pop()
+        visited += 1
+        if isinstance(obj, dict):
+            fields = rule.extract(obj)
+            if all(name in fields for name in rule.required):
+                try:
+                    url = rule.url(fields)
+                    if url and url not in seen:
+                        record = rule.build(fields, url, obj)
+                        if record is not None:
+                            seen.add(url)
+                            records.append(record)
+                except Exception:
+                    pass
+            if depth < rule.max_depth:
+                children = [
+                    v for k, v in obj.items()
+                    if k not in rule.prune_keys and isinstance(v, (dict, list))
+                ]
+                stack.extend((v, depth + 1) for v in reversed(children))
+        elif isinstance(obj, list) and depth < rule.max_depth:
+            children = [v for v in obj if isinstance(v, (dict, list))]
+            stack.extend((v, depth + 1) for v in reversed(children))
+    return records
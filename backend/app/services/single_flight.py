@@ -0,0 +1,69 @@
+"""
+Cross-worker single-flight locks.
+
+The first caller to miss takes a short Redis lock (``SET NX`` with a TTL)
+and does the expensive work; everyone else, in any uvicorn worker, sees the
+lock held and waits for that result instead of repeating it. The TTL
+bounds how long a crashed holder can block others. When Redis is
+unreachable the lock degrades to an in-process one, which still coalesces
+callers inside a single worker.
+"""
+
+import uuid
+from typing import Optional, Set
+
+from ..db.redis_client import get_redis, record_error
+
+# Delete the lock only if we still own it (it may have expired and been re-taken)
+_RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class SingleFlight:
+    """Named short-lived locks shared through Redis."""
+
+    def __init__(self, prefix: str, ttl: int):
+        self.prefix = prefix
+        self.ttl = ttl
+        self._local: Set[str] = set()
+
+    def _key(self, name: str) -> str:
+        return f"{self.prefix}:{name}"
+
+    def acquire(self, name: str, ttl: Optional[int] = None) -> Optional[str]:
+        """Try to take the lock for ``name``.
+
+        Returns:
+            An ownership token if the lock was taken, None if someone else holds it
+        """
+        token = uuid.uuid4().hex
+        try:
+            if get_redis().set(self._key(name), token, nx=True, ex=ttl or self.ttl):
+                return token
+            return None
+        except Exception as e:
+            record_error(e)
+            if name in self._local:
+                return None
+            self._local.add(name)
+            return f"local:{token}"
+
+    def release(self, name: str, token: str) -> None:
+        if token.startswith("local:"):
+            self._local.discard(name)
+            return
+        try:
+            get_redis().eval(_RELEASE_SCRIPT, 1, self._key(name), token)
+        except Exception as e:
+            record_error(e)
+
+    def is_held(self, name: str) -> bool:
+        try:
+            return bool(get_redis().exists(self._key(name)))
+        except Exception as e:
+            record_error(e)
+            return name in self._local
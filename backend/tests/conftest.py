@@ -1,3 +1,11 @@
+import os
+
+# Keep the contest refresher from scraping real platforms during tests
+os.environ.setdefault("CONTEST_REFRESH_ENABLED", "false")
+os.environ.setdefault("CACHE_WARMUP_ENABLED", "false")
+
+import fakeredis
+import fakeredis.aioredis
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
@@ -5,8 +13,10 @@ from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
 from app.main import app
-from app.db.database import Base, get_db
+from app.db import async_redis_client, redis_client
+from app.db.database import Base, get_db, get_read_db
 from app.models import User
+from app.services import contest_store
 from app.auth.password_utils import hash_password
 
 # In-memory SQLite for tests
@@ -27,6 +37,27 @@ def setup_db():
     Base.metadata.drop_all(bind=engine)
 
 
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """Point the shared sync and async Redis clients at one in-memory fake server (returned)."""
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(redis_client, "redis_client", fakeredis.FakeRedis(server=server, decode_responses=True))
+    monkeypatch.setattr(redis_client, "cache_client", fakeredis.FakeRedis(server=server))
+    monkeypatch.setattr(
+        async_redis_client, "async_redis_client", fakeredis.aioredis.FakeRedis(server=server, decode_responses=True)
+    )
+    monkeypatch.setattr(
+        async_redis_client, "async_cache", async_redis_client.AsyncCache(fakeredis.aioredis.FakeRedis(server=server))
+    )
+    monkeypatch.setattr(redis_client.redis_health, "healthy", True)
+    # No invalidation listener: every read goes to the fake server
+    monkeypatch.setattr(redis_client, "local_tier_ready", lambda: False)
+    monkeypatch.setattr(async_redis_client, "listener_start_due", lambda: False)
+    monkeypatch.setattr(contest_store, "local_tier_ready", lambda: False)
+    redis_client.local_cache.clear()
+    return server
+
+
 @pytest.fixture
 def client():
     """TestClient with overridden DB dependency."""
@@ -39,6 +70,7 @@ def client():
             db.close()
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
     with TestClient(app) as c:
         yield c
     app.dependency_overrides.clear()
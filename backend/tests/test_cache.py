@@ -0,0 +1,469 @@
+"""Tests for the cache tiers and value codecs."""
+
+import asyncio
+import json
+import threading
+import time
+
+import fakeredis
+import fakeredis.aioredis
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from redis.exceptions import ConnectionError as RedisConnectionError
+from sqlalchemy import text
+
+from app.db import async_redis_client, cache_tags, codecs, redis_client
+from app.db.async_redis_client import AsyncCache, SyncCache
+from app.db.local_cache import LocalCache
+from app.db.redis_health import RedisHealth
+from app.middleware.response_cache import cache_response, cached_response_key
+from app.models import AlgoComplexity, AlgoDifficulty, Algorithm, AlgorithmType, User
+from app.repositories import user_repo
+from app.routes import algorithm
+from app.schemas import UpdateName
+from app.services import cache_warmup, circuit_breaker, single_flight
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.single_flight import SingleFlight
+
+from .conftest import TestSession
+
+
+class TestLocalCache:
+    def test_lru_eviction_by_items(self):
+        cache = LocalCache(max_items=2, max_bytes=1000, ttl=60)
+        cache.set("a", 1, 1)
+        cache.set("b", 2, 1)
+        cache.get("a")
+        cache.set("c", 3, 1)
+        assert cache.get("b") == (False, None)
+        assert cache.get("a") == (True, 1)
+        assert cache.info()["evictions"] == 1
+
+    def test_byte_limit(self):
+        cache = LocalCache(max_items=10, max_bytes=10, ttl=60)
+        cache.set("a", "x", 6)
+        cache.set("b", "y", 6)
+        assert cache.get("a") == (False, None)
+        cache.set("huge", "z", 11)
+        assert cache.get("huge") == (False, None)
+        assert cache.info()["bytes"] == 6
+
+    def test_ttl_expiry(self):
+        cache = LocalCache(max_items=10, max_bytes=100, ttl=60)
+        cache.set("a", 1, 1, ttl=0.01)
+        time.sleep(0.02)
+        assert cache.get("a") == (False, None)
+        assert cache.info()["expirations"] == 1
+
+    def test_delete_counts_invalidation(self):
+        cache = LocalCache(max_items=10, max_bytes=100, ttl=60)
+        cache.set("a", 1, 1)
+        assert cache.delete("a") is True
+        assert cache.delete("a") is False
+        assert cache.info()["invalidations"] == 1
+
+
+class TestRedisHealth:
+    def test_outage_bypasses_until_probe(self):
+        health = RedisHealth(ping=lambda: True, interval=0.05)
+        assert health.available()
+
+        health.mark_failure(ConnectionError("refused"))
+        assert not health.healthy
+        assert not health.available()
+        assert health.bypassed == 1
+
+        time.sleep(0.06)
+        assert health.available()  # one probe per interval
+        assert not health.available()
+
+    def test_command_errors_keep_redis_healthy(self):
+        health = RedisHealth(ping=lambda: True, interval=5)
+        health.mark_failure(ValueError("WRONGTYPE"))
+        assert health.healthy
+
+    def test_check_recovers(self):
+        calls = []
+
+        def ping():
+            calls.append(1)
+            if len(calls) == 1:
+                raise ConnectionError("refused")
+
+        health = RedisHealth(ping=ping, interval=5)
+        assert not health.check()
+        assert health.check()
+        assert health.info()["ping"]["count"] == 1
+
+    def test_recovery_callbacks_run_once(self):
+        recovered = threading.Event()
+        calls = []
+        health = RedisHealth(ping=lambda: True, interval=5)
+        health.on_recovery(lambda: (calls.append(1), recovered.set()))
+
+        health.mark_success()
+        assert calls == []  # was never down
+
+        health.mark_failure(ConnectionError("refused"))
+        health.mark_success()
+        health.mark_success()
+        assert recovered.wait(1)
+        time.sleep(0.05)
+        assert calls == [1]
+
+
+class TestRedisErrors:
+    @pytest.fixture
+    def health(self, monkeypatch):
+        health = redis_client.redis_health
+        for attr in ("_probe_at", "last_error"):
+            monkeypatch.setattr(health, attr, getattr(health, attr))
+        monkeypatch.setattr(health, "healthy", True)
+        monkeypatch.setitem(redis_client.redis_stats, "errors", 0)
+        return health
+
+    def test_fallback_paths_record_errors(self, health, monkeypatch):
+        def refused():
+            raise RedisConnectionError("refused")
+
+        breaker = CircuitBreaker("test_breaker", threshold=1, base_backoff=60, max_backoff=600)
+        locks = SingleFlight("test_lock", ttl=5)
+        monkeypatch.setattr(circuit_breaker, "get_redis", refused)
+        monkeypatch.setattr(single_flight, "get_redis", refused)
+        monkeypatch.setattr(cache_tags, "get_redis", refused)
+
+        breaker.record_success("src")
+        locks.is_held("src")
+        cache_tags.tag_key("resp:k", ["t"], 60)
+        assert redis_client.redis_stats["errors"] == 3
+        assert not health.healthy
+
+    def test_bypass_is_not_an_error(self, health):
+        redis_client.record_error(redis_client.RedisUnavailable("Redis is marked unhealthy"))
+        assert redis_client.redis_stats["errors"] == 0
+        assert health.healthy
+
+
+class TestBulkCache:
+    def test_bypassed_while_redis_unhealthy(self, monkeypatch):
+        monkeypatch.setattr(redis_client.redis_health, "available", lambda: False)
+        assert redis_client.get_many_ttl(["a", "a", "b"]) == {"a": None, "b": None}
+        assert redis_client.delete_many(["a"]) == 0
+
+    def test_round_trip_through_binary_pool(self, fake_redis):
+        big = {"rows": [{"id": i, "name": f"algorithm {i}"} for i in range(500)]}
+        assert redis_client.set_cache("big", big, 60)
+        raw = fakeredis.FakeRedis(server=fake_redis).get("big")
+        assert raw[0] == codecs.MAGIC and len(raw) < len(json.dumps(big))
+        assert redis_client.get_cache("big") == big
+
+        assert redis_client.set_cache("a", [1], 60)
+        ttls = redis_client.get_many_ttl(["a", "missing"])
+        assert 0 < ttls["a"] <= 60 and ttls["missing"] is None
+        assert redis_client.delete_many(["a", "big", "missing"]) == 2
+        assert redis_client.get_cache("a") is None and redis_client.get_cache("big") is None
+
+    def test_empty_batches(self):
+        assert redis_client.get_many_ttl([]) == {}
+        assert redis_client.delete_many([]) == 0
+
+
+class TestAsyncCache:
+    @pytest.fixture
+    def no_listener(self, monkeypatch):
+        monkeypatch.setattr(async_redis_client, "local_tier_active", lambda: False)
+        monkeypatch.setattr(async_redis_client, "listener_start_due", lambda: False)
+
+    def test_round_trip_shared_with_sync_cache(self, fake_redis, no_listener):
+        value = {"items": list(range(50)), "name": "x" * 2000}
+
+        async def scenario():
+            cache = AsyncCache(fakeredis.aioredis.FakeRedis(server=fake_redis))
+            assert await cache.set("k", value, 60)
+            assert await cache.get("k") == value
+            assert 0 < await cache.ttl("k") <= 60
+            assert await cache.set("a", 1, 60)
+            assert await cache.delete("a")
+            assert await cache.get("a") is None
+
+        asyncio.run(scenario())
+        sync = SyncCache()
+        assert sync.get("k") == value
+        assert sync.get("a") is None
+        assert sync.set("c", {"n": 3}, 60)
+        assert sync.ttl("c") <= 60
+
+    def test_bypassed_while_redis_unhealthy(self, fake_redis, no_listener, monkeypatch):
+        monkeypatch.setattr(redis_client.redis_health, "available", lambda: False)
+
+        async def scenario():
+            cache = AsyncCache(fakeredis.aioredis.FakeRedis(server=fake_redis))
+            assert await cache.set("k", 1) is False
+            assert await cache.get("k") is None
+
+        asyncio.run(scenario())
+
+    def test_listener_start_runs_off_the_event_loop(self, fake_redis, monkeypatch):
+        started_on = []
+        monkeypatch.setattr(async_redis_client, "local_tier_active", lambda: False)
+        monkeypatch.setattr(async_redis_client, "listener_start_due", lambda: True)
+        monkeypatch.setattr(async_redis_client, "local_tier_ready", lambda: started_on.append(threading.get_ident()))
+
+        async def scenario():
+            cache = AsyncCache(fakeredis.aioredis.FakeRedis(server=fake_redis))
+            await cache.get("k")
+            return threading.get_ident()
+
+        loop_thread = asyncio.run(scenario())
+        assert started_on and loop_thread not in started_on
+
+
+class TestCodecs:
+    def test_round_trip_every_codec(self):
+        value = {"contests": [{"name": "Round %d" % i, "duration": 7200} for i in range(200)]}
+        for serializer in codecs.SERIALIZERS:
+            for compression in list(codecs.COMPRESSORS) + ["none"]:
+                data = codecs.encode(value, serializer, compression)
+                assert data[0] == codecs.MAGIC
+                assert codecs.decode(data) == value
+
+    def test_large_values_are_compressed(self):
+        value = ["same text"] * 1000
+        data = codecs.encode(value, "json", "zlib")
+        assert data[2] == codecs.COMPRESSION_IDS["zlib"]
+        assert len(data) < len(json.dumps(value))
+
+    def test_small_values_stay_uncompressed(self):
+        assert codecs.encode({"a": 1}, "json", "zlib")[2] == codecs.COMPRESSION_IDS["none"]
+
+    def test_legacy_json_values(self):
+        assert codecs.decode(b'{"a": [1, 2]}') == {"a": [1, 2]}
+
+    def test_unknown_codec(self):
+        with pytest.raises(codecs.CodecError):
+            codecs.decode(bytes((codecs.MAGIC, 99, 0)) + b"x")
+
+    @pytest.mark.parametrize("serializer", sorted(set(codecs.SERIALIZERS) & {"json", "orjson"}))
+    def test_int_keys_written_as_strings(self, serializer):
+        assert codecs.decode(codecs.encode({1: "a", "b": {2: 3}}, serializer, "none")) == {"1": "a", "b": {"2": 3}}
+
+    def test_concurrent_compression(self):
+        values = [["thread %d" % n] * 500 for n in range(8)]
+        results = {}
+
+        def run(n):
+            for _ in range(20):
+                results[n] = codecs.decode(codecs.encode(values[n], "json"))
+
+        threads = [threading.Thread(target=run, args=(n,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert [results[n] for n in range(8)] == values
+
+
+class TestResponseCache:
+    def test_etag_and_not_modified(self, client):
+        resp = client.get("/algo-type/")
+        assert resp.status_code == 200
+        assert resp.json() == []
+        etag = resp.headers["etag"]
+
+        resp = client.get("/algo-type/", headers={"If-None-Match": etag})
+        assert resp.status_code == 304
+        assert resp.headers["etag"] == etag
+
+    def test_not_modified_served_from_redis(self, client, fake_redis):
+        first = client.get("/algo-type/")
+        assert first.headers["x-cache"] == "MISS"
+        etag = first.headers["etag"]
+
+        second = client.get("/algo-type/")
+        assert second.headers["x-cache"] == "HIT" and second.headers["etag"] == etag
+        assert second.json() == first.json()
+
+        resp = client.get("/algo-type/", headers={"If-None-Match": etag})
+        assert resp.status_code == 304 and resp.headers["x-cache"] == "HIT"
+        assert resp.content == b""
+
+    def test_write_invalidates_cached_list(self, client, fake_redis, admin_headers):
+        assert client.get("/algo-type/").json() == []
+        assert client.get("/algo-type/").headers["x-cache"] == "HIT"
+        tagged = fakeredis.FakeRedis(server=fake_redis, decode_responses=True).smembers("cache_tag:algo_type:list")
+        assert len(tagged) == 1
+
+        resp = client.post("/algo-type/", json={"name": "Graphs", "description": "BFS, DFS"}, headers=admin_headers)
+        assert resp.status_code == 201
+        assert not fakeredis.FakeRedis(server=fake_redis).exists(*tagged)
+
+        resp = client.get("/algo-type/")
+        assert resp.headers["x-cache"] == "MISS"
+        assert [t["name"] for t in resp.json()] == ["Graphs"]
+
+    def test_async_handler_round_trip(self, fake_redis):
+        calls = []
+        demo = FastAPI()
+
+        @demo.get("/items")
+        @cache_response(ttl=60, namespace="demo", tags=["demo:list"])
+        async def items(request: Request):
+            calls.append(1)
+            return [len(calls)]
+
+        with TestClient(demo) as c:
+            assert c.get("/items").headers["x-cache"] == "MISS"
+            assert c.get("/items").json() == [1]
+            assert cache_tags.invalidate_tags("demo:list") == 1
+            resp = c.get("/items")
+        assert resp.headers["x-cache"] == "MISS" and resp.json() == [2]
+
+    @pytest.mark.parametrize("is_async", [False, True])
+    def test_entry_dropped_when_invalidated_while_building(self, fake_redis, is_async):
+        calls = []
+        demo = FastAPI()
+
+        def build():
+            calls.append(1)
+            if len(calls) == 1:
+                # A write commits after this read but before the entry is stored
+                cache_tags.invalidate_tags("demo:list")
+            return [len(calls)]
+
+        if is_async:
+            @demo.get("/items")
+            @cache_response(ttl=60, namespace="demo", tags=["demo:list"])
+            async def items(request: Request):
+                return build()
+        else:
+            @demo.get("/items")
+            @cache_response(ttl=60, namespace="demo", tags=["demo:list"])
+            def items(request: Request):
+                return build()
+
+        with TestClient(demo) as c:
+            first = c.get("/items")
+            second = c.get("/items")
+            third = c.get("/items")
+        assert first.headers["x-cache"] == "MISS" and first.json() == [1]
+        assert second.headers["x-cache"] == "MISS" and second.json() == [2]
+        assert third.headers["x-cache"] == "HIT" and third.json() == [2]
+
+    def test_query_params_are_part_of_the_key(self, client):
+        first = client.get("/algorithms/?skip=0&limit=5")
+        second = client.get("/algorithms/?limit=5&skip=0")
+        assert first.status_code == second.status_code == 200
+        assert first.headers["etag"] == second.headers["etag"]
+
+
+class TestCacheTags:
+    def test_tags_invalidated_after_commit(self, monkeypatch):
+        invalidated = []
+        monkeypatch.setattr(cache_tags, "invalidate_tags", lambda *tags: invalidated.append(tags))
+        db = TestSession()
+        try:
+            db.execute(text("SELECT 1"))
+            cache_tags.invalidate_on_commit(db, "algorithm:1", "algorithm:list")
+            assert invalidated == []
+            db.commit()
+            assert invalidated == [("algorithm:1", "algorithm:list")]
+        finally:
+            db.close()
+
+    def test_tags_discarded_on_rollback(self, monkeypatch):
+        invalidated = []
+        monkeypatch.setattr(cache_tags, "invalidate_tags", lambda *tags: invalidated.append(tags))
+        db = TestSession()
+        try:
+            db.execute(text("SELECT 1"))
+            cache_tags.invalidate_on_commit(db, "blog:list")
+            db.rollback()
+            db.commit()
+            assert invalidated == []
+        finally:
+            db.close()
+
+
+    def test_failed_invalidation_retried_on_recovery(self, fake_redis, monkeypatch):
+        fake = fakeredis.FakeRedis(server=fake_redis, decode_responses=True)
+        fake.set("resp:blogs:list", "cached")
+        fake.sadd("cache_tag:blog:list", "resp:blogs:list")
+        monkeypatch.setattr(cache_tags, "record_error", lambda e: None)
+        monkeypatch.setattr(cache_tags, "_failed_tags", set())
+
+        def unavailable():
+            raise redis_client.RedisUnavailable("Redis is marked unhealthy")
+
+        monkeypatch.setattr(cache_tags, "get_redis", unavailable)
+        assert cache_tags.invalidate_tags("blog:list") == 0
+        assert cache_tags._failed_tags == {"blog:list"}
+        assert fake.exists("resp:blogs:list")
+
+        monkeypatch.setattr(cache_tags, "get_redis", redis_client.get_redis)
+        assert cache_tags.retry_failed_invalidations() == 1
+        assert not fake.exists("resp:blogs:list")
+        assert cache_tags._failed_tags == set()
+        assert cache_tags.retry_failed_invalidations() == 0
+
+    def test_rename_and_delete_invalidate_blog_lists(self, monkeypatch):
+        invalidated = []
+        monkeypatch.setattr(cache_tags, "invalidate_tags", lambda *tags: invalidated.append(tags))
+        db = TestSession()
+        try:
+            user = User(name="Author", email="author@example.com", password="x", is_verified=True)
+            db.add(user)
+            db.commit()
+            invalidated.clear()
+
+            user_repo.update_name(db, user.id, UpdateName(name="Author"))
+            assert invalidated == []
+            user_repo.update_name(db, user.id, UpdateName(name="Renamed"))
+            assert invalidated == [("blog:list",)]
+            user_repo.delete_user(db, user.id)
+            assert invalidated == [("blog:list",), ("blog:list",)]
+        finally:
+            db.close()
+
+
+class TestCacheWarmup:
+    def test_warms_catalog_responses(self, monkeypatch):
+        monkeypatch.setattr(cache_warmup, "SessionLocal", TestSession)
+        datasets = {}
+        complete = cache_warmup.CacheWarmup().warm_catalog(time.monotonic() + 5, datasets)
+        assert complete
+        assert datasets["algo_types"]["warmed"] + datasets["algo_types"]["cached"] == 1
+        assert datasets["algorithms"]["warmed"] + datasets["algorithms"]["cached"] == 1
+
+    def test_skips_per_algorithm_entries_already_cached(self, fake_redis, monkeypatch):
+        monkeypatch.setattr(cache_warmup, "SessionLocal", TestSession)
+        db = TestSession()
+        algo_type = AlgorithmType(name="Graphs", description="g")
+        db.add(algo_type)
+        db.flush()
+        algo = Algorithm(
+            name="BFS",
+            type_id=algo_type.id,
+            description="Breadth-first search",
+            difficulty=AlgoDifficulty.easy,
+            complexity=list(AlgoComplexity)[0],
+            explanation="long explanation",
+            code="def bfs(): ...",
+        )
+        db.add(algo)
+        db.commit()
+        algo_id = algo.id
+        db.close()
+        redis_client.set_cache(cached_response_key(algorithm.get_algorithm, f"/algorithms/{algo_id}"), {"etag": '"x"', "body": "{}"}, 60)
+
+        datasets = {}
+        assert cache_warmup.CacheWarmup().warm_catalog(time.monotonic() + 5, datasets)
+        assert datasets["algorithm_details"] == {"warmed": 0, "cached": 1}
+        assert datasets["related_problems"] == {"warmed": 1, "cached": 0}
+        key = cached_response_key(algorithm.get_algorithm_related_problems, f"/algorithms/{algo_id}/related-problems")
+        assert redis_client.get_cache(key) is not None
+
+    def test_warmed_list_is_hit_by_clients(self, client, fake_redis, monkeypatch):
+        monkeypatch.setattr(cache_warmup, "SessionLocal", TestSession)
+        assert cache_warmup.CacheWarmup().warm_catalog(time.monotonic() + 5, {})
+        assert client.get("/algorithms/?skip=0&limit=5").headers["x-cache"] == "HIT"
@@ -0,0 +1,422 @@
+"""Tests for the contest aggregator helpers."""
+
+import asyncio
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import fakeredis
+import pytest
+
+from app.core.config import settings
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.contest_broadcast import StreamBatch, StreamBroadcaster, collect
+from app.services.contest_engine import gather_sources
+from app.services.contest_events import diff_records, format_cursor, parse_cursor, publish
+from app.services.contest_records import ContestRecord
+from app.db import redis_client
+from app.db.redis_client import redis_health
+from app.routes import contests
+from app.services import contest_broadcast, contest_store, http_client
+from app.services.contest_refresher import ContestRefresher
+from app.services.contest_store import load_metas, query_contests, save_snapshot
+from app.routes.contests import AGGREGATED_SOURCES, HACKEREARTH_SCAN_RULE, TOPCODER_SCAN_RULE
+from app.services.html_extract import extract_next_data, extract_tables, find_next_data, parse_stats
+from app.services.json_scanner import scan_records
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+HOUR = 60 * 60
+DAY = 24 * HOUR
+
+
+class TestContestRecord:
+    def test_from_dict_parses_start_once(self):
+        record = ContestRecord.from_dict({
+            "site": "Codeforces",
+            "name": "Round 1",
+            "url": "https://codeforces.com/contest/1",
+            "start_time": "2030-01-01T10:00:00Z",
+            "duration": "7200",
+        })
+        assert record.start == 1893492000
+        assert record.end == record.start + 7200
+
+    def test_to_dict_round_trip(self):
+        record = ContestRecord("AtCoder", "ABC 1", "https://atcoder.jp/contests/abc1", 1893492000, 6000)
+        assert ContestRecord.from_dict(record.to_dict()) == record
+
+    def test_pack_excludes_start(self):
+        record = ContestRecord(
+            "LeetCode", "Weekly 1", "https://leetcode.com/contest/weekly-1", 1893492000, 5400, "weekly-1"
+        )
+        assert ContestRecord.unpack(record.pack(), record.start) == record
+        assert ContestRecord.unpack(record.pack(), record.start).contest_id == "weekly-1"
+
+    def test_contest_id_keeps_members_distinct(self):
+        # Same name, listing URL and length: only the platform id tells them apart
+        first = ContestRecord("HackerEarth", "Monthly Circuits", "https://www.hackerearth.com/challenges/", 1, 3600, 101)
+        second = ContestRecord("HackerEarth", "Monthly Circuits", "https://www.hackerearth.com/challenges/", 2, 3600, 102)
+        assert first.pack() != second.pack()
+
+    def test_unpack_members_without_contest_id(self):
+        member = json.dumps(["Codeforces", "Round 1", "https://codeforces.com/contest/1", 7200])
+        record = ContestRecord.unpack(member, 1893492000)
+        assert record.contest_id is None and record.duration == 7200
+
+    def test_invalid_start_time(self):
+        assert ContestRecord.from_dict({"start_time": "not a date"}) is None
+
+    def test_equal_records_hash_alike(self):
+        a = ContestRecord("T", "Round", "u", 1893492000, HOUR, contest_id=7)
+        b = ContestRecord("T", "Round", "u", 1893492000, HOUR, contest_id="7")
+        assert a == b and len({a, b}) == 1
+        assert len({a, ContestRecord("T", "Round", "u", 1893492000, HOUR, contest_id=8)}) == 2
+
+
+class TestQueryContests:
+    def test_buckets(self):
+        now = int(time.time())
+        records = [
+            ContestRecord("T", "upcoming", "u1", now + DAY, HOUR),
+            ContestRecord("T", "too far", "u2", now + 30 * DAY, HOUR),
+            ContestRecord("T", "running", "u3", now - 10 * 60, HOUR),
+            ContestRecord("T", "recent", "u4", now - 2 * DAY, HOUR),
+            ContestRecord("T", "old", "u5", now - 20 * DAY, HOUR),
+        ]
+        save_snapshot("test-source", records)
+        metas = load_metas(["test-source"])
+        assert metas["test-source"]["count"] == 5
+
+        buckets = query_contests(["test-source"], metas, days=7, recent_days=7, now=now)
+        assert [r.name for r in buckets["upcoming"]] == ["upcoming"]
+        assert [r.name for r in buckets["running"]] == ["running"]
+        assert [r.name for r in buckets["recent"]] == ["recent"]
+
+    def test_running_and_recent_excluded(self):
+        now = int(time.time())
+        save_snapshot("test-source", [ContestRecord("T", "running", "u1", now - 60, HOUR)])
+        metas = load_metas(["test-source"])
+        buckets = query_contests(["test-source"], metas, days=7, include_running=False, now=now)
+        assert buckets == {"running": [], "upcoming": [], "recent": []}
+
+
+class TestContestStoreInRedis:
+    def test_sorted_set_round_trip(self, fake_redis, monkeypatch):
+        monkeypatch.setattr(contest_store, "_local_snapshots", {})
+        now = int(time.time())
+        records = [
+            ContestRecord("T", "later", "u2", now + 3 * DAY, HOUR),
+            ContestRecord("T", "soon", "u1", now + DAY, 2 * HOUR),
+            ContestRecord("T", "past", "u0", now - 3 * DAY, HOUR),
+        ]
+        assert save_snapshot("test-source", records)
+        stored = fakeredis.FakeRedis(server=fake_redis).zrange("contest_store:test-source", 0, -1, withscores=True)
+        assert [score for _, score in stored] == [now - 3 * DAY, now + DAY, now + 3 * DAY]
+
+        # Read back from Redis, not the process-local copy
+        contest_store._local_snapshots.clear()
+        assert contest_store.load_records("test-source") == sorted(records, key=lambda r: r.start)
+        window = contest_store.range_by_start(["test-source"], now, now + 2 * DAY)
+        assert [r.name for r in window["test-source"]] == ["soon"]
+        metas = load_metas(["test-source"])
+        assert metas["test-source"]["count"] == 3 and metas["test-source"]["max_duration"] == 2 * HOUR
+        buckets = query_contests(["test-source"], metas, days=7, recent_days=7, now=now)
+        assert [r.name for r in buckets["upcoming"]] == ["soon", "later"]
+        assert [r.name for r in buckets["recent"]] == ["past"]
+
+        # Distinct contests sharing name, URL and length are all kept
+        repeats = [ContestRecord("T", "weekly", "u", now + i * DAY, HOUR, contest_id=i) for i in range(1, 4)]
+        assert save_snapshot("test-source", repeats)
+        contest_store._local_snapshots.clear()
+        assert contest_store.load_records("test-source") == repeats
+
+        assert save_snapshot("test-source", [])
+        assert not fakeredis.FakeRedis(server=fake_redis).exists("contest_store:test-source")
+        assert contest_store.load_records("test-source") == []
+
+
+    def test_local_tier_serves_snapshots_until_invalidated(self, fake_redis, monkeypatch):
+        monkeypatch.setattr(contest_store, "_local_snapshots", {})
+        monkeypatch.setattr(contest_store, "local_tier_ready", lambda: True)
+        now = int(time.time())
+        soon = ContestRecord("T", "soon", "u1", now + DAY, HOUR)
+        assert save_snapshot("test-source", [soon])
+        # Another worker's copy: read back from Redis once, then served locally
+        redis_client.local_cache.clear()
+        assert load_metas(["test-source"])["test-source"]["count"] == 1
+
+        reads = []
+        monkeypatch.setattr(contest_store, "get_redis", lambda: reads.append(1) or redis_client.get_redis())
+        assert load_metas(["test-source"])["test-source"]["count"] == 1
+        assert contest_store.range_by_start(["test-source"], now, now + 2 * DAY)["test-source"] == [soon]
+        assert reads == []
+
+        # A save elsewhere publishes an invalidation for the store key
+        later = ContestRecord("T", "later", "u2", now + 2 * DAY, HOUR)
+        fakeredis.FakeRedis(server=fake_redis).zadd("contest_store:test-source", {later.pack(): later.start})
+        redis_client._on_invalidate({"data": "other-worker|contest_store:test-source"})
+        window = contest_store.range_by_start(["test-source"], now, now + 3 * DAY)["test-source"]
+        assert [r.name for r in window] == ["soon", "later"] and reads == [1]
+
+
+class TestContestRoutesWithoutRedis:
+    @pytest.fixture
+    def redis_down(self, monkeypatch):
+        monkeypatch.setattr(contest_store, "_local_snapshots", {})
+        monkeypatch.setattr(redis_health, "healthy", False)
+        monkeypatch.setattr(redis_health, "_probe_at", float("inf"))
+
+    def test_served_from_local_snapshots(self, client, redis_down):
+        now = int(time.time())
+        for source in AGGREGATED_SOURCES:
+            assert not save_snapshot(source, [ContestRecord(source, f"{source} round", f"u-{source}", now + DAY, HOUR)])
+
+        resp = client.get("/api/contests")
+        assert resp.status_code == 200
+        assert len(resp.json()["upcoming"]) == len(AGGREGATED_SOURCES)
+
+        resp = client.get("/api/contests/codeforces")
+        assert resp.status_code == 200
+        assert [c["name"] for c in resp.json()["upcoming"]] == ["codeforces round"]
+
+
+class TestRefresherOutcomes:
+    def test_failures_trip_the_breaker_but_empty_results_do_not(self, fake_redis, monkeypatch):
+        monkeypatch.setattr(contest_store, "_local_snapshots", {})
+        record = ContestRecord("Codeforces", "Round 1", "https://codeforces.com/contest/1", int(time.time()) + 3600, 7200)
+
+        def broken():
+            raise ValueError("HTTP 503")
+
+        refresher = ContestRefresher()
+        refresher.register({"codeforces": lambda: [record], "topcoder": lambda: [], "leetcode": broken})
+        updated = asyncio.run(refresher.refresh(deadline=5))
+
+        assert sorted(updated) == ["codeforces", "topcoder"]
+        assert refresher.last_result["failed"] == ["leetcode"]
+        states = refresher.breaker.states(["codeforces", "topcoder", "leetcode"])
+        assert states["topcoder"]["failures"] == 0
+        assert states["leetcode"]["failures"] == 1
+        assert states["leetcode"]["last_error"] == "failed"
+        metas = load_metas(["topcoder", "leetcode"])
+        assert metas["topcoder"]["count"] == 0
+        assert metas["leetcode"] is None
+
+    def test_fetchers_raise_instead_of_returning_nothing(self, monkeypatch):
+        def unreachable(*args, **kwargs):
+            raise ConnectionError("unreachable")
+
+        monkeypatch.setattr(contests.http, "get", unreachable)
+        monkeypatch.setattr(contests.http, "post", unreachable)
+        monkeypatch.setattr(http_client.http_session, "get", unreachable)
+        monkeypatch.setattr(http_client, "_conditional_cache", {})
+        for name, fetch in contests.SOURCE_FETCHERS.items():
+            with pytest.raises(Exception):
+                fetch()
+            assert contests.last_fetch_stats[name]["ok"] is False, name
+
+
+class TestFanOut:
+    def test_straggler_is_not_started_twice(self):
+        release = threading.Event()
+        calls = []
+
+        def slow():
+            calls.append(1)
+            release.wait(5)
+            return []
+
+        first = asyncio.run(gather_sources({"slow-source": slow}, deadline=0.05))
+        second = asyncio.run(gather_sources({"slow-source": slow}, deadline=0.05))
+        assert first.timed_out == second.timed_out == ["slow-source"]
+        assert len(calls) == 1
+
+        release.set()
+        deadline = time.monotonic() + 5
+        while asyncio.run(gather_sources({"slow-source": slow}, deadline=1)).timed_out and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert len(calls) == 2
+
+
+class TestKenkooooRevalidation:
+    class FakeResponse:
+        def __init__(self, status_code, payload=None, etag=None):
+            self.status_code = status_code
+            self.payload = payload
+            self.headers = {"ETag": etag} if etag else {}
+
+        def json(self):
+            return self.payload
+
+        def raise_for_status(self):
+            pass
+
+    def test_not_modified_reapplies_time_window(self, monkeypatch):
+        now = datetime.now(timezone.utc)
+        soon, later = now + timedelta(minutes=5), now + timedelta(days=10)
+        payload = [
+            {"id": "abc400", "title": "ABC 400", "start_epoch_second": int(soon.timestamp()), "duration_second": 6000},
+            {"id": "arc200", "title": "ARC 200", "start_epoch_second": int(later.timestamp()), "duration_second": 7200},
+        ]
+        replies = iter([self.FakeResponse(200, payload, etag='"v1"'), self.FakeResponse(304)])
+        sent = []
+
+        def fake_get(url, headers=None, **kwargs):
+            sent.append(headers)
+            return next(replies)
+
+        monkeypatch.setattr(http_client.http_session, "get", fake_get)
+        monkeypatch.setattr(http_client, "_conditional_cache", {})
+        assert [c.name for c in contests.fetch_atcoder_kenkoooo()] == ["ABC 400", "ARC 200"]
+
+        class Later(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return now + timedelta(hours=1)
+
+        monkeypatch.setattr(contests, "datetime", Later)
+        assert [c.name for c in contests.fetch_atcoder_kenkoooo()] == ["ARC 200"]
+        assert sent[1]["If-None-Match"] == '"v1"'
+        assert contests.last_fetch_stats["atcoder"]["not_modified"] is True
+
+
+class TestHtmlExtract:
+    PAGE = (
+        b'<html><head><title>__NEXT_DATA__ in text</title></head><body>'
+        b'<p>mentions __NEXT_DATA__ too</p>'
+        b'<script id="__NEXT_DATA__" type="application/json">{"props": {"items": [1, 2]}}</script>'
+        b'</body></html>'
+    )
+
+    def test_fast_path(self):
+        assert find_next_data(self.PAGE) == b'{"props": {"items": [1, 2]}}'
+        assert extract_next_data("test", self.PAGE) == {"props": {"items": [1, 2]}}
+        assert parse_stats["test"]["method"] == "fast"
+
+    def test_missing_payload(self):
+        assert extract_next_data("test", b"<html><body>nothing</body></html>") is None
+        assert parse_stats["test"]["method"] == "none"
+
+    def test_tables_only(self):
+        page = "<html><nav>menu</nav><table><tr><td>a</td></tr></table><footer>x</footer></html>"
+        soup = extract_tables("test", page)
+        assert soup.find("td").get_text() == "a"
+        assert soup.find("nav") is None
+
+
+def load_fixture(name):
+    return json.loads((FIXTURES / name).read_text())
+
+
+class TestJsonScanner:
+    def test_hackerearth_fixture(self):
+        records = scan_records(load_fixture("hackerearth_next_data.json"), HACKEREARTH_SCAN_RULE)
+        assert [(r.name, r.url, r.duration) for r in records] == [
+            ("Live Hiring Challenge", "https://www.hackerearth.com/challenges/hiring/live-1/", 7200),
+            ("Upcoming Circuit", "https://www.hackerearth.com/challenges/competitive/circuit-1/", 5400),
+            ("Open Ended", "https://www.hackerearth.com/challenges/open-ended", 7200),
+        ]
+        assert records[1].start == 1893578400
+
+    def test_topcoder_fixture(self):
+        records = scan_records(load_fixture("topcoder_next_data.json"), TOPCODER_SCAN_RULE)
+        assert [(r.name, r.url) for r in records] == [
+            ("Active Marathon", "https://www.topcoder.com/challenges/tc-1"),
+            ("Upcoming SRM", "https://www.topcoder.com/challenges/tc-2"),
+        ]
+        assert records[1].duration == 90 * 60
+
+    def test_deep_nesting_is_bounded(self):
+        data = {"title": "x", "url": "/x", "start_time": 1893492000}
+        for _ in range(5000):
+            data = {"child": data}
+        assert scan_records(data, HACKEREARTH_SCAN_RULE) == []
+
+
+class TestCircuitBreaker:
+    def test_opens_after_threshold(self):
+        breaker = CircuitBreaker("test_breaker", threshold=2, base_backoff=60, max_backoff=600)
+        breaker.record_success("src")
+        breaker.record_failure("src", "timed_out")
+        assert breaker.allowed(["src"]) == ["src"]
+        breaker.record_failure("src", "timed_out")
+        assert breaker.allowed(["src"]) == []
+        assert breaker.states(["src"])["src"]["state"] == "open"
+
+    def test_success_closes(self):
+        breaker = CircuitBreaker("test_breaker", threshold=1, base_backoff=60, max_backoff=600)
+        breaker.record_failure("other", "empty")
+        breaker.record_success("other")
+        assert breaker.states(["other"])["other"]["state"] == "closed"
+
+
+class TestContestEvents:
+    def test_diff_records(self):
+        now = int(time.time())
+        old = [
+            ContestRecord("T", "kept", "u1", now + DAY, HOUR),
+            ContestRecord("T", "renamed", "u2", now + DAY, HOUR),
+            ContestRecord("T", "cancelled", "u3", now + DAY, HOUR),
+        ]
+        new = [
+            ContestRecord("T", "kept", "u1", now + DAY, HOUR),
+            ContestRecord("T", "renamed again", "u2", now + DAY, HOUR),
+            ContestRecord("T", "new", "u4", now + 2 * DAY, HOUR),
+        ]
+        events = {(e["type"], e["contest"]["url"]) for e in diff_records("t", old, new)}
+        assert events == {("changed", "u2"), ("added", "u4"), ("removed", "u3")}
+
+    def test_cursor_round_trip(self):
+        now = int(time.time())
+        assert parse_cursor(format_cursor("1700000000000-3", now), now) == ("1700000000000-3", now)
+        assert parse_cursor(format_cursor("1700000000000-3", now - DAY), now) is None
+        assert parse_cursor("garbage", now) is None
+
+
+class TestStreamBroadcaster:
+    def test_reset_events_trigger_a_snapshot(self, fake_redis, monkeypatch):
+        monkeypatch.setattr(contest_store, "_local_snapshots", {})
+        now = int(time.time())
+        record = ContestRecord("Codeforces", "reset", "u1", now + DAY, HOUR)
+        start = publish([{"type": "added", "source": "codeforces", "contest": record.to_dict()}])
+        batch = collect(["codeforces"], "0-0", now)
+        assert not batch.reset and batch.log_id == start and len(batch.changes) == 1
+
+        end = publish([{"type": "reset", "source": "codeforces"}])
+        batch = collect(["codeforces"], start, now)
+        assert batch.reset and batch.log_id == end
+
+    def test_clients_skip_what_they_already_have(self):
+        batch = StreamBatch("1-0", 100, "3-0", 110, [("2-0", "a"), ("3-0", "b")], [(105, "c"), (110, "d")])
+        assert batch.covers("1-0", 100) and batch.covers("2-0", 105)
+        assert not batch.covers("0-5", 100) and not batch.covers("1-0", 90)
+        assert batch.events_after("1-0", 100) == ["a", "b", "c", "d"]
+        assert batch.events_after("2-0", 105) == ["b", "d"]
+        assert batch.advance("2-0", 120) == ("3-0", 120)
+
+    def test_one_poll_feeds_every_subscriber(self, monkeypatch):
+        polls = []
+
+        def fake_collect(sources, log_id, tick):
+            polls.append(log_id)
+            return StreamBatch(log_id, tick, "5-0", tick + 1, [("5-0", '{"type":"added"}')])
+
+        monkeypatch.setattr(contest_broadcast, "collect", fake_collect)
+        monkeypatch.setattr(contest_broadcast, "latest_id", lambda: "4-0")
+        monkeypatch.setattr(settings, "CONTEST_STREAM_POLL_SECONDS", 0)
+        broadcaster = StreamBroadcaster(["codeforces"])
+
+        async def run():
+            first, second = broadcaster.subscribe(), broadcaster.subscribe()
+            batches = [await first.get(), await second.get()]
+            broadcaster.unsubscribe(first)
+            broadcaster.unsubscribe(second)
+            return batches
+
+        first, second = asyncio.run(run())
+        assert first is second and first.since_log_id == "4-0"
+        assert polls[0] == "4-0"
+        assert broadcaster.status() == {"running": False, "subscribers": 0}
@@ -0,0 +1,411 @@
+"""Tests for the database engine configuration."""
+
+import asyncio
+import inspect
+import itertools
+import re
+import time
+
+import pytest
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from sqlalchemy import and_, create_engine, event, select, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.db import database, get_db, get_read_db
+from app.db.blog_search import match_query
+from app.repositories.pagination import encode_cursor, paginate
+from app.db.redis_client import redis_health
+from app.main import app
+from app.routes import contests
+from app.services import contest_store
+from app.services.contest_records import ContestRecord
+from app.models import (
+    AlgoComplexity,
+    AlgoDifficulty,
+    Algorithm,
+    AlgorithmComment,
+    AlgorithmType,
+    Blog,
+    BlogComment,
+    BlogStatus,
+    ProblemStatus,
+    RelatedProblem,
+    UserProblemProgress,
+    User,
+    UserProgress,
+)
+
+from .conftest import TestSession, engine
+
+# Lookups the repositories and routes run on every request
+HOT_QUERIES = {
+    "progress by user and algorithm": select(UserProgress).where(
+        UserProgress.user_id == 1, UserProgress.algo_id == 2
+    ),
+    "last accessed progress": select(UserProgress)
+    .where(UserProgress.user_id == 1)
+    .order_by(UserProgress.last_accessed.desc())
+    .limit(1),
+    "approved blogs": select(Blog)
+    .where(Blog.status == BlogStatus.approved)
+    .order_by(Blog.created_at.desc())
+    .limit(5),
+    "blogs by user": select(Blog).where(Blog.user_id == 1).order_by(Blog.created_at.desc()),
+    "blog comment threads": select(BlogComment)
+    .where(BlogComment.blog_id == 1, BlogComment.parent_id.is_(None))
+    .order_by(BlogComment.created_at.desc()),
+    "blog comment replies": select(BlogComment).where(BlogComment.parent_id == 1),
+    "algorithm comment threads": select(AlgorithmComment)
+    .where(AlgorithmComment.algorithm_id == 1, AlgorithmComment.parent_id.is_(None))
+    .order_by(AlgorithmComment.created_at.desc()),
+    "algorithm comment replies": select(AlgorithmComment).where(AlgorithmComment.parent_id == 1),
+    "approved related problems": select(RelatedProblem).where(
+        RelatedProblem.algorithm_id == 1, RelatedProblem.status == ProblemStatus.APPROVED
+    ),
+    "problem progress": select(UserProblemProgress).where(
+        UserProblemProgress.user_id == 1, UserProblemProgress.problem_id == 2
+    ),
+    "related problems with progress": select(RelatedProblem, UserProblemProgress)
+    .outerjoin(
+        UserProblemProgress,
+        and_(UserProblemProgress.problem_id == RelatedProblem.id, UserProblemProgress.user_id == 1),
+    )
+    .where(RelatedProblem.algorithm_id == 1, RelatedProblem.status == ProblemStatus.APPROVED),
+}
+
+
+class TestPoolMetrics:
+    def test_checkout_wait_and_timeouts(self, tmp_path):
+        engine = create_engine(
+            f"sqlite:///{tmp_path / 'pool.db'}",
+            poolclass=database.TimedQueuePool,
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=0.05,
+        )
+        waits = database.checkout_wait.count
+        timeouts = database.pool_counters["checkout_timeouts"]
+        with engine.connect():
+            with pytest.raises(PoolTimeoutError):
+                engine.connect()
+        assert database.checkout_wait.count == waits + 2
+        assert database.pool_counters["checkout_timeouts"] == timeouts + 1
+        engine.dispose()
+
+    def test_pool_stats(self):
+        stats = database.get_pool_stats()
+        assert {"connects", "closes", "checkout_timeouts", "checkout_wait"} <= set(stats)
+
+
+class TestReplicaRouting:
+    @pytest.fixture
+    def engines(self, tmp_path):
+        primary = database.make_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+        replica = database.make_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+        for e in (primary, replica):
+            database.Base.metadata.create_all(bind=e)
+        yield primary, replica
+        primary.dispose()
+        replica.dispose()
+
+    def test_reads_replica_and_writes_primary(self, engines):
+        primary, replica = engines
+        Routed = sessionmaker(class_=database.RoutingSession, primary=primary, replicas=itertools.cycle([replica]))
+
+        db = Routed()
+        assert db.query(AlgorithmType).count() == 0
+        db.add(AlgorithmType(name="Graphs", description="g"))
+        db.commit()
+        # The writing session stays on the primary and reads its own write
+        assert db.query(AlgorithmType).count() == 1
+        db.close()
+
+        with primary.connect() as conn:
+            assert conn.execute(text("SELECT COUNT(*) FROM algorithm_types")).scalar() == 1
+        # A fresh session reads the (not yet replicated) replica
+        db = Routed()
+        assert db.query(AlgorithmType).count() == 0
+        db.close()
+
+    def test_without_replicas_everything_uses_primary(self, engines):
+        primary, _ = engines
+        db = sessionmaker(class_=database.RoutingSession, primary=primary)()
+        assert db.get_bind() is primary
+        db.close()
+
+    def test_write_pins_only_the_writing_client(self, monkeypatch):
+        monkeypatch.setattr(database, "replica_engines", [engine])
+        monkeypatch.setattr(database, "SessionLocal", TestSession)
+        response = Response()
+        sessions = get_db(response)
+        db = next(sessions)
+        db.add(AlgorithmType(name="Graphs"))
+        db.commit()
+        sessions.close()
+        cookie = response.headers["set-cookie"]
+        assert cookie.startswith(f"{database.PRIMARY_PIN_COOKIE}=1;")
+        assert f"Max-Age={int(settings.DB_REPLICA_PIN_SECONDS)}" in cookie
+
+        def request(cookie: str = "") -> Request:
+            headers = [(b"cookie", cookie.encode())] if cookie else []
+            return Request({"type": "http", "headers": headers})
+
+        assert database.primary_pinned(request(cookie.split(";")[0]))
+        assert not database.primary_pinned(request())
+        assert not database.primary_pinned(None)
+
+    def test_reads_and_background_writes_pin_nothing(self, monkeypatch):
+        monkeypatch.setattr(database, "replica_engines", [engine])
+        monkeypatch.setattr(database, "SessionLocal", TestSession)
+        response = Response()
+        sessions = get_db(response)
+        db = next(sessions)
+        db.query(AlgorithmType).count()
+        db.commit()
+        sessions.close()
+        assert "set-cookie" not in response.headers
+
+        db = TestSession()
+        db.add(AlgorithmType(name="Graphs"))
+        db.commit()  # no request to pin
+        db.close()
+
+
+class TestKeysetPagination:
+    @pytest.fixture
+    def blogs(self, admin_user):
+        db = TestSession()
+        user_id = db.query(User.id).scalar()
+        # Inserted together, so most share the same (second-resolution) created_at
+        db.add_all(
+            Blog(title=f"Blog {i}", body="b", user_id=user_id, status=BlogStatus.approved)
+            for i in range(7)
+        )
+        db.commit()
+        db.close()
+
+    def walk(self, client, url):
+        pages, cursor = [], None
+        while True:
+            resp = client.get(url, params={"limit": 3, **({"cursor": cursor} if cursor else {})})
+            assert resp.status_code == 200
+            pages.append([blog["id"] for blog in resp.json()])
+            cursor = resp.headers.get("X-Next-Cursor")
+            if cursor is None:
+                return pages
+
+    def test_cursor_pages_cover_every_row_once(self, client, blogs):
+        pages = self.walk(client, "/blogs/")
+        ids = [i for page in pages for i in page]
+        assert [len(page) for page in pages] == [3, 3, 1]
+        # Newest first, ties broken by id
+        assert ids == sorted(ids, reverse=True) and len(set(ids)) == 7
+
+    def test_offset_mode_matches_cursor_pages(self, client, blogs):
+        pages = self.walk(client, "/blogs/")
+        by_offset = [[b["id"] for b in client.get("/blogs/", params={"skip": skip, "limit": 3}).json()] for skip in (0, 3, 6)]
+        assert by_offset == pages
+
+    def test_rows_deleted_between_pages(self, client, blogs):
+        first = client.get("/blogs/", params={"limit": 3})
+        db = TestSession()
+        db.query(Blog).filter(Blog.id == first.json()[-1]["id"]).delete()
+        db.commit()
+        db.close()
+        second = client.get("/blogs/", params={"limit": 3, "cursor": first.headers["X-Next-Cursor"]})
+        assert [b["id"] for b in second.json()] == [4, 3, 2]
+
+    def test_algorithm_pages(self, client):
+        db = TestSession()
+        db.add(AlgorithmType(name="Graphs", description="g"))
+        db.commit()
+        db.close()
+        # No algorithms: a short page has no next cursor
+        resp = client.get("/algorithms/", params={"limit": 3})
+        assert resp.json() == [] and "X-Next-Cursor" not in resp.headers
+
+    def test_invalid_cursor(self, client):
+        for cursor in ("not-a-cursor", "WzFd"):
+            assert client.get("/blogs/", params={"cursor": cursor}).status_code == 400
+
+
+class TestListProjection:
+    @pytest.fixture
+    def statements(self):
+        seen = []
+
+        def record(conn, cursor, statement, *args):
+            seen.append(statement)
+
+        event.listen(engine, "before_cursor_execute", record)
+        yield seen
+        event.remove(engine, "before_cursor_execute", record)
+
+    @pytest.fixture
+    def algorithm(self):
+        db = TestSession()
+        algo_type = AlgorithmType(name="Graphs", description="g")
+        db.add(algo_type)
+        db.flush()
+        db.add(Algorithm(
+            name="BFS",
+            type_id=algo_type.id,
+            description="Breadth-first search",
+            difficulty=AlgoDifficulty.easy,
+            complexity=list(AlgoComplexity)[0],
+            explanation="long explanation",
+            code="def bfs(): ...",
+        ))
+        db.commit()
+        db.close()
+
+    @pytest.mark.parametrize("url", ["/algorithms/", "/algorithms/type/1"])
+    def test_summary_leaves_out_bodies(self, client, algorithm, statements, url):
+        resp = client.get(url, params={"summary": True})
+        assert resp.status_code == 200
+        assert set(resp.json()[0]) == {"id", "name", "type_id", "type_name", "description", "difficulty", "complexity"}
+        selects = [s for s in statements if "FROM algorithms" in s]
+        assert selects and not any("algorithms.code" in s or "algorithms.explanation" in s for s in selects)
+
+    def test_full_rows_by_default(self, client, algorithm):
+        item = client.get("/algorithms/").json()[0]
+        assert item["code"] == "def bfs(): ..." and item["explanation"] == "long explanation"
+
+
+class TestBlogSearch:
+    @pytest.fixture
+    def blogs(self, admin_user):
+        db = TestSession()
+        user_id = db.query(User.id).scalar()
+        filler = " ".join(["lorem ipsum dolor"] * 100)
+        rows = [
+            ("Graph traversal", f"{filler} shortest paths {filler}", BlogStatus.approved),
+            ("Dynamic programming", f"{filler} a graph of states {filler}", BlogStatus.approved),
+            ("Graph drafts", "graph", BlogStatus.pending),
+            ("Sorting", "merge sort", BlogStatus.approved),
+        ]
+        db.add_all(Blog(title=t, body=b, user_id=user_id, status=s) for t, b, s in rows)
+        db.commit()
+        db.close()
+
+    def search(self, client, query, **params):
+        resp = client.get(f"/blogs/search/{query}", params=params)
+        assert resp.status_code == 200
+        return resp
+
+    def test_ranked_approved_matches_with_snippets(self, client, blogs):
+        results = self.search(client, "graph").json()
+        # Title match first; pending blogs are not searchable
+        assert [r["title"] for r in results] == ["Graph traversal", "Dynamic programming"]
+        assert results[0]["score"] > results[1]["score"]
+        assert "graph of states" in results[1]["snippet"]
+        assert len(results[1]["snippet"]) < 300 and "body" not in results[1]
+
+    def test_stemming_and_all_words_required(self, client, blogs):
+        assert [r["title"] for r in self.search(client, "graphs states").json()] == ["Dynamic programming"]
+
+    def test_index_follows_updates_and_deletes(self, client, blogs):
+        db = TestSession()
+        blog = db.query(Blog).filter(Blog.title == "Sorting").one()
+        blog.body = "quick sort partitions"
+        db.commit()
+        assert [r["title"] for r in self.search(client, "partitions").json()] == ["Sorting"]
+        assert self.search(client, "merge").json() == []
+        db.delete(blog)
+        db.commit()
+        db.close()
+        assert self.search(client, "partitions").json() == []
+
+    def test_cursor_pages(self, client, blogs):
+        first = self.search(client, "graph", limit=1)
+        second = self.search(client, "graph", limit=1, cursor=first.headers["X-Next-Cursor"])
+        assert [r["title"] for r in first.json() + second.json()] == ["Graph traversal", "Dynamic programming"]
+
+    def test_postgres_score_is_double_precision(self):
+        db = Session(create_engine("postgresql+psycopg2://"))
+        query, score, _ = match_query(db, "graph")
+        cursor = encode_cursor([0.1, 7])
+        sql = str(paginate(query, (score, Blog.id), cursor, descending=True).statement.compile(db.get_bind()))
+        assert "CAST(ts_rank_cd(blog.search_vector, plainto_tsquery(" in sql
+        assert sql.count("AS FLOAT(53))") == 2  # select list and keyset comparison
+
+    def test_every_word_is_required(self, client, blogs):
+        assert self.search(client, "graph").json()
+        assert self.search(client, "graph or unmatched").json() == []
+
+    @pytest.mark.parametrize("query", ["!!!", 'graph" OR body:x', "NEAR(graph"])
+    def test_user_input_is_not_query_syntax(self, client, blogs, query):
+        self.search(client, query)
+
+
+class TestSyncHandlers:
+    def test_no_async_handler_uses_sync_session(self):
+        """Sync SQLAlchemy inside ``async def`` would block the event loop."""
+
+        def dependencies(dependant):
+            for sub in dependant.dependencies:
+                yield sub.call
+                yield from dependencies(sub)
+
+        offenders = [
+            route.path
+            for route in app.routes
+            if isinstance(route, APIRoute)
+            and inspect.iscoroutinefunction(route.endpoint)
+            and {get_db, get_read_db} & set(dependencies(route.dependant))
+        ]
+        assert offenders == []
+
+    def test_no_async_handler_calls_sync_redis(self, client, monkeypatch):
+        """The blocking Redis client inside ``async def`` would block the event loop."""
+        on_loop = []
+
+        def available():
+            # Every sync Redis helper asks the health flag first
+            try:
+                asyncio.get_running_loop()
+                on_loop.append(" < ".join(frame.function for frame in inspect.stack()[1:4]))
+            except RuntimeError:
+                pass
+            return False
+
+        monkeypatch.setattr(redis_health, "available", available)
+        monkeypatch.setattr(contest_store, "_local_snapshots", {})
+        monkeypatch.setattr(settings, "CONTEST_STREAM_POLL_SECONDS", 0)
+        now = int(time.time())
+        for source in contests.AGGREGATED_SOURCES:
+            contest_store.save_snapshot(source, [ContestRecord(source, "round", f"u-{source}", now + 3600, 3600)])
+
+        assert client.get("/api/contests").status_code == 200
+        assert client.get("/api/contests/codeforces").status_code == 200
+        assert client.get("/health").status_code == 200
+
+        class Request:
+            headers = {}
+            polls = 0
+
+            async def is_disconnected(self):
+                self.polls += 1
+                return self.polls > 2
+
+        async def stream():
+            response = await contests.stream_contests(Request(), days=30, recent_days=7, last_event_id=None)
+            return [message async for message in response.body_iterator]
+
+        messages = asyncio.run(stream())
+        assert messages[0].startswith("id: ") and "event: snapshot" in messages[0]
+        assert on_loop == []
+
+
+class TestQueryPlans:
+    @pytest.mark.parametrize("name", sorted(HOT_QUERIES))
+    def test_hot_query_uses_an_index(self, name):
+        sql = str(HOT_QUERIES[name].compile(engine, compile_kwargs={"literal_binds": True}))
+        with engine.connect() as conn:
+            plan = [row[-1] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+        # SQLite reports a full table scan as a bare "SCAN <table>"
+        full_scans = [step for step in plan if re.fullmatch(r"SCAN \w+", step)]
+        assert full_scans == [], f"{name}: {plan}"
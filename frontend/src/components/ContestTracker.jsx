@@ -203,6 +203,32 @@ const ContestCard = ({ c, status, nowTick }) => {
   );
 };
 
+const DAY_MS = 24 * 60 * 60 * 1000;
+
+// Merge SSE delta events into the current buckets and re-bucket by the clock
+const applyContestChanges = (prev, changes, days, recentDays) => {
+  const byUrl = new Map();
+  [...(prev.running || []), ...(prev.upcoming || []), ...(prev.recent || [])].forEach((c) => byUrl.set(c.url, c));
+  changes.forEach(({ type, contest }) => {
+    if (type === 'removed') byUrl.delete(contest.url);
+    else byUrl.set(contest.url, contest);
+  });
+  const now = Date.now();
+  const next = { running: [], upcoming: [], recent: [] };
+  byUrl.forEach((c) => {
+    const start = new Date(c.start_time).getTime();
+    const end = start + Number(c.duration || 0) * 1000;
+    if (start >= now && start <= now + days * DAY_MS) next.upcoming.push(c);
+    if (start <= now && now <= end) next.running.push(c);
+    if (end <= now && end >= now - recentDays * DAY_MS) next.recent.push(c);
+  });
+  const byStart = (a, b) => new Date(a.start_time) - new Date(b.start_time);
+  next.upcoming.sort(byStart);
+  next.running.sort(byStart);
+  next.recent.sort((a, b) => byStart(b, a));
+  return next;
+};
+
 export default function ContestTracker() {
   const [tab, setTab] = useState('running');
   const [days, setDays] = useState(30);
@@ -219,6 +245,9 @@ export default function ContestTracker() {
   // Default selected platforms: CF, CodeChef, AtCoder
   const [sites, setSites] = useState(new Set(['cf','codechef','atcoder']));
 
+  // The live stream's first message is a full snapshot, so it replaces the REST fetch when available
+  const STREAM_SUPPORTED = typeof EventSource !== 'undefined';
+
   // Cache configuration
   const CACHE_DURATION = 5 * 60 * 1000; // 5 minutes
   const CACHE_KEY = 'contest_tracker_cache';
@@ -308,6 +337,21 @@ export default function ContestTracker() {
     }
   };
 
+  // Auto-pick a tab with data on first load or when current tab is empty.
+  // Priority: running -> recent -> upcoming (default is 'running').
+  const pickTab = ({ running, upcoming, recent }) => {
+    setTimeout(() => {
+      setTab((prev) => {
+        if (prev === 'upcoming' && upcoming.length) return prev;
+        if (prev === 'running' && running.length) return prev;
+        if (prev === 'recent' && recent.length) return prev;
+        const next = running.length ? 'running' : (recent.length ? 'recent' : 'upcoming');
+        if (next === 'upcoming' && days !== 1) setDays(1);
+        return next;
+      });
+    }, 0);
+  };
+
   const loadContests = async (forceRefresh = false) => {
     try {
       // Check if we should use cache
@@ -354,18 +398,7 @@ export default function ContestTracker() {
       
       // Save to localStorage cache
       saveToCache(contestData, contestCounts, timestamp);
-      // Auto-pick a tab with data on first load or when current tab is empty.
-      // Priority: running -> recent -> upcoming (default is 'running').
-      setTimeout(() => {
-        setTab((prev) => {
-          if (prev === 'upcoming' && upcoming.length) return prev;
-          if (prev === 'running' && running.length) return prev;
-          if (prev === 'recent' && recent.length) return prev;
-          const next = running.length ? 'running' : (recent.length ? 'recent' : 'upcoming');
-          if (next === 'upcoming' && days !== 1) setDays(1);
-          return next;
-        });
-      }, 0);
+      pickTab(contestData);
     } catch (e) {
       setError(e.message || 'Failed to load contests');
     } finally {
@@ -378,9 +411,9 @@ export default function ContestTracker() {
     loadContests(true); // Force refresh from API
   };
 
-  // Load contests on mount and when days/recentDays change
+  // Load contests on mount and when days/recentDays change (the stream does it when available)
   useEffect(() => {
-    loadContests(false); // Use cache if available
+    if (!STREAM_SUPPORTED) loadContests(false); // Use cache if available
   }, [days, recentDays]);
 
   // Initial load from cache on component mount
@@ -394,11 +427,46 @@ export default function ContestTracker() {
         timestamp: new Date(cached.fetched_at || cached.timestamp) 
       });
       setLastFetchTime(cached.timestamp);
-    } else {
+    } else if (!STREAM_SUPPORTED) {
       loadContests(false);
     }
   }, []); // Only run on mount
 
+  // Live updates: the stream sends one snapshot, then only the contests that changed
+  useEffect(() => {
+    if (!STREAM_SUPPORTED) return undefined;
+    const params = new URLSearchParams({ days: String(days), recent_days: String(recentDays) });
+    const source = new EventSource(`${api.defaults.baseURL}/api/contests/stream?${params.toString()}`);
+    let received = false;
+    if (!loadFromCache()) setLoading(true);
+    source.addEventListener('snapshot', (e) => {
+      const js = JSON.parse(e.data);
+      const contestData = { running: js.running || [], upcoming: js.upcoming || [], recent: js.recent || [] };
+      const timestamp = js.fetched_at ? new Date(js.fetched_at) : new Date();
+      setData(contestData);
+      setCounts(js.counts || {});
+      setCacheStatus({ isCached: true, timestamp });
+      setLastFetchTime(Date.now());
+      setError('');
+      setLoading(false);
+      saveToCache(contestData, js.counts || {}, timestamp);
+      if (!received) pickTab(contestData);
+      received = true;
+    });
+    source.onerror = () => {
+      // Reconnects are automatic; fall back to the REST endpoint only if the stream never opened
+      if (received) return;
+      source.close();
+      loadContests(false);
+    };
+    source.addEventListener('delta', (e) => {
+      const { changes = [] } = JSON.parse(e.data);
+      setData((prev) => applyContestChanges(prev, changes, days, recentDays));
+      setLastFetchTime(Date.now());
+    });
+    return () => source.close();
+  }, [days, recentDays]);
+
   // Live countdown ticker (1s)
   useEffect(() => {
     const id = setInterval(() => setNowTick(Date.now()), 1000);
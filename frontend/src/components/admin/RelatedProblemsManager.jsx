@@ -62,7 +62,7 @@ const RelatedProblemsManager = () => {
         setProblems(problemsResponse.data);
         
         // Fetch algorithms
-        const algorithmsResponse = await api.get('/algorithms');
+        const algorithmsResponse = await api.get('/algorithms', { params: { summary: true } });
         setAlgorithms(algorithmsResponse.data);
         
       } catch (error) {
@@ -20,7 +20,7 @@ const AlgorithmTypePage = () => {
           throw new Error('Invalid type ID');
         }
 
-        const data = await algorithmService.getByType(parsedTypeId);
+        const data = await algorithmService.getByType(parsedTypeId, 1, 5, { summary: true });
         setAlgorithms(data);
 
         // Set type name based on the fetched data
@@ -86,7 +86,7 @@ const Algorithms = () => {
     try {
       setLoading(true);
       const [algorithmsData, typesResponse] = await Promise.all([
-        algorithmService.getAll(1, 100),
+        algorithmService.getAll(1, 100, { summary: true }),
         api.get('/algo-type')
       ]);
       
@@ -71,7 +71,7 @@ const TopicListPage = () => {
   const fetchData = async () => {
     try {
       const [algorithmsData, typesData] = await Promise.all([
-        algorithmService.getAll(1, 100),
+        algorithmService.getAll(1, 100, { summary: true }),
         api.get('/algo-type')
       ]);
 
@@ -3,11 +3,12 @@ import api from './api';
 const ALGORITHMS_URL = '/algorithms';
 
 export const algorithmService = {
-  async getAll(page = 1, limit = 5) {
+  // summary: list fields only (no explanation/code); use getById for the full algorithm
+  async getAll(page = 1, limit = 5, { summary = false } = {}) {
     try {
       const skip = (page - 1) * limit;
       const response = await api.get(`${ALGORITHMS_URL}/`, {
-        params: { skip, limit },
+        params: summary ? { skip, limit, summary } : { skip, limit },
       });
       return response.data;
     } catch (error) {
@@ -33,11 +34,11 @@ export const algorithmService = {
     }
   },
 
-  async getByType(typeId, page = 1, limit = 5) {
+  async getByType(typeId, page = 1, limit = 5, { summary = false } = {}) {
     try {
       const skip = (page - 1) * limit;
       const response = await api.get(`/algorithms/type/${typeId}`, {
-        params: { skip, limit },
+        params: summary ? { skip, limit, summary } : { skip, limit },
       });
       return response.data;
     } catch (error) {